@@ -0,0 +1,32 @@
+"""Performance benchmarks for the PyQt4 uic package.
+
+The benchmarks are run from the root of the repository as modules, eg.
+
+    python -m benchmarks.compile_throughput --tree win32_2016
+
+and exercise the copy of PyQt4 in the given version tree.
+"""
+
+import os
+import sys
+
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# The version tree used when none is given on the command line.
+DEFAULT_TREE = 'win32_2016'
+
+
+def use_tree(tree=DEFAULT_TREE):
+    """ Make the PyQt4 package of the given version tree importable and return
+    the path of the tree.
+    """
+
+    tree_dir = os.path.join(ROOT_DIR, tree)
+    if not os.path.isdir(os.path.join(tree_dir, 'PyQt4')):
+        raise ValueError("%s does not contain a PyQt4 package" % tree_dir)
+
+    if tree_dir not in sys.path:
+        sys.path.insert(0, tree_dir)
+
+    return tree_dir
@@ -0,0 +1,196 @@
+"""Measure the effect of batching the creation of deeply nested forms.
+
+Synthetic forms whose widgets are nested in many levels of group boxes are
+loaded with and without loadUi(batch=True).  Each form is loaded into a
+top-level widget that is already shown, which is when a partially created
+form is most expensive, and the events that result are then processed.  The
+best and mean times of each mode are reported.
+
+With the real PyQt4 the layout request, update request and paint events
+delivered while loading and processing the events are also counted.  The
+stand-in in benchmarks.qtstub has no event loop so only the time spent in the
+loader is measured and no events are reported.
+"""
+
+import optparse
+import shutil
+import sys
+import tempfile
+import timeit
+
+from benchmarks import DEFAULT_TREE, use_tree
+from benchmarks.corpus import add_spec_options, spec_from_options, write_corpus
+from benchmarks.suite import select_qt
+
+
+# The modes that are compared.
+MODES = (('unbatched', False), ('batched', True))
+
+# The names of the events that are counted.
+COUNTED_EVENTS = ('LayoutRequest', 'UpdateRequest', 'Paint')
+
+
+def _event_counter(QtCore):
+    """ Return an event filter that counts the events in COUNTED_EVENTS. """
+
+    types = dict([(int(getattr(QtCore.QEvent, name)), name)
+            for name in COUNTED_EVENTS])
+
+    class EventCounter(QtCore.QObject):
+        def __init__(self):
+            QtCore.QObject.__init__(self)
+
+            self.counts = dict([(name, 0) for name in COUNTED_EVENTS])
+
+        def eventFilter(self, obj, event):
+            name = types.get(int(event.type()))
+            if name is not None:
+                self.counts[name] += 1
+
+            return False
+
+    return EventCounter()
+
+
+def load_form(ui_file, batch, app, real_qt):
+    """ Load a form into a visible top-level widget and process the resulting
+    events.  Return the time taken.
+    """
+
+    from PyQt4 import QtGui, uic
+
+    base = QtGui.QWidget()
+    base.show()
+
+    if real_qt:
+        app.processEvents()
+
+    start = timeit.default_timer()
+
+    uic.loadUi(ui_file, base, batch=batch)
+
+    if real_qt:
+        app.processEvents()
+
+    elapsed = timeit.default_timer() - start
+
+    base.close()
+
+    if real_qt:
+        base.deleteLater()
+        app.processEvents()
+
+    return elapsed
+
+
+def benchmark(ui_files, rounds, app, real_qt):
+    """ Load every form of a corpus in each mode and return a dict of the
+    results keyed by the name of the mode.
+    """
+
+    from PyQt4 import QtCore
+
+    results = {}
+
+    for mode, batch in MODES:
+        # Warm up any caches so that the modes are comparable.
+        load_form(ui_files[0], batch, app, real_qt)
+
+        times = []
+        for _ in range(rounds):
+            times.append(sum([load_form(ui_file, batch, app, real_qt)
+                    for ui_file in ui_files]))
+
+        events = None
+
+        if real_qt:
+            counter = _event_counter(QtCore)
+            app.installEventFilter(counter)
+
+            try:
+                for ui_file in ui_files:
+                    load_form(ui_file, batch, app, real_qt)
+            finally:
+                app.removeEventFilter(counter)
+
+            events = counter.counts
+
+        results[mode] = {
+            'best_s': min(times),
+            'mean_s': sum(times) / len(times),
+            'events': events,
+        }
+
+    return results
+
+
+def main():
+    parser = optparse.OptionParser(
+            usage="python -m benchmarks.batching [options]")
+    parser.add_option("--tree", dest="tree", default=DEFAULT_TREE,
+            help="the version tree containing PyQt4 [default: %default]")
+    parser.add_option("--qt", dest="qt", type="choice",
+            choices=('auto', 'real', 'stub'), default='auto',
+            help="use the real PyQt4 or the pure Python stand-in [default: %default]")
+    parser.add_option("-n", "--forms", dest="forms", type="int", default=5,
+            help="the number of synthetic forms to generate [default: %default]")
+    parser.add_option("-r", "--rounds", dest="rounds", type="int", default=3,
+            help="the number of times each form is loaded in each mode [default: %default]")
+    add_spec_options(parser)
+
+    # Deep layout trees are the interesting case.
+    parser.set_defaults(depth=6, widgets=200, custom=0)
+
+    opts, _ = parser.parse_args()
+
+    use_tree(opts.tree)
+    qt = select_qt(opts.qt)
+    real_qt = qt.startswith('real')
+
+    from PyQt4 import QtGui
+
+    app = QtGui.QApplication.instance()
+    if app is None:
+        app = QtGui.QApplication(sys.argv)
+
+    spec = spec_from_options(opts)
+    corpus_dir = tempfile.mkdtemp(prefix='uic-batch-')
+
+    # Custom widget modules are imported relative to the corpus.
+    sys.path.insert(0, corpus_dir)
+
+    try:
+        ui_files = write_corpus(corpus_dir, opts.forms, spec)
+        results = benchmark(ui_files, opts.rounds, app, real_qt)
+    finally:
+        shutil.rmtree(corpus_dir, ignore_errors=True)
+
+    sys.stdout.write("%d forms, %d widgets nested %d deep, %d rounds, %s\n" % (
+            len(ui_files), spec.widgets, spec.depth, opts.rounds, qt))
+    sys.stdout.write("%-12s %10s %10s %12s" % ('mode', 'best s', 'mean s',
+            'ms/form'))
+
+    for name in COUNTED_EVENTS:
+        sys.stdout.write(" %14s" % name)
+
+    sys.stdout.write("\n")
+
+    for mode, _ in MODES:
+        r = results[mode]
+
+        sys.stdout.write("%-12s %10.4f %10.4f %12.3f" % (mode, r['best_s'],
+                r['mean_s'], r['best_s'] * 1000.0 / len(ui_files)))
+
+        for name in COUNTED_EVENTS:
+            if r['events'] is None:
+                sys.stdout.write(" %14s" % 'n/a')
+            else:
+                sys.stdout.write(" %14d" % r['events'][name])
+
+        sys.stdout.write("\n")
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,106 @@
+"""Measure the throughput of the uic compiler in forms per second.
+
+The corpus is either every .ui file found below a directory or, if no
+directory is given, a number of synthetic forms generated in memory.  Each
+round compiles every form of the corpus and the best round is reported.
+"""
+
+import optparse
+import os
+import sys
+import timeit
+
+from benchmarks import DEFAULT_TREE, use_tree
+from benchmarks.corpus import (add_spec_options, spec_from_options,
+        synthetic_corpus)
+
+
+def load_corpus(ui_dir):
+    """ Return the list of (name, contents) tuples of the .ui files below a
+    directory.
+    """
+
+    corpus = []
+
+    for root, _, files in os.walk(ui_dir):
+        for fname in sorted(files):
+            if fname.endswith('.ui'):
+                path = os.path.join(root, fname)
+                f = open(path, 'r')
+
+                try:
+                    corpus.append((path, f.read()))
+                finally:
+                    f.close()
+
+    return corpus
+
+
+def compile_corpus(corpus):
+    """ Compile every form of a corpus and return the total size of the
+    generated code.
+    """
+
+    from PyQt4.uic.Compiler.compiler import UICompiler
+
+    if sys.hexversion >= 0x03000000:
+        from io import StringIO
+    else:
+        from StringIO import StringIO
+
+    total = 0
+
+    for _, contents in corpus:
+        pyfile = StringIO()
+        UICompiler().compileUi(StringIO(contents), pyfile, False, '_rc')
+        total += len(pyfile.getvalue())
+
+    return total
+
+
+def main():
+    parser = optparse.OptionParser(
+            usage="python -m benchmarks.compile_throughput [options] [ui-dir]")
+    parser.add_option("--tree", dest="tree", default=DEFAULT_TREE,
+            help="the version tree containing PyQt4 [default: %default]")
+    parser.add_option("-n", "--forms", dest="forms", type="int", default=200,
+            help="the number of synthetic forms to generate [default: %default]")
+    parser.add_option("-r", "--rounds", dest="rounds", type="int", default=5,
+            help="the number of times the corpus is compiled [default: %default]")
+    add_spec_options(parser)
+
+    opts, args = parser.parse_args()
+
+    use_tree(opts.tree)
+
+    if args:
+        corpus = load_corpus(args[0])
+    else:
+        corpus = synthetic_corpus(opts.forms, spec_from_options(opts))
+
+    if not corpus:
+        sys.stderr.write("Error: no .ui files found\n")
+        return 1
+
+    # Warm up any caches so that the rounds are comparable.
+    code_size = compile_corpus(corpus[:1])
+
+    best = None
+    for _ in range(opts.rounds):
+        start = timeit.default_timer()
+        code_size = compile_corpus(corpus)
+        elapsed = timeit.default_timer() - start
+
+        if best is None or elapsed < best:
+            best = elapsed
+
+    sys.stdout.write("forms:          %d\n" % len(corpus))
+    sys.stdout.write("generated code: %d bytes per round\n" % code_size)
+    sys.stdout.write("best round:     %.3f s\n" % best)
+    sys.stdout.write("throughput:     %.1f forms/s\n" % (len(corpus) / best))
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
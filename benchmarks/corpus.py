@@ -0,0 +1,475 @@
+"""Generate synthetic Qt Designer .ui files.
+
+The shape of the generated forms is controlled by a FormSpec: the number of
+widgets, how deeply they are nested in group boxes, the number of items in
+each item view, the number of distinct icons, the proportion of widgets that
+have a palette or a font, and the number of custom widget classes.  The
+forms are deterministic for a given spec and seed.
+
+The generator can also be run from the command line to write a corpus to a
+directory, eg.
+
+    python -m benchmarks.corpus --forms 100 --widgets 200 /tmp/corpus
+"""
+
+import optparse
+import os
+import random
+import sys
+
+from xml.etree.ElementTree import Element, SubElement, tostring
+
+
+class FormSpec(object):
+    """ The parameters that control the shape of a synthetic form. """
+
+    def __init__(self, widgets=50, depth=2, items=5, icons=4, palettes=0.1,
+            fonts=0.2, custom=2, stylesheets=0.0, containers=0.0):
+        """ Initialise the spec.  widgets is the number of leaf widgets.
+        depth is the number of levels of group boxes that they are nested in.
+        items is the number of items in each item view.  icons is the number
+        of distinct icons used.  palettes, fonts and stylesheets are the
+        proportion of widgets that have a full palette, a font and a style
+        sheet.  custom is the number of custom widget classes.  containers is
+        the proportion of group boxes that are replaced by the page of a
+        container.
+        """
+
+        self.widgets = widgets
+        self.depth = depth
+        self.items = items
+        self.icons = icons
+        self.palettes = palettes
+        self.fonts = fonts
+        self.custom = custom
+        self.stylesheets = stylesheets
+        self.containers = containers
+
+    def as_dict(self):
+        """ Return the spec as a dict. """
+
+        return dict(self.__dict__)
+
+
+# The leaf widget classes that are cycled through.  None is a placeholder for
+# a custom widget.
+_LEAF_CLASSES = ('QLabel', 'QLineEdit', 'QPushButton', 'QCheckBox',
+        'QSpinBox', 'QComboBox', 'QListWidget', 'QTreeWidget', 'QTableWidget',
+        'QToolButton', 'QRadioButton', None)
+
+_LAYOUT_CLASSES = ('QGridLayout', 'QVBoxLayout', 'QHBoxLayout', 'QFormLayout')
+
+# The container classes that are cycled through and the attribute, if any,
+# that each page has.
+_CONTAINER_CLASSES = (('QTabWidget', 'title'), ('QStackedWidget', None),
+        ('QScrollArea', None), ('QToolBox', 'label'))
+
+_PALETTE_ROLES = ('WindowText', 'Button', 'Light', 'Midlight', 'Dark', 'Mid',
+        'Text', 'BrightText', 'ButtonText', 'Base', 'Window', 'Shadow',
+        'Highlight', 'HighlightedText', 'Link', 'LinkVisited',
+        'AlternateBase', 'NoRole', 'ToolTipBase', 'ToolTipText')
+
+# A 1x1 transparent PNG used for every icon file.
+_PNG = (b'\x89PNG\r\n\x1a\n\x00\x00\x00\rIHDR\x00\x00\x00\x01\x00\x00\x00\x01'
+        b'\x08\x06\x00\x00\x00\x1f\x15\xc4\x89\x00\x00\x00\rIDATx\x9cc\xf8\x0f'
+        b'\x00\x00\x01\x01\x00\x05\x18\xd8N\x00\x00\x00\x00IEND\xaeB`\x82')
+
+
+def custom_class_name(nr):
+    """ Return the name of a custom widget class. """
+
+    return 'CustomWidget%d' % nr
+
+
+def icon_file_name(nr):
+    """ Return the name, relative to the .ui file, of an icon file. """
+
+    return 'images/icon%d.png' % nr
+
+
+class _FormBuilder(object):
+    """ Build the element tree of a single form. """
+
+    def __init__(self, name, spec, seed):
+        self._name = name
+        self._spec = spec
+        self._random = random.Random(seed)
+        self._names = {}
+        self._nr_widgets = 0
+        self._nr_containers = 0
+
+    def build(self):
+        spec = self._spec
+
+        ui = Element('ui', version='4.0')
+        SubElement(ui, 'class').text = self._name
+
+        top = SubElement(ui, 'widget', {'class': 'QWidget', 'name': self._name})
+        self._property(top, 'geometry', 'rect',
+                [('x', 0), ('y', 0), ('width', 800), ('height', 600)])
+        self._string_property(top, 'windowTitle', self._name)
+
+        self._container(top, spec.depth, spec.widgets)
+
+        if spec.custom:
+            cws = SubElement(ui, 'customwidgets')
+
+            for nr in range(spec.custom):
+                cw = SubElement(cws, 'customwidget')
+                SubElement(cw, 'class').text = custom_class_name(nr)
+                SubElement(cw, 'extends').text = 'QPushButton'
+                SubElement(cw, 'header').text = 'customwidgets.h'
+
+        SubElement(ui, 'resources')
+        SubElement(ui, 'connections')
+
+        return ui
+
+    def _unique(self, prefix):
+        nr = self._names.get(prefix, 0)
+        self._names[prefix] = nr + 1
+
+        return '%s_%d' % (prefix, nr)
+
+    def _container(self, parent, depth, nr_widgets):
+        """ Populate a widget with a layout and either nested group boxes or
+        leaf widgets.
+        """
+
+        layout_class = _LAYOUT_CLASSES[depth % len(_LAYOUT_CLASSES)]
+        layout = SubElement(parent, 'layout', {'class': layout_class,
+                'name': self._unique(layout_class[1:].lower())})
+
+        if depth > 0 and nr_widgets > 1:
+            # Split the widgets between (up to) three group boxes.
+            nr_boxes = min(3, nr_widgets)
+            children = []
+
+            for box in range(nr_boxes):
+                share = nr_widgets // nr_boxes
+                if box < nr_widgets % nr_boxes:
+                    share += 1
+
+                # Only use the random numbers when needed so that the forms
+                # are otherwise unchanged.
+                if self._spec.containers and self._random.random() < self._spec.containers:
+                    children.append(self._page(depth - 1, share))
+                    continue
+
+                gb = Element('widget', {'class': 'QGroupBox',
+                        'name': self._unique('groupBox')})
+                self._string_property(gb, 'title', 'Group %d' % box)
+                self._container(gb, depth - 1, share)
+                children.append(gb)
+        else:
+            children = [self._leaf() for _ in range(nr_widgets)]
+
+        for idx, child in enumerate(children):
+            if layout_class == 'QGridLayout':
+                attrs = {'row': str(idx // 2), 'column': str(idx % 2)}
+            elif layout_class == 'QFormLayout':
+                attrs = {'row': str(idx // 2), 'column': str(idx % 2)}
+            else:
+                attrs = {}
+
+            item = SubElement(layout, 'item', attrs)
+            item.append(child)
+
+    def _page(self, depth, nr_widgets):
+        """ Create a container with a single page that is populated like a
+        group box.
+        """
+
+        cls, attribute = _CONTAINER_CLASSES[self._nr_containers % len(_CONTAINER_CLASSES)]
+        self._nr_containers += 1
+
+        container = Element('widget', {'class': cls,
+                'name': self._unique(cls[1].lower() + cls[2:])})
+
+        if cls == 'QScrollArea':
+            self._property(container, 'widgetResizable', 'bool', 'true')
+
+        page = SubElement(container, 'widget', {'class': 'QWidget',
+                'name': self._unique('page')})
+
+        if attribute is not None:
+            attr = SubElement(page, 'attribute', name=attribute)
+            SubElement(attr, 'string').text = 'Page'
+
+        self._container(page, depth, nr_widgets)
+
+        return container
+
+    def _leaf(self):
+        """ Create a leaf widget. """
+
+        spec = self._spec
+        rnd = self._random
+
+        cls = _LEAF_CLASSES[self._nr_widgets % len(_LEAF_CLASSES)]
+        self._nr_widgets += 1
+
+        if cls is None:
+            if spec.custom:
+                cls = custom_class_name(rnd.randrange(spec.custom))
+            else:
+                cls = 'QPushButton'
+
+        name = self._unique(cls[0].lower() + cls[1:])
+        w = Element('widget', {'class': cls, 'name': name})
+
+        if cls in ('QLabel', 'QPushButton', 'QCheckBox', 'QToolButton',
+                'QRadioButton') or cls.startswith('Custom'):
+            self._string_property(w, 'text', name)
+
+        self._string_property(w, 'toolTip', 'Tool tip of %s' % name)
+
+        if rnd.random() < spec.fonts:
+            font = SubElement(SubElement(w, 'property', name='font'), 'font')
+            SubElement(font, 'family').text = 'Arial'
+            SubElement(font, 'pointsize').text = str(rnd.choice((8, 9, 10)))
+            SubElement(font, 'weight').text = '75'
+            SubElement(font, 'bold').text = 'true'
+
+        if rnd.random() < spec.palettes:
+            self._palette(w)
+
+        if rnd.random() < spec.stylesheets:
+            self._string_property(w, 'styleSheet',
+                    'color: rgb(200, 200, 200); background: rgb(40, 40, 40);',
+                    notr=True)
+
+        if spec.icons and cls in ('QPushButton', 'QToolButton'):
+            nr = rnd.randrange(spec.icons)
+            iconset = SubElement(SubElement(w, 'property', name='icon'),
+                    'iconset')
+            iconset.text = icon_file_name(nr)
+            SubElement(iconset, 'normaloff').text = icon_file_name(nr)
+
+        if cls == 'QComboBox':
+            for nr in range(spec.items):
+                self._string_property(SubElement(w, 'item'), 'text',
+                        'Choice %d' % nr)
+
+        elif cls == 'QListWidget':
+            for nr in range(spec.items):
+                self._string_property(SubElement(w, 'item'), 'text',
+                        'Item %d' % nr)
+
+        elif cls == 'QTreeWidget':
+            self._string_property(SubElement(w, 'column'), 'text', 'Name')
+
+            for nr in range(spec.items):
+                item = SubElement(w, 'item')
+                self._string_property(item, 'text', 'Node %d' % nr)
+                self._string_property(SubElement(item, 'item'), 'text',
+                        'Leaf %d' % nr)
+
+        elif cls == 'QTableWidget':
+            self._string_property(SubElement(w, 'column'), 'text', 'Value')
+
+            for nr in range(spec.items):
+                self._string_property(SubElement(w, 'row'), 'text', str(nr))
+                item = SubElement(w, 'item', row=str(nr), column='0')
+                self._string_property(item, 'text', 'Cell %d' % nr)
+
+        elif cls == 'QSpinBox':
+            self._property(w, 'maximum', 'number', '999')
+
+        elif cls == 'QLineEdit':
+            sp = SubElement(SubElement(w, 'property', name='sizePolicy'),
+                    'sizepolicy', hsizetype='Expanding', vsizetype='Fixed')
+            SubElement(sp, 'horstretch').text = '1'
+            SubElement(sp, 'verstretch').text = '0'
+
+        return w
+
+    def _palette(self, w):
+        """ Add a full palette to a widget. """
+
+        rnd = self._random
+        palette = SubElement(SubElement(w, 'property', name='palette'),
+                'palette')
+
+        for group in ('active', 'inactive', 'disabled'):
+            group_elem = SubElement(palette, group)
+
+            for role in _PALETTE_ROLES:
+                cr = SubElement(group_elem, 'colorrole', role=role)
+                brush = SubElement(cr, 'brush', brushstyle='SolidPattern')
+                color = SubElement(brush, 'color', alpha='255')
+
+                for c in ('red', 'green', 'blue'):
+                    SubElement(color, c).text = str(rnd.randrange(256))
+
+    @staticmethod
+    def _property(elem, name, tag, value):
+        prop = SubElement(elem, 'property', name=name)
+        value_elem = SubElement(prop, tag)
+
+        if isinstance(value, list):
+            for sub_tag, sub_value in value:
+                SubElement(value_elem, sub_tag).text = str(sub_value)
+        else:
+            value_elem.text = value
+
+        return prop
+
+    @staticmethod
+    def _string_property(elem, name, value, notr=False):
+        prop = SubElement(elem, 'property', name=name)
+        s = SubElement(prop, 'string')
+        s.text = value
+
+        if notr:
+            s.set('notr', 'true')
+
+        return prop
+
+
+def generate_form(name, spec=None, seed=0):
+    """ Return the contents of a synthetic .ui file as bytes. """
+
+    if spec is None:
+        spec = FormSpec()
+
+    ui = _FormBuilder(name, spec, seed).build()
+
+    return b'<?xml version="1.0" encoding="UTF-8"?>\n' + tostring(ui)
+
+
+def synthetic_corpus(forms, spec=None, seed=0):
+    """ Return a list of (name, contents) tuples of synthetic forms generated
+    in memory.  The contents are native strings.
+    """
+
+    corpus = []
+
+    for nr in range(forms):
+        contents = generate_form('Form%d' % nr, spec, seed + nr)
+
+        if sys.hexversion >= 0x03000000:
+            contents = contents.decode('utf-8')
+
+        corpus.append(('form%d.ui' % nr, contents))
+
+    return corpus
+
+
+def custom_widgets_module(spec):
+    """ Return the source of the module that implements the custom widgets
+    used by forms created with a spec.
+    """
+
+    lines = ['from PyQt4 import QtGui', '']
+
+    for nr in range(spec.custom):
+        lines.append('')
+        lines.append('class %s(QtGui.QPushButton):' % custom_class_name(nr))
+        lines.append('    pass')
+
+    return '\n'.join(lines) + '\n'
+
+
+def write_corpus(corpus_dir, forms, spec=None, seed=0):
+    """ Write a corpus of synthetic forms, the icon files they use and the
+    module implementing their custom widgets to a directory.  Return the list
+    of the .ui file names.
+    """
+
+    if spec is None:
+        spec = FormSpec()
+
+    images_dir = os.path.join(corpus_dir, 'images')
+    if not os.path.isdir(images_dir):
+        os.makedirs(images_dir)
+
+    for nr in range(spec.icons):
+        f = open(os.path.join(corpus_dir, icon_file_name(nr)), 'wb')
+        f.write(_PNG)
+        f.close()
+
+    f = open(os.path.join(corpus_dir, 'customwidgets.py'), 'w')
+    f.write(custom_widgets_module(spec))
+    f.close()
+
+    ui_files = []
+
+    for nr in range(forms):
+        ui_file = os.path.join(corpus_dir, 'form%d.ui' % nr)
+
+        f = open(ui_file, 'wb')
+        f.write(generate_form('Form%d' % nr, spec, seed + nr))
+        f.close()
+
+        ui_files.append(ui_file)
+
+    return ui_files
+
+
+def add_spec_options(parser):
+    """ Add the options that define a FormSpec to a command line parser. """
+
+    defaults = FormSpec()
+
+    g = optparse.OptionGroup(parser, title="Synthetic form options")
+    g.add_option("--widgets", dest="widgets", type="int",
+            default=defaults.widgets,
+            help="the number of widgets in each form [default: %default]")
+    g.add_option("--depth", dest="depth", type="int", default=defaults.depth,
+            help="the nesting depth of group boxes [default: %default]")
+    g.add_option("--items", dest="items", type="int", default=defaults.items,
+            help="the number of items in each item view [default: %default]")
+    g.add_option("--icons", dest="icons", type="int", default=defaults.icons,
+            help="the number of distinct icons [default: %default]")
+    g.add_option("--palettes", dest="palettes", type="float",
+            default=defaults.palettes,
+            help="the proportion of widgets with a palette [default: %default]")
+    g.add_option("--fonts", dest="fonts", type="float",
+            default=defaults.fonts,
+            help="the proportion of widgets with a font [default: %default]")
+    g.add_option("--stylesheets", dest="stylesheets", type="float",
+            default=defaults.stylesheets,
+            help="the proportion of widgets with a style sheet [default: %default]")
+    g.add_option("--containers", dest="containers", type="float",
+            default=defaults.containers,
+            help="the proportion of group boxes that are container pages [default: %default]")
+    g.add_option("--custom", dest="custom", type="int",
+            default=defaults.custom,
+            help="the number of custom widget classes [default: %default]")
+    parser.add_option_group(g)
+
+
+def spec_from_options(opts):
+    """ Return the FormSpec defined by parsed command line options. """
+
+    return FormSpec(widgets=opts.widgets, depth=opts.depth, items=opts.items,
+            icons=opts.icons, palettes=opts.palettes, fonts=opts.fonts,
+            custom=opts.custom, stylesheets=opts.stylesheets,
+            containers=opts.containers)
+
+
+def main():
+    parser = optparse.OptionParser(
+            usage="python -m benchmarks.corpus [options] corpus-dir")
+    parser.add_option("-n", "--forms", dest="forms", type="int", default=10,
+            help="the number of forms to generate [default: %default]")
+    parser.add_option("--seed", dest="seed", type="int", default=0,
+            help="the seed of the first form [default: %default]")
+    add_spec_options(parser)
+
+    opts, args = parser.parse_args()
+
+    if len(args) != 1:
+        parser.error("one corpus directory must be specified")
+
+    ui_files = write_corpus(args[0], opts.forms, spec_from_options(opts),
+            opts.seed)
+
+    sys.stdout.write("wrote %d forms to %s\n" % (len(ui_files), args[0]))
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
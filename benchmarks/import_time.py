@@ -0,0 +1,75 @@
+"""Measure the time taken to import PyQt4.uic.
+
+Each round imports the module in a new interpreter so that nothing is cached
+in sys.modules.  The best and median times are reported along with the PyQt4
+modules that the import pulled in.
+"""
+
+import json
+import optparse
+import subprocess
+import sys
+
+from benchmarks import DEFAULT_TREE, use_tree
+
+
+_IMPORT_SCRIPT = """
+import json, sys, timeit
+sys.path.insert(0, %(tree_dir)r)
+start = timeit.default_timer()
+import %(module)s
+elapsed = timeit.default_timer() - start
+sys.stdout.write(json.dumps({'elapsed': elapsed,
+        'modules': sorted([m for m in sys.modules
+                if m.startswith('PyQt4') and sys.modules[m] is not None])}))
+"""
+
+
+def time_import(tree_dir, module, python=sys.executable):
+    """ Import a module in a new interpreter and return a tuple of the time
+    taken and the list of PyQt4 modules that were imported.
+    """
+
+    script = _IMPORT_SCRIPT % {'tree_dir': tree_dir, 'module': module}
+    output = subprocess.check_output([python, '-c', script])
+    result = json.loads(output.decode('utf-8'))
+
+    return result['elapsed'], result['modules']
+
+
+def main():
+    parser = optparse.OptionParser(
+            usage="python -m benchmarks.import_time [options]")
+    parser.add_option("--tree", dest="tree", default=DEFAULT_TREE,
+            help="the version tree containing PyQt4 [default: %default]")
+    parser.add_option("-m", "--module", dest="module", default='PyQt4.uic',
+            help="the module to import [default: %default]")
+    parser.add_option("-r", "--rounds", dest="rounds", type="int", default=20,
+            help="the number of times the module is imported [default: %default]")
+    parser.add_option("--python", dest="python", default=sys.executable,
+            help="the interpreter to use [default: the current one]")
+
+    opts, _ = parser.parse_args()
+
+    tree_dir = use_tree(opts.tree)
+
+    times = []
+    for _ in range(opts.rounds):
+        elapsed, modules = time_import(tree_dir, opts.module, opts.python)
+        times.append(elapsed)
+
+    times.sort()
+
+    sys.stdout.write("import %s\n" % opts.module)
+    sys.stdout.write("best:    %.2f ms\n" % (times[0] * 1000))
+    sys.stdout.write("median:  %.2f ms\n" % (times[len(times) // 2] * 1000))
+    sys.stdout.write("modules: %d\n" % len(modules))
+
+    for module in modules:
+        sys.stdout.write("    %s\n" % module)
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
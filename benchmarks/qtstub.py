@@ -0,0 +1,927 @@
+"""A pure Python stand-in for the parts of PyQt4.QtCore and PyQt4.QtGui used
+by uic.
+
+The stand-in allows loadUi() and loadUiType() to be benchmarked on machines
+that do not have a usable Qt installation, eg. a headless build server.  It
+does not draw anything.  Objects keep their parent/child relationships and
+record the values passed to their setters so that the time and memory spent
+building a widget tree are roughly proportional to those of the real thing.
+Absolute timings are not comparable with Qt but relative changes are.
+
+Call install() before importing PyQt4.uic.
+"""
+
+import struct
+import sys
+import types
+import weakref
+
+
+PYQT_VERSION_STR = '4.11.3'
+QT_VERSION_STR = '4.8.6'
+
+
+class EnumValue(int):
+    """ An enum member.  Calling it converts a value to the enum's type, as
+    does calling the enum's type in PyQt.
+    """
+
+    def __call__(self, value=0):
+        return value
+
+
+# The values of all enum members keyed by name.
+_enum_values = {}
+
+
+def _enum(name):
+    """ Return the value of an enum member. """
+
+    value = _enum_values.get(name)
+    if value is None:
+        value = _enum_values[name] = EnumValue(1 << (len(_enum_values) % 30))
+
+    return value
+
+
+class _EnumScope(type):
+    """ The meta-type of all classes.  Any unknown, public class attribute is
+    an enum member.
+    """
+
+    def __getattr__(cls, name):
+        if name.startswith('_'):
+            raise AttributeError(name)
+
+        value = _enum(name)
+        setattr(cls, name, value)
+
+        return value
+
+
+_Base = _EnumScope('_Base', (object, ), {})
+
+
+# The method name prefixes that are implemented generically.
+_GENERIC_PREFIXES = ('set', 'add', 'insert', 'remove', 'clear', 'resize',
+        'move', 'show', 'hide', 'raise_', 'lower', 'close', 'update')
+
+
+class _Generic(_Base):
+    """ The base class of all stand-in classes.  Methods whose names start
+    with one of the generic prefixes are implemented by recording their
+    arguments.
+    """
+
+    def __init__(self, *args):
+        self._args = args
+        self._values = {}
+
+    def __getattr__(self, name):
+        if name.startswith(_GENERIC_PREFIXES):
+            values = self.__dict__.get('_values')
+
+            if values is not None:
+                def method(*args):
+                    values[name] = args
+
+                return method
+
+        raise AttributeError(name)
+
+    def __eq__(self, other):
+        return type(self) is type(other) and self._args == other._args
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    def __hash__(self):
+        return id(self)
+
+
+# The signals that the stand-in classes have and the argument types of their
+# overloads.
+_SIGNALS = {
+    'accepted': ((), ),
+    'activated': (('int', ), ('QString', )),
+    'clicked': ((), ('bool', )),
+    'currentIndexChanged': (('int', ), ('QString', )),
+    'destroyed': ((), ('QObject*', )),
+    'pressed': ((), ),
+    'rejected': ((), ),
+    'released': ((), ),
+    'returnPressed': ((), ),
+    'textChanged': (('QString', ), ),
+    'toggled': (('bool', ), ),
+    'triggered': ((), ('bool', )),
+    'valueChanged': (('int', ), ('QString', )),
+}
+
+
+class QMetaMethod(_Generic):
+    def __init__(self, signature, method_type):
+        _Generic.__init__(self)
+        self._signature = signature
+        self._method_type = method_type
+
+    def signature(self):
+        return self._signature
+
+    def methodType(self):
+        return self._method_type
+
+
+class QMetaObject(_Generic):
+    def __init__(self, cls):
+        _Generic.__init__(self)
+        self._cls = cls
+        self._methods = [QMetaMethod('%s(%s)' % (name, ','.join(types)),
+                        QMetaMethod.Signal)
+                for name in sorted(_SIGNALS) for types in _SIGNALS[name]]
+
+    def className(self):
+        return self._cls.__name__
+
+    def methodCount(self):
+        return len(self._methods)
+
+    def method(self, index):
+        return self._methods[index]
+
+    @staticmethod
+    def connectSlotsByName(obj):
+        # Like Qt, look for a matching slot for every descendant and connect
+        # every overload of the signal.
+        slots = [name for name in dir(type(obj)) if name.startswith('on_')]
+
+        for child in obj.findChildren():
+            prefix = 'on_%s_' % child.objectName()
+
+            for slot in slots:
+                if slot.startswith(prefix):
+                    signal = slot[len(prefix):]
+
+                    for types in _SIGNALS.get(signal, ()):
+                        child._connections.append((signal, types,
+                                getattr(obj, slot)))
+
+
+# The calls of queued connections that are made by processEvents().
+_posted = []
+
+
+class _BoundSignal(object):
+    """ A signal bound to an object.  An overload is selected by indexing it
+    with its argument types.
+    """
+
+    def __init__(self, sender, name, args=None):
+        self._sender = sender
+        self._name = name
+        self._args = args
+
+    def __getitem__(self, args):
+        return _BoundSignal(self._sender, self._name, args)
+
+    def connect(self, slot, type=None):
+        if type == Qt.QueuedConnection:
+            # The call is made when events are next processed.
+            queued = slot
+            slot = lambda *args: _posted.append((queued, args))
+
+        self._sender._connections.append((self._name, self._args, slot))
+
+    def emit(self, *args):
+        for name, _, slot in list(self._sender._connections):
+            if name is self._name:
+                slot(*args)
+
+
+class pyqtSignal(object):
+    """ A signal defined by a Python sub-class.  The signal itself is used as
+    the name of its connections.
+    """
+
+    def __init__(self, *types):
+        self._types = types
+
+    def __get__(self, obj, cls):
+        if obj is None:
+            return self
+
+        return _BoundSignal(obj, self)
+
+
+class QObject(_Generic):
+    # The number of times that the parent of an existing object was changed.
+    _reparents = 0
+
+    def __init__(self, *args):
+        _Generic.__init__(self, *args)
+        self._name = ''
+        self._parent = None
+        self._children = []
+        self._connections = []
+
+        if args and isinstance(args[0], QObject):
+            self._set_parent(args[0])
+
+    def setParent(self, parent):
+        # Like Qt, setting the same parent again changes nothing.
+        if parent is not self._parent:
+            QObject._reparents += 1
+            self._set_parent(parent)
+
+    def _set_parent(self, parent):
+        if self._parent is not None:
+            self._parent._children.remove(self)
+
+        self._parent = parent
+
+        if parent is not None:
+            parent._children.append(self)
+
+    def parent(self):
+        return self._parent
+
+    def children(self):
+        return list(self._children)
+
+    def findChildren(self):
+        found = []
+        stack = list(self._children)
+
+        while stack:
+            obj = stack.pop()
+            found.append(obj)
+            stack.extend(obj._children)
+
+        return found
+
+    def findChild(self, cls, name):
+        for obj in self.findChildren():
+            if isinstance(obj, cls) and obj._name == name:
+                return obj
+
+        return None
+
+    def __getattr__(self, name):
+        if name in _SIGNALS:
+            return _BoundSignal(self, name)
+
+        return _Generic.__getattr__(self, name)
+
+    def deleteLater(self):
+        # The object and its children are deleted immediately rather than by
+        # the event loop.
+        for obj in [self] + self.findChildren():
+            obj._delete()
+
+        self._set_parent(None)
+
+    def _delete(self):
+        pass
+
+    def setObjectName(self, name):
+        self._name = name
+
+    def objectName(self):
+        return self._name
+
+    def metaObject(self):
+        return QMetaObject(type(self))
+
+    def setProperty(self, name, value):
+        self._values[name] = value
+
+    def property(self, name):
+        return self._values.get(name)
+
+    @staticmethod
+    def connect(sender, signal, slot):
+        sender._connections.append((signal, None, slot))
+
+        return True
+
+
+class QCoreApplication(QObject):
+    _instance = None
+
+    def __init__(self, *args):
+        QObject.__init__(self)
+        QCoreApplication._instance = self
+
+    @staticmethod
+    def instance():
+        return QCoreApplication._instance
+
+    @staticmethod
+    def processEvents(*args):
+        # The only events are the calls of queued connections and the
+        # timeouts of active timers.
+        while _posted:
+            slot, slot_args = _posted.pop(0)
+            slot(*slot_args)
+
+        for timer in list(QTimer._active):
+            if timer in QTimer._active:
+                if timer._single_shot:
+                    timer.stop()
+
+                timer.timeout.emit()
+
+    @staticmethod
+    def translate(context, text, disambig=None, encoding=None, n=-1):
+        return text
+
+    @staticmethod
+    def installTranslator(translator):
+        # Like QApplication, tell the top-level widgets.
+        for widget in list(QWidget._topLevelWidgets):
+            widget.changeEvent(QEvent(QEvent.LanguageChange))
+
+    removeTranslator = installTranslator
+
+
+class QApplication(QCoreApplication):
+    pass
+
+
+class QTimer(QObject):
+    # The timers that have been started and not stopped.
+    _active = []
+
+    timeout = pyqtSignal()
+
+    def __init__(self, *args):
+        QObject.__init__(self, *args)
+        self._interval = 0
+        self._single_shot = False
+
+    def setInterval(self, msec):
+        self._interval = msec
+
+    def setSingleShot(self, single_shot):
+        self._single_shot = single_shot
+
+    def start(self, msec=None):
+        if msec is not None:
+            self._interval = msec
+
+        if self not in QTimer._active:
+            QTimer._active.append(self)
+
+    def stop(self):
+        if self in QTimer._active:
+            QTimer._active.remove(self)
+
+    def isActive(self):
+        return self in QTimer._active
+
+    def _delete(self):
+        self.stop()
+
+
+class QEvent(_Base):
+    def __init__(self, type):
+        self._type = type
+
+    def type(self):
+        return self._type
+
+
+def SIGNAL(signature):
+    return '2' + signature
+
+
+def SLOT(signature):
+    return '1' + signature
+
+
+class Qt(_Base):
+    pass
+
+
+class QWidget(QObject):
+    # The top-level widgets that handle change events.
+    _topLevelWidgets = weakref.WeakSet()
+
+    def __init__(self, *args):
+        QObject.__init__(self, *args)
+        self._layout = None
+        self._size_policy = None
+        self._font = None
+
+        # Whether the widget has been shown or hidden, or None if it follows
+        # its parent.  Like Qt, a widget created with a visible parent isn't
+        # shown with it.
+        self._shown = None
+        self._explicit = False
+
+        parent = self.parentWidget()
+        if parent is not None and parent.isVisible():
+            self._shown = False
+
+        if not args and type(self).changeEvent != QWidget.changeEvent:
+            QWidget._topLevelWidgets.add(self)
+
+    def changeEvent(self, event):
+        pass
+
+    def setLayout(self, layout):
+        self._layout = layout
+        layout._set_widget(self)
+
+    def layout(self):
+        return self._layout
+
+    def parentWidget(self):
+        if isinstance(self._parent, QWidget):
+            return self._parent
+
+        return None
+
+    def setVisible(self, visible):
+        self._shown = visible
+        self._explicit = True
+
+        if visible:
+            for child in self._children:
+                if isinstance(child, QWidget) and child._shown is False and not child._explicit:
+                    child._shown = None
+
+    def show(self):
+        self.setVisible(True)
+
+    def hide(self):
+        self.setVisible(False)
+
+    def isVisible(self):
+        if self._shown is False:
+            return False
+
+        parent = self.parentWidget()
+        if parent is None:
+            return self._shown is True
+
+        return parent.isVisible()
+
+    def testAttribute(self, attribute):
+        if attribute == Qt.WA_WState_ExplicitShowHide:
+            return self._explicit
+
+        return False
+
+    def updatesEnabled(self):
+        return self._values.get('setUpdatesEnabled', (True, ))[0]
+
+    def setSizePolicy(self, *args):
+        if len(args) == 1:
+            self._size_policy = args[0]
+        else:
+            self._size_policy = QSizePolicy(*args)
+
+    def sizePolicy(self):
+        if self._size_policy is None:
+            self._size_policy = QSizePolicy()
+
+        return self._size_policy
+
+    def setFont(self, font):
+        self._font = font
+
+    def font(self):
+        if self._font is None:
+            self._font = QFont()
+
+        return self._font
+
+    def viewport(self):
+        return self
+
+    def addAction(self, action):
+        self._values.setdefault('actions', []).append(action)
+
+
+class QLayout(QObject):
+    def __init__(self, *args):
+        QObject.__init__(self, *args)
+        self._widget = None
+        self._items = []
+
+        if args and isinstance(args[0], QWidget):
+            args[0].setLayout(self)
+
+    def _set_widget(self, widget):
+        self._widget = widget
+
+        # Reparent anything that was added before the layout was installed.
+        for item in self._items:
+            if isinstance(item, QWidget):
+                item.setParent(widget)
+            elif isinstance(item, QLayout):
+                item.setParent(self)
+                item._set_widget(widget)
+
+    def addWidget(self, widget, *args):
+        self._items.append(widget)
+
+        if self._widget is not None:
+            widget.setParent(self._widget)
+
+    def addLayout(self, layout, *args):
+        self._items.append(layout)
+        layout.setParent(self)
+
+        if self._widget is not None:
+            layout._set_widget(self._widget)
+
+    def addItem(self, item, *args):
+        self._items.append(item)
+
+    def setWidget(self, row, role, widget):
+        self.addWidget(widget)
+
+    def setLayout(self, row, role, layout):
+        self.addLayout(layout)
+
+    def setItem(self, row, role, item):
+        self.addItem(item)
+
+    def count(self):
+        return len(self._items)
+
+    def itemAt(self, index):
+        return self._items[index]
+
+
+class QComboBox(QWidget):
+    def __init__(self, *args):
+        QWidget.__init__(self, *args)
+        self._items = []
+
+    def addItem(self, *args):
+        self._items.append(list(args))
+
+    def addItems(self, texts):
+        for text in texts:
+            self.addItem(text)
+
+    def setItemText(self, index, text):
+        self._items[index][-1] = text
+
+    def count(self):
+        return len(self._items)
+
+
+class _ItemView(QWidget):
+    def __init__(self, *args):
+        QWidget.__init__(self, *args)
+        self._sorting_enabled = False
+        self._header = QWidget()
+
+    def isSortingEnabled(self):
+        return self._sorting_enabled
+
+    def setSortingEnabled(self, enabled):
+        self._sorting_enabled = enabled
+
+    def header(self):
+        return self._header
+
+    horizontalHeader = verticalHeader = header
+
+
+class QListWidget(_ItemView):
+    def __init__(self, *args):
+        _ItemView.__init__(self, *args)
+        self._items = []
+
+    def addItem(self, item):
+        self._items.append(item)
+
+    def item(self, row):
+        if row < len(self._items):
+            return self._items[row]
+
+        return None
+
+    def count(self):
+        return len(self._items)
+
+
+class QTreeWidgetItem(_Generic):
+    def __init__(self, *args):
+        _Generic.__init__(self)
+        self._child_items = []
+
+        if args and isinstance(args[0], (QTreeWidgetItem, QTreeWidget)):
+            args[0]._child_items.append(self)
+
+    def child(self, index):
+        return self._child_items[index]
+
+    def childCount(self):
+        return len(self._child_items)
+
+
+class QTreeWidget(_ItemView):
+    def __init__(self, *args):
+        _ItemView.__init__(self, *args)
+        self._child_items = []
+        self._header_item = QTreeWidgetItem()
+
+    def topLevelItem(self, index):
+        return self._child_items[index]
+
+    def topLevelItemCount(self):
+        return len(self._child_items)
+
+    def headerItem(self):
+        return self._header_item
+
+
+class QTableWidget(_ItemView):
+    def __init__(self, *args):
+        _ItemView.__init__(self, *args)
+        self._cells = {}
+        self._horizontal_header_items = {}
+        self._vertical_header_items = {}
+
+    def setItem(self, row, column, item):
+        self._cells[(row, column)] = item
+
+    def item(self, row, column):
+        return self._cells.get((row, column))
+
+    def setHorizontalHeaderItem(self, column, item):
+        self._horizontal_header_items[column] = item
+
+    def horizontalHeaderItem(self, column):
+        return self._horizontal_header_items.get(column)
+
+    def setVerticalHeaderItem(self, row, item):
+        self._vertical_header_items[row] = item
+
+    def verticalHeaderItem(self, row):
+        return self._vertical_header_items.get(row)
+
+
+class QSizePolicy(_Generic):
+    def __init__(self, *args):
+        _Generic.__init__(self, *args)
+        self._height_for_width = False
+
+    def setHeightForWidth(self, dependent):
+        self._height_for_width = dependent
+
+    def hasHeightForWidth(self):
+        return self._height_for_width
+
+
+class QFont(_Generic):
+    pass
+
+
+class QIcon(_Generic):
+    @staticmethod
+    def fromTheme(name, fallback=None):
+        return QIcon(name)
+
+
+class _Image(_Generic):
+    def __init__(self, *args):
+        _Generic.__init__(self, *args)
+        self._width = self._height = 0
+
+        # Read the size of a PNG file from its header.
+        if args and isinstance(args[0], str):
+            try:
+                f = open(args[0], 'rb')
+
+                try:
+                    header = f.read(24)
+                finally:
+                    f.close()
+            except IOError:
+                header = b''
+
+            if header[12:16] == b'IHDR':
+                self._width = struct.unpack('>I', header[16:20])[0]
+                self._height = struct.unpack('>I', header[20:24])[0]
+
+    def width(self):
+        return self._width
+
+    def height(self):
+        return self._height
+
+    def depth(self):
+        return 32
+
+
+class QPixmap(_Image):
+    @staticmethod
+    def fromImage(image):
+        pixmap = QPixmap()
+        pixmap._width = image._width
+        pixmap._height = image._height
+
+        return pixmap
+
+
+class QImage(_Image):
+    def isNull(self):
+        return self._width == 0
+
+
+class QMenu(QWidget):
+    def __init__(self, *args):
+        QWidget.__init__(self, *args)
+        self._menu_action = QAction(self)
+
+    def menuAction(self):
+        return self._menu_action
+
+
+class QAction(QObject):
+    pass
+
+
+class QTranslator(QObject):
+    pass
+
+
+# The remaining classes whose behaviour is entirely generic.  Each entry is
+# the name of the class and the name of its super-class.
+_QTCORE_CLASSES = (
+    ('QSize', '_Generic'), ('QSizeF', '_Generic'), ('QPoint', '_Generic'),
+    ('QPointF', '_Generic'), ('QRect', '_Generic'), ('QRectF', '_Generic'),
+    ('QUrl', '_Generic'), ('QLocale', '_Generic'), ('QDate', '_Generic'),
+    ('QTime', '_Generic'), ('QDateTime', '_Generic'), ('QEvent', '_Generic'),
+    ('QByteArray', '_Generic'),
+)
+
+_QTGUI_CLASSES = (
+    ('QColor', '_Generic'), ('QBrush', '_Generic'),
+    ('QPalette', '_Generic'), ('QCursor', '_Generic'),
+    ('QKeySequence', '_Generic'), ('QGradient', '_Generic'),
+    ('QLinearGradient', 'QGradient'), ('QRadialGradient', 'QGradient'),
+    ('QConicalGradient', 'QGradient'), ('QSpacerItem', '_Generic'),
+    ('QListWidgetItem', '_Generic'), ('QTableWidgetItem', '_Generic'),
+    ('QActionGroup', 'QObject'), ('QButtonGroup', 'QObject'),
+    ('QBoxLayout', 'QLayout'), ('QHBoxLayout', 'QBoxLayout'),
+    ('QVBoxLayout', 'QBoxLayout'), ('QGridLayout', 'QLayout'),
+    ('QFormLayout', 'QLayout'), ('QStackedLayout', 'QLayout'),
+    ('QFrame', 'QWidget'), ('QLabel', 'QFrame'),
+    ('QAbstractScrollArea', 'QFrame'), ('QScrollArea', 'QAbstractScrollArea'),
+    ('QMdiArea', 'QAbstractScrollArea'),
+    ('QTextEdit', 'QAbstractScrollArea'), ('QTextBrowser', 'QTextEdit'),
+    ('QPlainTextEdit', 'QAbstractScrollArea'),
+    ('QGraphicsView', 'QAbstractScrollArea'),
+    ('QAbstractItemView', '_ItemView'), ('QListView', 'QAbstractItemView'),
+    ('QTreeView', 'QAbstractItemView'), ('QTableView', 'QAbstractItemView'),
+    ('QColumnView', 'QAbstractItemView'), ('QHeaderView', 'QAbstractItemView'),
+    ('QStackedWidget', 'QFrame'), ('QToolBox', 'QFrame'),
+    ('QSplitter', 'QFrame'), ('QLCDNumber', 'QFrame'),
+    ('QAbstractButton', 'QWidget'), ('QPushButton', 'QAbstractButton'),
+    ('QCommandLinkButton', 'QPushButton'), ('QToolButton', 'QAbstractButton'),
+    ('QCheckBox', 'QAbstractButton'), ('QRadioButton', 'QAbstractButton'),
+    ('QAbstractSpinBox', 'QWidget'), ('QSpinBox', 'QAbstractSpinBox'),
+    ('QDoubleSpinBox', 'QAbstractSpinBox'),
+    ('QDateTimeEdit', 'QAbstractSpinBox'), ('QDateEdit', 'QDateTimeEdit'),
+    ('QTimeEdit', 'QDateTimeEdit'), ('QAbstractSlider', 'QWidget'),
+    ('QSlider', 'QAbstractSlider'), ('QScrollBar', 'QAbstractSlider'),
+    ('QDial', 'QAbstractSlider'), ('QFontComboBox', 'QComboBox'),
+    ('QLineEdit', 'QWidget'), ('QGroupBox', 'QWidget'),
+    ('QTabWidget', 'QWidget'), ('QTabBar', 'QWidget'),
+    ('QProgressBar', 'QWidget'), ('QDialogButtonBox', 'QWidget'),
+    ('QCalendarWidget', 'QWidget'), ('QMenuBar', 'QWidget'),
+    ('QStatusBar', 'QWidget'), ('QToolBar', 'QWidget'),
+    ('QDockWidget', 'QWidget'), ('QMainWindow', 'QWidget'),
+    ('QDialog', 'QWidget'), ('QWizard', 'QDialog'),
+    ('QWizardPage', 'QWidget'), ('QMdiSubWindow', 'QWidget'),
+)
+
+
+# The methods of containers that make the page passed as their first argument
+# a child of either the container itself or a widget private to the container,
+# as they do in Qt.
+_PAGE_METHODS = (
+    ('QDockWidget', 'setWidget', False), ('QScrollArea', 'setWidget', False),
+    ('QStackedWidget', 'addWidget', False), ('QTabWidget', 'addTab', True),
+    ('QToolBox', 'addItem', True), ('QWizard', 'addPage', True),
+)
+
+
+def _page_method(name, private):
+    """ Return a container method that records its arguments and reparents
+    the page.
+    """
+
+    def method(self, page, *args):
+        self._values[name] = (page, ) + args
+        self.__dict__.setdefault('_page_list', []).append(page)
+
+        if private:
+            parent = self.__dict__.get('_pages')
+            if parent is None:
+                parent = self._pages = QWidget(self)
+        else:
+            parent = self.viewport()
+
+        page.setParent(parent)
+
+    return method
+
+
+def _create_module(name, explicit, generic):
+    """ Create a stand-in module from the names of explicitly implemented
+    objects and a table of generic classes.
+    """
+
+    module = types.ModuleType(name)
+    namespace = globals()
+
+    for obj_name in explicit:
+        setattr(module, obj_name, namespace[obj_name])
+
+    for cls_name, base_name in generic:
+        base = namespace.get(base_name) or getattr(module, base_name)
+        cls = _EnumScope(cls_name, (base, ), {'__module__': name})
+        setattr(module, cls_name, cls)
+
+    return module
+
+
+QtCore = _create_module('PyQt4.QtCore',
+        ('PYQT_VERSION_STR', 'QT_VERSION_STR', 'QObject', 'QMetaObject',
+        'QMetaMethod', 'QCoreApplication', 'QEvent', 'QTimer', 'QTranslator', 'Qt', 'SIGNAL',
+        'SLOT', 'pyqtSignal'),
+        _QTCORE_CLASSES)
+
+QtGui = _create_module('PyQt4.QtGui',
+        ('QApplication', 'QWidget', 'QLayout', 'QComboBox', 'QListWidget',
+        'QTreeWidget', 'QTreeWidgetItem', 'QTableWidget', 'QSizePolicy',
+        'QFont', 'QIcon', 'QPixmap', 'QImage', 'QMenu', 'QAction'),
+        _QTGUI_CLASSES)
+
+# QtGui classes used as bases of other QtGui classes.
+_ItemView.__module__ = 'PyQt4.QtGui'
+_Image.__module__ = 'PyQt4.QtGui'
+
+for _cls_name, _name, _private in _PAGE_METHODS:
+    setattr(getattr(QtGui, _cls_name), _name, _page_method(_name, _private))
+
+
+def _count(self):
+    return len(self.__dict__.get('_page_list', ()))
+
+
+def _currentIndex(self):
+    # Like Qt, the first page added becomes the current one.
+    return self.__dict__.get('_current', 0 if _count(self) else -1)
+
+
+def _setCurrentIndex(self, index):
+    self._values['setCurrentIndex'] = (index, )
+
+    # Like Qt, an index that isn't that of a page is ignored.
+    if 0 <= index < _count(self):
+        self._current = index
+
+
+# The containers that show one of their pages at a time.
+for _cls_name in ('QStackedWidget', 'QTabWidget', 'QToolBox'):
+    _cls = getattr(QtGui, _cls_name)
+    _cls.count = _count
+    _cls.currentIndex = _currentIndex
+    _cls.setCurrentIndex = _setCurrentIndex
+
+
+def reparent_count():
+    """ Return the number of times that the parent of an existing object has
+    been changed.
+    """
+
+    return QObject._reparents
+
+
+def qt_available():
+    """ Return True if the real PyQt4.QtGui can be imported. """
+
+    try:
+        from PyQt4 import QtGui
+    except ImportError:
+        return False
+
+    return QtGui is not globals()['QtGui']
+
+
+def install():
+    """ Install the stand-in as PyQt4.QtCore and PyQt4.QtGui. """
+
+    import PyQt4
+
+    sys.modules['PyQt4.QtCore'] = PyQt4.QtCore = QtCore
+    sys.modules['PyQt4.QtGui'] = PyQt4.QtGui = QtGui
@@ -0,0 +1,175 @@
+"""Count the widgets that are reparented while forms with containers load.
+
+Synthetic forms, in which some of the group boxes are replaced by the pages of
+tab widgets, stacked widgets, scroll areas and tool boxes, are loaded with
+loadUi().  The best and mean times are reported along with the number of
+times that the parent of an existing widget was changed while loading each
+form.
+
+With the real PyQt4 the ParentChange, ChildAdded and ChildRemoved events
+delivered while loading are counted.  The stand-in in benchmarks.qtstub counts
+the calls to setParent() that change the parent of an object.  Run the
+benchmark against different version trees to compare them.
+"""
+
+import optparse
+import shutil
+import sys
+import tempfile
+import timeit
+
+from benchmarks import DEFAULT_TREE, use_tree
+from benchmarks.corpus import add_spec_options, spec_from_options, write_corpus
+from benchmarks.suite import select_qt
+
+
+# The names of the events that are counted.
+COUNTED_EVENTS = ('ParentChange', 'ChildAdded', 'ChildRemoved')
+
+
+def _event_counter(QtCore):
+    """ Return an event filter that counts the events in COUNTED_EVENTS. """
+
+    types = dict([(int(getattr(QtCore.QEvent, name)), name)
+            for name in COUNTED_EVENTS])
+
+    class EventCounter(QtCore.QObject):
+        def __init__(self):
+            QtCore.QObject.__init__(self)
+
+            self.counts = dict([(name, 0) for name in COUNTED_EVENTS])
+
+        def eventFilter(self, obj, event):
+            name = types.get(int(event.type()))
+            if name is not None:
+                self.counts[name] += 1
+
+            return False
+
+    return EventCounter()
+
+
+def load_form(ui_file, app, real_qt):
+    """ Load a form and process the resulting events.  Return the time taken.
+    """
+
+    from PyQt4 import uic
+
+    start = timeit.default_timer()
+
+    widget = uic.loadUi(ui_file)
+
+    if real_qt:
+        app.processEvents()
+
+    elapsed = timeit.default_timer() - start
+
+    if real_qt:
+        widget.deleteLater()
+        app.processEvents()
+
+    return elapsed
+
+
+def count_reparents(ui_files, app, real_qt):
+    """ Load every form of a corpus and return a dict of the number of each
+    kind of reparenting keyed by its name.
+    """
+
+    if not real_qt:
+        from benchmarks import qtstub
+
+        before = qtstub.reparent_count()
+
+        for ui_file in ui_files:
+            load_form(ui_file, app, real_qt)
+
+        return {'setParent': qtstub.reparent_count() - before}
+
+    from PyQt4 import QtCore
+
+    counter = _event_counter(QtCore)
+    app.installEventFilter(counter)
+
+    try:
+        for ui_file in ui_files:
+            load_form(ui_file, app, real_qt)
+    finally:
+        app.removeEventFilter(counter)
+
+    return counter.counts
+
+
+def benchmark(ui_files, rounds, app, real_qt):
+    """ Load every form of a corpus and return a dict of the results. """
+
+    # Warm up any caches.
+    load_form(ui_files[0], app, real_qt)
+
+    times = []
+    for _ in range(rounds):
+        times.append(sum([load_form(ui_file, app, real_qt)
+                for ui_file in ui_files]))
+
+    return {
+        'best_s': min(times),
+        'mean_s': sum(times) / len(times),
+        'reparents': count_reparents(ui_files, app, real_qt),
+    }
+
+
+def main():
+    parser = optparse.OptionParser(
+            usage="python -m benchmarks.reparenting [options]")
+    parser.add_option("--tree", dest="tree", default=DEFAULT_TREE,
+            help="the version tree containing PyQt4 [default: %default]")
+    parser.add_option("--qt", dest="qt", type="choice",
+            choices=('auto', 'real', 'stub'), default='auto',
+            help="use the real PyQt4 or the pure Python stand-in [default: %default]")
+    parser.add_option("-n", "--forms", dest="forms", type="int", default=5,
+            help="the number of synthetic forms to generate [default: %default]")
+    parser.add_option("-r", "--rounds", dest="rounds", type="int", default=3,
+            help="the number of times each form is loaded [default: %default]")
+    add_spec_options(parser)
+
+    # Forms with many containers are the interesting case.
+    parser.set_defaults(depth=4, widgets=200, custom=0, containers=0.5)
+
+    opts, _ = parser.parse_args()
+
+    use_tree(opts.tree)
+    qt = select_qt(opts.qt)
+    real_qt = qt.startswith('real')
+
+    from PyQt4 import QtGui
+
+    app = QtGui.QApplication.instance()
+    if app is None:
+        app = QtGui.QApplication(sys.argv)
+
+    spec = spec_from_options(opts)
+    corpus_dir = tempfile.mkdtemp(prefix='uic-reparent-')
+
+    try:
+        ui_files = write_corpus(corpus_dir, opts.forms, spec)
+        results = benchmark(ui_files, opts.rounds, app, real_qt)
+    finally:
+        shutil.rmtree(corpus_dir, ignore_errors=True)
+
+    sys.stdout.write("%d forms, %d widgets nested %d deep, %g containers, %d rounds, %s\n" % (
+            len(ui_files), spec.widgets, spec.depth, spec.containers,
+            opts.rounds, qt))
+    sys.stdout.write("best:    %.4f s\n" % results['best_s'])
+    sys.stdout.write("mean:    %.4f s\n" % results['mean_s'])
+    sys.stdout.write("ms/form: %.3f\n" % (
+            results['best_s'] * 1000.0 / len(ui_files)))
+
+    for name, count in sorted(results['reparents'].items()):
+        sys.stdout.write("%s: %.1f per form\n" % (name,
+                float(count) / len(ui_files)))
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
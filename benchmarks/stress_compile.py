@@ -0,0 +1,138 @@
+"""Stress test concurrent compilation of .ui files.
+
+Every form of the corpus is first compiled serially to get the reference
+output.  The same forms are then compiled many times by a pool of threads,
+each compilation using its own indentation width, and every result must be
+byte-identical to the corresponding reference.  The exit status is 0 if all
+compilations matched.
+"""
+
+import optparse
+import sys
+import threading
+import timeit
+
+from benchmarks import DEFAULT_TREE, use_tree
+from benchmarks.compile_throughput import load_corpus
+from benchmarks.corpus import FormSpec, synthetic_corpus
+
+
+# The indentation widths that are cycled through so that concurrent
+# compilations disagree about their code style.
+INDENT_WIDTHS = (4, 0, 2)
+
+
+def compile_form(contents, indentwidth):
+    """ Compile a form and return the generated code. """
+
+    from PyQt4.uic.Compiler.compiler import UICompiler
+    from PyQt4.uic.Compiler.context import CompilerContext
+
+    if sys.hexversion >= 0x03000000:
+        from io import StringIO
+    else:
+        from StringIO import StringIO
+
+    pyfile = StringIO()
+    UICompiler(CompilerContext(indentwidth)).compileUi(StringIO(contents),
+            pyfile, False, '_rc')
+
+    return pyfile.getvalue()
+
+
+def main():
+    parser = optparse.OptionParser(
+            usage="python -m benchmarks.stress_compile [options] [ui-dir]")
+    parser.add_option("--tree", dest="tree", default=DEFAULT_TREE,
+            help="the version tree containing PyQt4 [default: %default]")
+    parser.add_option("-n", "--forms", dest="forms", type="int", default=24,
+            help="the number of synthetic forms to generate [default: %default]")
+    parser.add_option("-j", "--threads", dest="threads", type="int",
+            default=8,
+            help="the number of compiler threads [default: %default]")
+    parser.add_option("-c", "--compiles", dest="compiles", type="int",
+            default=500,
+            help="the total number of concurrent compilations [default: %default]")
+
+    opts, args = parser.parse_args()
+
+    use_tree(opts.tree)
+
+    if args:
+        corpus = [contents for _, contents in load_corpus(args[0])]
+    else:
+        corpus = [contents for _, contents in synthetic_corpus(opts.forms,
+                FormSpec(widgets=20, depth=1))]
+
+    if not corpus:
+        sys.stderr.write("Error: no .ui files found\n")
+        return 1
+
+    # Each job is identified by the index of its form and indentation width.
+    jobs = [(nr % len(corpus), INDENT_WIDTHS[nr % len(INDENT_WIDTHS)])
+            for nr in range(opts.compiles)]
+
+    reference = {}
+    for job in set(jobs):
+        reference[job] = compile_form(corpus[job[0]], job[1])
+
+    lock = threading.Lock()
+    failures = []
+
+    def worker():
+        while True:
+            lock.acquire()
+            try:
+                if not jobs:
+                    return
+
+                job = jobs.pop()
+            finally:
+                lock.release()
+
+            try:
+                code = compile_form(corpus[job[0]], job[1])
+            except Exception:
+                code = sys.exc_info()[1]
+
+            if code != reference[job]:
+                lock.acquire()
+                failures.append((job, code))
+                lock.release()
+
+    threads = [threading.Thread(target=worker) for _ in range(opts.threads)]
+
+    start = timeit.default_timer()
+
+    for t in threads:
+        t.start()
+
+    for t in threads:
+        t.join()
+
+    elapsed = timeit.default_timer() - start
+
+    sys.stdout.write("%d compilations of %d forms in %d threads took %.3f s\n"
+            % (opts.compiles, len(corpus), opts.threads, elapsed))
+
+    if failures:
+        for (nr, indentwidth), code in failures[:10]:
+            if isinstance(code, Exception):
+                detail = "%s: %s" % (code.__class__.__name__, code)
+            else:
+                detail = "output differs from the reference"
+
+            sys.stderr.write("form %d (indent %d): %s\n" % (nr, indentwidth,
+                    detail))
+
+        sys.stderr.write("%d of %d compilations failed\n" % (len(failures),
+                opts.compiles))
+        return 1
+
+    sys.stdout.write("all compilations matched the reference output\n")
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
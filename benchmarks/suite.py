@@ -0,0 +1,256 @@
+"""Run the uic benchmark suite.
+
+A corpus of .ui files is taken from a directory or generated from the
+synthetic form options.  Each of the following phases is then timed over the
+whole corpus:
+
+    parse       parsing the XML of each form
+    compile     compileUi() to an in-memory file
+    loadUiType  loadUiType(), ie. compiling and executing the generated code
+    loadUi      loadUi(), ie. creating the widgets
+
+The best and mean round of each phase are reported along with its peak
+memory allocation (measured in a separate, untimed round as tracing memory
+is expensive).  Peak memory requires tracemalloc and is reported as null
+when it is not available, eg. on Python v2.
+
+If a usable PyQt4 cannot be imported then the pure Python stand-in in
+benchmarks.qtstub is used so that the loader phases can run headless.  The
+results can be written as JSON with --output.
+"""
+
+import json
+import optparse
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import timeit
+
+from benchmarks import DEFAULT_TREE, use_tree
+from benchmarks.corpus import add_spec_options, spec_from_options, write_corpus
+
+try:
+    import tracemalloc
+except ImportError:
+    tracemalloc = None
+
+
+PHASES = ('parse', 'compile', 'loadUiType', 'loadUi')
+
+
+def _parse(ui_file):
+    from xml.etree.ElementTree import parse
+
+    parse(ui_file)
+
+
+def _compile(ui_file):
+    from PyQt4 import uic
+
+    if sys.hexversion >= 0x03000000:
+        from io import StringIO
+    else:
+        from StringIO import StringIO
+
+    uic.compileUi(ui_file, StringIO())
+
+
+def _load_ui_type(ui_file):
+    from PyQt4 import uic
+
+    uic.loadUiType(ui_file)
+
+
+def _load_ui(ui_file):
+    from PyQt4 import uic
+
+    uic.loadUi(ui_file)
+
+
+_PHASE_FUNCTIONS = {
+    'parse': _parse,
+    'compile': _compile,
+    'loadUiType': _load_ui_type,
+    'loadUi': _load_ui,
+}
+
+
+def run_phase(phase, ui_files):
+    """ Run a phase once for every form of a corpus. """
+
+    func = _PHASE_FUNCTIONS[phase]
+
+    for ui_file in ui_files:
+        func(ui_file)
+
+
+def peak_memory(phase, ui_files):
+    """ Return the peak number of bytes allocated while running a phase, or
+    None if it cannot be measured.
+    """
+
+    if tracemalloc is None:
+        return None
+
+    tracemalloc.start()
+
+    try:
+        run_phase(phase, ui_files)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return peak
+
+
+def benchmark(phases, ui_files, rounds):
+    """ Benchmark a number of phases against a corpus and return a dict of the
+    results of each phase keyed by the name of the phase.
+    """
+
+    results = {}
+
+    for phase in phases:
+        # Warm up any caches so that the rounds are comparable.
+        run_phase(phase, ui_files[:1])
+
+        times = []
+        for _ in range(rounds):
+            start = timeit.default_timer()
+            run_phase(phase, ui_files)
+            times.append(timeit.default_timer() - start)
+
+        best = min(times)
+        mean = sum(times) / len(times)
+
+        results[phase] = {
+            'best_s': best,
+            'mean_s': mean,
+            'per_form_ms': best * 1000.0 / len(ui_files),
+            'peak_bytes': peak_memory(phase, ui_files),
+        }
+
+    return results
+
+
+def select_qt(qt):
+    """ Make sure PyQt4.QtCore and PyQt4.QtGui can be imported, installing the
+    stand-in if required.  Return a description of the Qt being used.
+    """
+
+    from benchmarks import qtstub
+
+    if qt == 'auto':
+        qt = 'real' if qtstub.qt_available() else 'stub'
+
+    if qt == 'stub':
+        qtstub.install()
+
+    from PyQt4 import QtCore
+
+    return '%s (PyQt %s, Qt %s)' % (qt, QtCore.PYQT_VERSION_STR,
+            QtCore.QT_VERSION_STR)
+
+
+def main():
+    parser = optparse.OptionParser(
+            usage="python -m benchmarks.suite [options] [ui-dir]")
+    parser.add_option("--tree", dest="tree", default=DEFAULT_TREE,
+            help="the version tree containing PyQt4 [default: %default]")
+    parser.add_option("--qt", dest="qt", type="choice",
+            choices=('auto', 'real', 'stub'), default='auto',
+            help="use the real PyQt4 or the pure Python stand-in [default: %default]")
+    parser.add_option("-p", "--phases", dest="phases",
+            default=','.join(PHASES),
+            help="the comma separated phases to run [default: %default]")
+    parser.add_option("-n", "--forms", dest="forms", type="int", default=20,
+            help="the number of synthetic forms to generate [default: %default]")
+    parser.add_option("--seed", dest="seed", type="int", default=0,
+            help="the seed of the first synthetic form [default: %default]")
+    parser.add_option("-r", "--rounds", dest="rounds", type="int", default=3,
+            help="the number of times each phase is run [default: %default]")
+    parser.add_option("-o", "--output", dest="output", metavar="FILE",
+            help="write the results as JSON to FILE")
+    add_spec_options(parser)
+
+    opts, args = parser.parse_args()
+
+    phases = [p.strip() for p in opts.phases.split(',') if p.strip()]
+    for phase in phases:
+        if phase not in PHASES:
+            parser.error("unknown phase '%s'" % phase)
+
+    use_tree(opts.tree)
+    qt = select_qt(opts.qt)
+
+    spec = None
+    tmp_dir = None
+
+    if args:
+        corpus_dir = os.path.abspath(args[0])
+        ui_files = []
+
+        for root, _, files in os.walk(corpus_dir):
+            ui_files.extend([os.path.join(root, f) for f in sorted(files)
+                    if f.endswith('.ui')])
+    else:
+        spec = spec_from_options(opts)
+        corpus_dir = tmp_dir = tempfile.mkdtemp(prefix='uic-bench-')
+        ui_files = write_corpus(corpus_dir, opts.forms, spec, opts.seed)
+
+    # Custom widget modules are imported relative to the corpus.
+    sys.path.insert(0, corpus_dir)
+
+    try:
+        if not ui_files:
+            sys.stderr.write("Error: no .ui files found\n")
+            return 1
+
+        phase_results = benchmark(phases, ui_files, opts.rounds)
+    finally:
+        if tmp_dir is not None:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    results = {
+        'python': platform.python_version(),
+        'platform': sys.platform,
+        'tree': opts.tree,
+        'qt': qt,
+        'forms': len(ui_files),
+        'rounds': opts.rounds,
+        'spec': spec.as_dict() if spec is not None else None,
+        'phases': phase_results,
+    }
+
+    sys.stdout.write("%d forms, %d rounds, %s\n" % (len(ui_files),
+            opts.rounds, qt))
+    sys.stdout.write("%-12s %10s %10s %12s %12s\n" % ('phase', 'best s',
+            'mean s', 'ms/form', 'peak KiB'))
+
+    for phase in phases:
+        r = phase_results[phase]
+
+        if r['peak_bytes'] is None:
+            peak = 'n/a'
+        else:
+            peak = '%.1f' % (r['peak_bytes'] / 1024.0)
+
+        sys.stdout.write("%-12s %10.4f %10.4f %12.3f %12s\n" % (phase,
+                r['best_s'], r['mean_s'], r['per_form_ms'], peak))
+
+    if opts.output:
+        f = open(opts.output, 'w')
+
+        try:
+            json.dump(results, f, indent=2, sort_keys=True)
+            f.write('\n')
+        finally:
+            f.close()
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,260 @@
+"""Package the PyQt4.uic package of a version tree as a zipimport archive.
+
+Importing PyQt4.uic from a version tree on a share stats and opens a file for
+each of its modules.  Instead, "python bundle.py <tree-dir>" writes the whole
+package, precompiled, to a single archive (PyQt4_uic.zip) at the root of the
+tree.  userSetup.py puts the archive on sys.path in front of the tree so that
+the package is imported from it and the extension modules are still imported
+from the tree.
+
+The modules are precompiled by the interpreter running this script, so it
+must be the same version as Maya's (ie. run it with mayapy).  The source of
+each module is also included so that, if the versions do not match, the
+modules are compiled when they are imported rather than failing.
+
+The archive contains an index (PyQt4/uic/index.json) of its modules and widget
+plugins that the object creator uses to find the plugins.  The archive must
+be rebuilt whenever the package is changed.
+"""
+
+import json
+import os
+import platform
+import py_compile
+import sys
+import tempfile
+import time
+import zipfile
+
+
+# The name of the archive at the root of a version tree.
+ARCHIVE_NAME = 'PyQt4_uic.zip'
+
+# The name of the index in the archive, relative to the uic package.
+INDEX_NAME = 'index.json'
+
+# The PyQt4 package in the archive extends its __path__ with the tree's so
+# that the extension modules can be imported.
+_PACKAGE_EXTENSION = """
+
+# Added by bundle.py.  The extension modules are in the version tree that
+# contains this archive.
+import os as _os
+
+__path__.append(_os.path.join(_os.path.dirname(_os.path.dirname(
+        _os.path.dirname(_os.path.abspath(__file__)))), 'PyQt4'))
+
+del _os
+"""
+
+
+def _magic():
+    """ Return the magic number of the current interpreter's compiled modules
+    as a hex string.
+    """
+
+    try:
+        from importlib.util import MAGIC_NUMBER
+    except ImportError:
+        from imp import get_magic as _get_magic
+        MAGIC_NUMBER = _get_magic()
+
+    return ''.join(['%02x' % c for c in bytearray(MAGIC_NUMBER)])
+
+
+def _uic_files(uic_dir):
+    """ Return the sorted list of the paths, relative to the uic package and
+    using '/' as the separator, of the files in the package.
+    """
+
+    rel_paths = []
+
+    for root, dirs, files in os.walk(uic_dir):
+        dirs[:] = sorted([d for d in dirs if d != '__pycache__'])
+
+        rel_dir = os.path.relpath(root, uic_dir)
+
+        for fname in sorted(files):
+            if not fname.endswith('.py'):
+                continue
+
+            if rel_dir == '.':
+                rel_paths.append(fname)
+            else:
+                rel_paths.append(rel_dir.replace(os.sep, '/') + '/' + fname)
+
+    return rel_paths
+
+
+def _add_source(archive, arcname, source, mtime, compile_dir):
+    """ Add the source of a module and, if it can be compiled by the current
+    interpreter, its compiled version.  Return True if it was compiled.
+    """
+
+    # zipimport only uses the compiled module if its embedded modification
+    # time matches the time of the source's entry.
+    info = zipfile.ZipInfo(arcname, time.localtime(mtime)[:6])
+    info.compress_type = zipfile.ZIP_DEFLATED
+    info.external_attr = 0o644 << 16
+    archive.writestr(info, source)
+
+    src_file = os.path.join(compile_dir, 'module.py')
+    cfile = os.path.join(compile_dir, 'module.pyc')
+
+    f = open(src_file, 'wb')
+
+    try:
+        f.write(source)
+    finally:
+        f.close()
+
+    os.utime(src_file, (mtime, mtime))
+
+    try:
+        py_compile.compile(src_file, cfile=cfile, dfile=arcname, doraise=True)
+    except py_compile.PyCompileError:
+        # eg. the Python v3 support modules when run by Python v2.
+        return False
+
+    info = zipfile.ZipInfo(arcname + 'c', info.date_time)
+    info.compress_type = zipfile.ZIP_DEFLATED
+    info.external_attr = 0o644 << 16
+
+    f = open(cfile, 'rb')
+
+    try:
+        archive.writestr(info, f.read())
+    finally:
+        f.close()
+
+    return True
+
+
+def _read(path):
+    """ Return the contents of a file as bytes. """
+
+    f = open(path, 'rb')
+
+    try:
+        return f.read()
+    finally:
+        f.close()
+
+
+def supports_archive(tree_dir):
+    """ Return True if the PyQt4.uic package of a version tree can find its
+    widget plugins when it is imported from an archive.
+    """
+
+    objcreator = os.path.join(tree_dir, 'PyQt4', 'uic', 'objcreator.py')
+
+    try:
+        return b'ARCHIVE_INDEX' in _read(objcreator)
+    except IOError:
+        return False
+
+
+def build_archive(tree_dir):
+    """ Write the archive of the PyQt4.uic package of a version tree and
+    return its index.
+    """
+
+    package_dir = os.path.join(tree_dir, 'PyQt4')
+    uic_dir = os.path.join(package_dir, 'uic')
+
+    archive_path = os.path.join(tree_dir, ARCHIVE_NAME)
+    tmp_path = archive_path + '.tmp'
+
+    compile_dir = tempfile.mkdtemp(prefix='pyqt4-bundle-')
+    archive = zipfile.ZipFile(tmp_path, 'w', zipfile.ZIP_DEFLATED)
+
+    modules = []
+    compiled = []
+    plugins = []
+
+    try:
+        init_py = os.path.join(package_dir, '__init__.py')
+        _add_source(archive, 'PyQt4/__init__.py',
+                _read(init_py) + _PACKAGE_EXTENSION.encode('ascii'),
+                os.path.getmtime(init_py), compile_dir)
+
+        for rel_path in _uic_files(uic_dir):
+            path = os.path.join(uic_dir, *rel_path.split('/'))
+            arcname = 'PyQt4/uic/' + rel_path
+
+            # The widget plugins are executed by the object creator rather
+            # than imported so they are not compiled.
+            if rel_path.startswith('widget-plugins/'):
+                archive.write(path, arcname)
+                plugins.append(rel_path.split('/', 1)[1])
+                continue
+
+            module = 'PyQt4.uic.' + rel_path[:-3].replace('/', '.')
+            if module.endswith('.__init__'):
+                module = module[:-9]
+
+            modules.append(module)
+
+            if _add_source(archive, arcname, _read(path),
+                    os.path.getmtime(path), compile_dir):
+                compiled.append(module)
+
+        index = {
+            'version': 1,
+            'built': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': platform.python_version(),
+            'magic': _magic(),
+            'modules': modules,
+            'compiled': compiled,
+            'widget-plugins': plugins,
+        }
+
+        archive.writestr('PyQt4/uic/' + INDEX_NAME,
+                json.dumps(index, indent=1, sort_keys=True))
+    finally:
+        archive.close()
+
+        for fname in os.listdir(compile_dir):
+            os.remove(os.path.join(compile_dir, fname))
+
+        os.rmdir(compile_dir)
+
+    if sys.platform == 'win32' and os.path.exists(archive_path):
+        os.remove(archive_path)
+
+    os.rename(tmp_path, archive_path)
+
+    return index
+
+
+def main():
+    import optparse
+
+    parser = optparse.OptionParser(usage="python bundle.py <tree-dir> ...")
+
+    _, args = parser.parse_args()
+
+    if not args:
+        parser.error("no version trees specified")
+
+    for tree_dir in args:
+        if not os.path.isdir(os.path.join(tree_dir, 'PyQt4', 'uic')):
+            sys.stderr.write("Error: %s does not contain PyQt4.uic\n" % tree_dir)
+            return 1
+
+        if not supports_archive(tree_dir):
+            sys.stderr.write("Error: the widget plugins of %s cannot be loaded from an archive\n" % tree_dir)
+            return 1
+
+        index = build_archive(tree_dir)
+
+        sys.stdout.write("%s: %d modules (%d compiled by Python %s), %d widget plugins\n" % (
+                os.path.join(tree_dir, ARCHIVE_NAME), len(index['modules']),
+                len(index['compiled']), index['python'],
+                len(index['widget-plugins'])))
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,602 @@
+"""Keep a local, per-user mirror of a version tree hosted on a network share.
+
+Each version tree on the share is published with a manifest of the size and
+SHA-1 hash of every file (see "python mirror.py manifest").  The mirror holds
+numbered copies of the tree, called generations.  A generation is built in a
+temporary directory that is renamed once it is complete, and it is never
+changed after that.
+
+At startup bootstrap() returns the directory that should be put on sys.path:
+the newest generation if there is one, otherwise the share itself.  A
+background thread then compares the share's manifest with that generation's.
+If anything has changed it builds a new generation, copying only the changed
+files from the share and linking or copying the rest from the previous
+generation.  The new generation is used by the next session.  A session
+therefore never sees a mix of old and new files, and no file that another
+session may still import (eg. a second Maya importing uic lazily from the
+archive) is replaced.
+
+Each session records its use of a generation with a file that it holds open
+until it exits.  A generation that has been superseded is removed once no
+session is using it.
+
+The mirror is disabled by setting PYQT4_MIRROR to 0.  The mirror is created
+below PYQT4_MIRROR_DIR if it is set, otherwise in a per-user directory.
+"""
+
+import errno
+import hashlib
+import json
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:
+    # Windows, where a file that is open cannot be removed.
+    fcntl = None
+
+
+# The name of the manifest file at the root of a version tree.
+MANIFEST_NAME = 'manifest.json'
+
+# The suffix of the directory in which a generation is built.
+BUILDING_SUFFIX = '.tmp'
+
+# The suffix of the directory of the files recording the sessions that are
+# using a generation.
+USERS_SUFFIX = '.users'
+
+# The number of seconds after which the lock of a sync is considered stale.
+# It is also the time a superseded generation is kept for a session that has
+# chosen it but hasn't yet recorded its use of it.
+LOCK_TIMEOUT = 600
+
+# The files that are not published.
+_EXCLUDED_SUFFIXES = ('.pyc', '.pyo')
+_EXCLUDED_NAMES = (MANIFEST_NAME, )
+
+# The files held open by this session to record the generations it uses.
+_markers = []
+
+
+def default_mirror_root():
+    """ Return the directory below which version trees are mirrored. """
+
+    root = os.environ.get('PYQT4_MIRROR_DIR')
+    if root:
+        return root
+
+    if sys.platform == 'win32':
+        base = os.environ.get('LOCALAPPDATA') or os.path.expanduser('~')
+    else:
+        base = os.path.join(os.path.expanduser('~'), '.cache')
+
+    return os.path.join(base, 'PyQt4Mirror')
+
+
+def _hash_file(path):
+    """ Return the SHA-1 hash of a file. """
+
+    sha1 = hashlib.sha1()
+
+    f = open(path, 'rb')
+
+    try:
+        while True:
+            chunk = f.read(1 << 16)
+            if not chunk:
+                break
+
+            sha1.update(chunk)
+    finally:
+        f.close()
+
+    return sha1.hexdigest()
+
+
+def _published_files(tree_dir):
+    """ Return the sorted list of the paths, relative to a tree and using '/'
+    as the separator, of the files that are published.
+    """
+
+    rel_paths = []
+
+    for root, dirs, files in os.walk(tree_dir):
+        dirs.sort()
+
+        for fname in files:
+            if fname.endswith(_EXCLUDED_SUFFIXES):
+                continue
+
+            rel_dir = os.path.relpath(root, tree_dir)
+
+            if rel_dir == '.':
+                if fname in _EXCLUDED_NAMES:
+                    continue
+
+                rel_path = fname
+            else:
+                rel_path = rel_dir.replace(os.sep, '/') + '/' + fname
+
+            rel_paths.append(rel_path)
+
+    rel_paths.sort()
+
+    return rel_paths
+
+
+def build_manifest(tree_dir, hashes=True):
+    """ Return the manifest of a version tree.  If hashes is False then only
+    the sizes and modification times of the files are recorded, which avoids
+    reading them.
+    """
+
+    files = {}
+
+    for rel_path in _published_files(tree_dir):
+        path = os.path.join(tree_dir, *rel_path.split('/'))
+        st = os.stat(path)
+
+        entry = {'size': st.st_size}
+
+        if hashes:
+            entry['sha1'] = _hash_file(path)
+        else:
+            entry['mtime'] = int(st.st_mtime)
+
+        files[rel_path] = entry
+
+    return {'version': 1, 'files': files}
+
+
+def read_manifest(tree_dir):
+    """ Return the manifest of a version tree or None if it doesn't have one
+    or it can't be read.
+    """
+
+    try:
+        f = open(os.path.join(tree_dir, MANIFEST_NAME))
+    except IOError:
+        return None
+
+    try:
+        try:
+            manifest = json.load(f)
+        except ValueError:
+            return None
+    finally:
+        f.close()
+
+    if not isinstance(manifest, dict) or 'files' not in manifest:
+        return None
+
+    return manifest
+
+
+def _write_json(path, obj):
+    """ Write an object as JSON so that the file is replaced atomically. """
+
+    tmp_path = path + '.tmp'
+
+    f = open(tmp_path, 'w')
+
+    try:
+        json.dump(obj, f, indent=1, sort_keys=True)
+    finally:
+        f.close()
+
+    _replace(tmp_path, path)
+
+
+def write_manifest(tree_dir):
+    """ Write the manifest of a version tree and return it. """
+
+    manifest = build_manifest(tree_dir)
+    _write_json(os.path.join(tree_dir, MANIFEST_NAME), manifest)
+
+    return manifest
+
+
+def _replace(src, dst):
+    """ Rename a file, replacing any existing file. """
+
+    if sys.platform == 'win32' and os.path.exists(dst):
+        os.remove(dst)
+
+    os.rename(src, dst)
+
+
+def _copy(src, dst, sha1=None):
+    """ Copy a file, creating any intermediate directories, and optionally
+    check its hash.  The hash is checked on the copy because the source may
+    be changed while it is being copied.
+    """
+
+    dst_dir = os.path.dirname(dst)
+    if not os.path.isdir(dst_dir):
+        os.makedirs(dst_dir)
+
+    shutil.copyfile(src, dst)
+
+    if sha1 is not None and _hash_file(dst) != sha1:
+        os.remove(dst)
+        raise IOError("%s changed while it was being copied" % src)
+
+
+def _link(src, dst):
+    """ Link a file of one generation into another, creating any intermediate
+    directories.  The file is copied if it cannot be linked.  Generations are
+    never changed so they may share files.
+    """
+
+    dst_dir = os.path.dirname(dst)
+    if not os.path.isdir(dst_dir):
+        os.makedirs(dst_dir)
+
+    try:
+        os.link(src, dst)
+    except (AttributeError, OSError):
+        # Python v2 on Windows has no os.link() and not every file system
+        # supports links.
+        shutil.copyfile(src, dst)
+
+
+def _generation_numbers(local_dir):
+    """ Return the sorted list of the numbers of the generations of a mirror,
+    including any that are incomplete.
+    """
+
+    try:
+        names = os.listdir(local_dir)
+    except OSError:
+        return []
+
+    return sorted([int(name) for name in names if name.isdigit()])
+
+
+def current_generation(local_dir):
+    """ Return the directory of the newest complete generation of a mirror or
+    None if there isn't one.
+    """
+
+    for number in reversed(_generation_numbers(local_dir)):
+        generation = os.path.join(local_dir, str(number))
+
+        if read_manifest(generation) is not None:
+            return generation
+
+    return None
+
+
+def _use(generation):
+    """ Record that this session is using a generation.  The file that records
+    it is held open until the session exits.
+    """
+
+    users_dir = generation + USERS_SUFFIX
+    if not os.path.isdir(users_dir):
+        os.makedirs(users_dir)
+
+    fd, _ = tempfile.mkstemp(prefix='%d-' % os.getpid(), dir=users_dir)
+
+    if fcntl is not None:
+        fcntl.flock(fd, fcntl.LOCK_EX)
+
+    _markers.append(fd)
+
+
+def _release(marker):
+    """ Remove the file recording the use of a generation by a session if the
+    session has exited.  Return True if it was removed.
+    """
+
+    if fcntl is None:
+        # Windows will not remove a file that a process has open.
+        try:
+            os.remove(marker)
+        except OSError as e:
+            return e.errno == errno.ENOENT
+
+        return True
+
+    try:
+        fd = os.open(marker, os.O_RDWR)
+    except OSError as e:
+        return e.errno == errno.ENOENT
+
+    try:
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except (IOError, OSError):
+            return False
+
+        os.remove(marker)
+    finally:
+        os.close(fd)
+
+    return True
+
+
+def _in_use(generation):
+    """ Return True if a generation is being used by a session. """
+
+    users_dir = generation + USERS_SUFFIX
+
+    try:
+        markers = os.listdir(users_dir)
+    except OSError:
+        return False
+
+    in_use = False
+
+    for name in markers:
+        if not _release(os.path.join(users_dir, name)):
+            in_use = True
+
+    return in_use
+
+
+def _remove_unused(local_dir):
+    """ Remove the generations of a mirror that have been superseded and are
+    not being used, and any incomplete generations.  The lock of the mirror
+    must be held.
+    """
+
+    current = current_generation(local_dir)
+    if current is None:
+        return
+
+    for name in os.listdir(local_dir):
+        if name.endswith(BUILDING_SUFFIX):
+            # The remains of an interrupted sync.
+            shutil.rmtree(os.path.join(local_dir, name), ignore_errors=True)
+
+    # A session that chose the previous generation just before this one was
+    # completed may not have recorded its use of it yet.
+    completed = os.path.getmtime(os.path.join(current, MANIFEST_NAME))
+    if time.time() - completed < LOCK_TIMEOUT:
+        return
+
+    current_number = int(os.path.basename(current))
+
+    for number in _generation_numbers(local_dir):
+        if number >= current_number:
+            break
+
+        generation = os.path.join(local_dir, str(number))
+
+        if _in_use(generation):
+            continue
+
+        # Anything that can't be removed now is tried again by a later sync.
+        shutil.rmtree(generation, ignore_errors=True)
+
+        if not os.path.exists(generation):
+            shutil.rmtree(generation + USERS_SUFFIX, ignore_errors=True)
+
+
+def _unchanged(local_entry, remote_entry):
+    """ Return True if a file's local manifest entry matches its remote one.
+    """
+
+    if local_entry is None or local_entry.get('size') != remote_entry['size']:
+        return False
+
+    for key in ('sha1', 'mtime'):
+        if key in remote_entry:
+            return local_entry.get(key) == remote_entry[key]
+
+    return False
+
+
+def _lock(local_dir):
+    """ Take the lock that prevents concurrent syncs of a mirror, eg. by two
+    Maya sessions.  Return the name of the lock file or None if the lock is
+    held by someone else.
+    """
+
+    lock_path = local_dir.rstrip('/\\') + '.lock'
+
+    parent = os.path.dirname(lock_path)
+    if not os.path.isdir(parent):
+        os.makedirs(parent)
+
+    for _ in range(2):
+        try:
+            os.close(os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+            return lock_path
+        except OSError as e:
+            if e.errno != errno.EEXIST:
+                raise
+
+        # Break a stale lock left by a session that died.
+        try:
+            if time.time() - os.path.getmtime(lock_path) < LOCK_TIMEOUT:
+                return None
+
+            os.remove(lock_path)
+        except OSError:
+            pass
+
+    return None
+
+
+def _refresh_lock(lock_path):
+    """ Update the modification time of a lock so that it isn't considered
+    stale while a long sync is in progress.
+    """
+
+    os.utime(lock_path, None)
+
+
+def _unlock(lock_path):
+    """ Release a lock taken by _lock(). """
+
+    try:
+        os.remove(lock_path)
+    except OSError as e:
+        if e.errno != errno.ENOENT:
+            raise
+
+
+def sync(remote_dir, local_dir):
+    """ Bring a mirror up to date with a version tree by building a new
+    generation if anything has changed.  Generations that are no longer used
+    are removed.  Return a tuple of the number of files copied and removed, or
+    None if another sync of the mirror was in progress.
+    """
+
+    lock_path = _lock(local_dir)
+    if lock_path is None:
+        return None
+
+    try:
+        remote = read_manifest(remote_dir)
+        if remote is None:
+            remote = build_manifest(remote_dir, hashes=False)
+
+        current = current_generation(local_dir)
+
+        if current is not None:
+            local_files = read_manifest(current)['files']
+        else:
+            local_files = {}
+
+        remote_files = remote['files']
+
+        changed = []
+
+        for rel_path in sorted(remote_files):
+            if _unchanged(local_files.get(rel_path), remote_files[rel_path]) and os.path.isfile(os.path.join(current, *rel_path.split('/'))):
+                continue
+
+            changed.append(rel_path)
+
+        deleted = [rel_path for rel_path in local_files
+                if rel_path not in remote_files]
+
+        if current is None or changed or deleted:
+            numbers = _generation_numbers(local_dir)
+            generation = os.path.join(local_dir,
+                    str(numbers[-1] + 1 if numbers else 1))
+            building = generation + BUILDING_SUFFIX
+
+            if os.path.isdir(building):
+                shutil.rmtree(building)
+
+            for rel_path in sorted(remote_files):
+                dst = os.path.join(building, *rel_path.split('/'))
+
+                _refresh_lock(lock_path)
+
+                if rel_path in changed:
+                    _copy(os.path.join(remote_dir, *rel_path.split('/')),
+                            dst, remote_files[rel_path].get('sha1'))
+                else:
+                    _link(os.path.join(current, *rel_path.split('/')), dst)
+
+            # The manifest is written last so that an interrupted build is
+            # never used.
+            _write_json(os.path.join(building, MANIFEST_NAME), remote)
+            os.rename(building, generation)
+
+        _remove_unused(local_dir)
+
+        return len(changed), len(deleted)
+    finally:
+        _unlock(lock_path)
+
+
+def start_sync(remote_dir, local_dir, log=None):
+    """ Sync a mirror in a daemon thread and return the thread.  log is an
+    optional callable that is passed a message if the sync fails.
+    """
+
+    def run():
+        try:
+            sync(remote_dir, local_dir)
+        except Exception as e:
+            if log is not None:
+                log("unable to sync %s with %s: %s" % (local_dir, remote_dir,
+                        e))
+
+    thread = threading.Thread(target=run, name='PyQt4MirrorSync')
+    thread.daemon = True
+    thread.start()
+
+    return thread
+
+
+def bootstrap(remote_dir, mirror_root=None, log=None):
+    """ Return the directory that should be put on sys.path for a version
+    tree on a share and start syncing its local mirror in the background.
+    """
+
+    if os.environ.get('PYQT4_MIRROR') == '0':
+        return remote_dir
+
+    if mirror_root is None:
+        mirror_root = default_mirror_root()
+
+    local_dir = os.path.join(mirror_root,
+            os.path.basename(os.path.normpath(remote_dir)))
+
+    # The mirror is only used once a sync has completed.
+    generation = current_generation(local_dir)
+
+    if generation is not None:
+        try:
+            _use(generation)
+        except Exception as e:
+            # An unrecorded generation could be removed while it is being
+            # used.
+            if log is not None:
+                log("unable to use %s: %s" % (generation, e))
+
+            generation = None
+
+    start_sync(remote_dir, local_dir, log=log)
+
+    if generation is None:
+        return remote_dir
+
+    return generation
+
+
+def main():
+    import optparse
+
+    parser = optparse.OptionParser(
+            usage="python mirror.py manifest <tree-dir> ...\n"
+                    "       python mirror.py sync <tree-dir> <mirror-dir>")
+
+    _, args = parser.parse_args()
+
+    if len(args) >= 2 and args[0] == 'manifest':
+        for tree_dir in args[1:]:
+            manifest = write_manifest(tree_dir)
+            sys.stdout.write("%s: %d files\n" % (tree_dir,
+                    len(manifest['files'])))
+
+        return 0
+
+    if len(args) == 3 and args[0] == 'sync':
+        result = sync(args[1], args[2])
+        if result is None:
+            sys.stderr.write("Error: %s is being synced by another process\n" % args[2])
+            return 1
+
+        sys.stdout.write("%d files copied, %d removed\n" % result)
+
+        return 0
+
+    parser.error("invalid command line")
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,45 @@
+"""Tests of the PyQt4 uic package.
+
+The tests use the pure Python stand-in for PyQt4 in benchmarks.qtstub so that
+they run without Qt.  They are run from the root of the repository, eg.
+
+    python -m unittest discover -s tests -t .
+
+and exercise the copy of PyQt4 in the default version tree.
+"""
+
+import os
+import tempfile
+
+from benchmarks import qtstub, use_tree
+
+
+def use_stub():
+    """ Make the PyQt4 package of the default version tree importable with the
+    stand-in as its QtCore and QtGui and return the application.
+    """
+
+    use_tree()
+    qtstub.install()
+
+    from PyQt4 import QtGui
+
+    app = QtGui.QApplication.instance()
+    if app is None:
+        app = QtGui.QApplication([])
+
+    return app
+
+
+def write_ui(test, text):
+    """ Write the text of a .ui file to a temporary file that is removed when
+    a test case finishes and return its name.
+    """
+
+    fd, ui_file = tempfile.mkstemp(suffix='.ui')
+    os.write(fd, text.encode('utf8'))
+    os.close(fd)
+
+    test.addCleanup(os.remove, ui_file)
+
+    return ui_file
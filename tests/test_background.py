@@ -0,0 +1,108 @@
+"""Tests of loadUiAsync()."""
+
+import unittest
+
+from tests import use_stub, write_ui
+
+
+# A simple form.
+FORM_UI = """<?xml version="1.0" encoding="UTF-8"?>
+<ui version="4.0">
+ <class>Form</class>
+ <widget class="QWidget" name="Form">
+  <layout class="QVBoxLayout" name="verticalLayout">
+   <item>
+    <widget class="QLabel" name="label"/>
+   </item>
+  </layout>
+ </widget>
+</ui>
+"""
+
+
+class TestReentrancy(unittest.TestCase):
+    """ Test the future when it is used while the form is being created. """
+
+    def setUp(self):
+        self.app = use_stub()
+
+        from PyQt4.uic.Loader import background
+
+        self.background = background
+
+        # Make calls to the future while the form is being created, as a slot
+        # run by a nested event loop might.
+        self.calls = []
+        self.errors = []
+
+        create = background.createPreparedUi
+
+        def createPreparedUi(*args):
+            for call in self.calls:
+                try:
+                    call()
+                except RuntimeError as e:
+                    self.errors.append(e)
+
+            return create(*args)
+
+        background.createPreparedUi = createPreparedUi
+
+        def restore():
+            background.createPreparedUi = create
+
+        self.addCleanup(restore)
+
+    def load(self):
+        """ Load the form in the background and wait for it to be prepared.
+        """
+
+        from PyQt4 import uic
+
+        future = uic.loadUiAsync(write_ui(self, FORM_UI))
+        future._thread.join()
+
+        return future
+
+    def test_reentrant_result(self):
+        """ result() raises RuntimeError while the form is being created. """
+
+        future = self.load()
+        self.calls.append(future.result)
+
+        form = future.result()
+
+        self.assertEqual(len(self.errors), 1)
+        self.assertTrue('result()' in str(self.errors[0]))
+        self.assertEqual(form.label.objectName(), 'label')
+
+    def test_reentrant_exception(self):
+        """ exception() raises RuntimeError while the form is being created.
+        """
+
+        future = self.load()
+        self.calls.append(future.exception)
+
+        self.assertTrue(future.exception() is None)
+        self.assertEqual(len(self.errors), 1)
+        self.assertTrue('exception()' in str(self.errors[0]))
+
+    def test_queued_creation(self):
+        """ The queued signal delivered while the form is being created is
+        ignored and the form is created once.
+        """
+
+        future = self.load()
+        finished = []
+        future.finished.connect(finished.append)
+        self.calls.append(self.app.processEvents)
+
+        self.app.processEvents()
+
+        self.assertTrue(future.done())
+        self.assertEqual(finished, [future])
+        self.assertEqual(self.errors, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
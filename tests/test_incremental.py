@@ -0,0 +1,95 @@
+"""Tests of loadUiIncremental()."""
+
+import unittest
+
+from tests import use_stub, write_ui
+
+
+# A form with a tab widget whose second tab is initially shown.
+TABS_UI = """<?xml version="1.0" encoding="UTF-8"?>
+<ui version="4.0">
+ <class>Tabs</class>
+ <widget class="QWidget" name="Tabs">
+  <layout class="QVBoxLayout" name="verticalLayout">
+   <item>
+    <widget class="QTabWidget" name="tabWidget">
+     <property name="currentIndex">
+      <number>1</number>
+     </property>
+     <widget class="QWidget" name="tab0">
+      <layout class="QVBoxLayout" name="verticalLayout_0">
+       <item>
+        <widget class="QLabel" name="label0"/>
+       </item>
+      </layout>
+     </widget>
+     <widget class="QWidget" name="tab1">
+      <layout class="QVBoxLayout" name="verticalLayout_1">
+       <item>
+        <widget class="QLabel" name="label1"/>
+       </item>
+      </layout>
+     </widget>
+     <widget class="QWidget" name="tab2">
+      <layout class="QVBoxLayout" name="verticalLayout_2">
+       <item>
+        <widget class="QLabel" name="label2"/>
+       </item>
+      </layout>
+     </widget>
+    </widget>
+   </item>
+  </layout>
+ </widget>
+</ui>
+"""
+
+
+class TestCurrentPage(unittest.TestCase):
+    """ Test that the page of a paged container that is initially shown is
+    shown while the form is being created.
+    """
+
+    def setUp(self):
+        use_stub()
+
+    def test_current_index_after_first_step(self):
+        """ The current index is set once the current page has been added.
+        """
+
+        from PyQt4 import uic
+
+        loader = uic.loadUiIncremental(write_ui(self, TABS_UI), budget_ms=0)
+        form = loader.widget()
+
+        loader.step()
+
+        self.assertEqual(form.tabWidget.count(), 3)
+        self.assertEqual(form.tabWidget.currentIndex(), 1)
+
+        loader.finish()
+
+        self.assertTrue(loader.isFinished())
+        self.assertEqual(form.tabWidget.currentIndex(), 1)
+
+    def test_current_page_created_first(self):
+        """ The contents of the current page are created before those of the
+        other pages.
+        """
+
+        from PyQt4 import uic
+
+        loader = uic.loadUiIncremental(write_ui(self, TABS_UI), budget_ms=0)
+        form = loader.widget()
+
+        while not hasattr(form, 'label1'):
+            loader.step()
+
+        self.assertFalse(hasattr(form, 'label0'))
+        self.assertFalse(hasattr(form, 'label2'))
+
+        loader.finish()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -3,7 +3,7 @@
 #   mail: zclongpop@163.com
 #   date: Fri, 10 Apr 2015 14:40:05
 #========================================
-import sys, inspect, os.path, re, maya.cmds
+import sys, inspect, os.path, re, imp, maya.cmds, maya.utils
 #--+--+--+--+--+--+--+--+--+--+--+--+--+--+--+--+--+--+--+--+--+--+--+--+--+--+--+--+--+--+--+--+--+--+--+--+--+--+--+--+
 QT_ROOT_PATH = os.path.dirname(inspect.getfile(inspect.currentframe()))
 
@@ -14,5 +14,16 @@ Maya_version = re.search('\d+$', Maya_product).group()
 #- get matched pyqt path
 Qt_path = os.path.normcase(os.path.join(QT_ROOT_PATH, '%s_%s'%(sys.platform, Maya_version)))
 
+#- use a local mirror of the version tree, it is synced with the share in the background
+try:
+    mirror = imp.load_source('pyqt4_mirror', os.path.join(QT_ROOT_PATH, 'mirror.py'))
+    Qt_path = mirror.bootstrap(Qt_path, log=lambda msg: maya.utils.executeDeferred(maya.cmds.warning, msg))
+except Exception:
+    pass
+
+#- import PyQt4.uic from its archive if it has been built, see bundle.py
+Uic_archive = os.path.join(Qt_path, 'PyQt4_uic.zip')
+os.path.isfile(Uic_archive) and (Uic_archive in sys.path or sys.path.append(Uic_archive))
+
 #- add pyqt path to system path
 Qt_path in sys.path or sys.path.append(Qt_path)
@@ -43,65 +43,124 @@ import sys
 from PyQt4.uic.properties import Properties
 from PyQt4.uic.uiparser import UIParser
 from PyQt4.uic.Compiler import qtproxies
+from PyQt4.uic.Compiler.context import CompilerContext, pushContext, \
+        popContext
 from PyQt4.uic.Compiler.indenter import createCodeIndenter, getIndenter, \
         write_code
 from PyQt4.uic.Compiler.qobjectcreator import CompilerCreatorPolicy
-from PyQt4.uic.Compiler.misc import write_import
+from PyQt4.uic.Compiler.misc import Literal, import_statement, write_import
+
+if sys.hexversion >= 0x03000000:
+    from PyQt4.uic.port_v3.as_string import as_string
+else:
+    from PyQt4.uic.port_v2.as_string import as_string
+
+
+def writePrologue(indenter, runtime=False):
+    """ Write the imports and helpers that the code of a form uses.  If
+    runtime is set then the helpers are imported from PyQt4.uic.runtime.
+    """
+
+    indenter.write("from PyQt4 import QtCore, QtGui")
+
+    if runtime:
+        indenter.write("from PyQt4.uic import runtime as _uic")
+        indenter.write("")
+        indenter.write("_fromUtf8 = _uic.fromUtf8")
+        indenter.write("_translate = _uic.translate")
+        indenter.write("")
+        return
+
+    indenter.write("")
+
+    indenter.write("try:")
+    indenter.indent()
+    indenter.write("_fromUtf8 = QtCore.QString.fromUtf8")
+    indenter.dedent()
+    indenter.write("except AttributeError:")
+    indenter.indent()
+    indenter.write("def _fromUtf8(s):")
+    indenter.indent()
+    indenter.write("return s")
+    indenter.dedent()
+    indenter.dedent()
+    indenter.write("")
+
+    indenter.write("try:")
+    indenter.indent()
+    indenter.write("_encoding = QtGui.QApplication.UnicodeUTF8")
+    indenter.write("def _translate(context, text, disambig):")
+    indenter.indent()
+    indenter.write("return QtGui.QApplication.translate(context, text, disambig, _encoding)")
+    indenter.dedent()
+    indenter.dedent()
+    indenter.write("except AttributeError:")
+    indenter.indent()
+    indenter.write("def _translate(context, text, disambig):")
+    indenter.indent()
+    indenter.write("return QtGui.QApplication.translate(context, text, disambig)")
+    indenter.dedent()
+    indenter.dedent()
+    indenter.write("")
+
+
+class _RuntimeProperties(Properties):
+    """ The properties of a form whose code uses the runtime helpers. """
+
+    def _font(self, prop):
+        # Fonts are created, and shared, by the runtime.
+        settings = []
+
+        for attr, converter in self._font_attributes:
+            v = prop.findtext("./%s" % (attr.lower(),))
+            if v is None:
+                continue
+
+            if converter is None:
+                v = str(getattr(self.QtGui.QFont, v))
+            else:
+                v = as_string(converter(v), encode=False)
+
+            settings.append('("%s", %s)' % (attr, v))
+
+        return Literal("_uic.font(%s)" % ", ".join(settings))
 
 
 class UICompiler(UIParser):
-    def __init__(self):
+    def __init__(self, compiler_context=None):
+        if compiler_context is None:
+            compiler_context = CompilerContext()
+
+        self._compiler_context = compiler_context
+
         UIParser.__init__(self, qtproxies.QtCore, qtproxies.QtGui,
-                CompilerCreatorPolicy())
+                CompilerCreatorPolicy(compiler_context.runtime))
+
+        if compiler_context.runtime:
+            self.wprops = _RuntimeProperties(self.factory, qtproxies.QtCore,
+                    qtproxies.QtGui)
 
     def reset(self):
-        qtproxies.i18n_strings = []
+        self._compiler_context.i18n_strings = []
         UIParser.reset(self)
 
     def setContext(self, context):
-        qtproxies.i18n_context = context
+        self._compiler_context.i18n_context = context
 
     def createToplevelWidget(self, classname, widgetname):
         indenter = getIndenter()
         indenter.level = 0
 
-        indenter.write("from PyQt4 import QtCore, QtGui")
-        indenter.write("")
-
-        indenter.write("try:")
-        indenter.indent()
-        indenter.write("_fromUtf8 = QtCore.QString.fromUtf8")
-        indenter.dedent()
-        indenter.write("except AttributeError:")
-        indenter.indent()
-        indenter.write("def _fromUtf8(s):")
-        indenter.indent()
-        indenter.write("return s")
-        indenter.dedent()
-        indenter.dedent()
-        indenter.write("")
-
-        indenter.write("try:")
-        indenter.indent()
-        indenter.write("_encoding = QtGui.QApplication.UnicodeUTF8")
-        indenter.write("def _translate(context, text, disambig):")
-        indenter.indent()
-        indenter.write("return QtGui.QApplication.translate(context, text, disambig, _encoding)")
-        indenter.dedent()
-        indenter.dedent()
-        indenter.write("except AttributeError:")
-        indenter.indent()
-        indenter.write("def _translate(context, text, disambig):")
-        indenter.indent()
-        indenter.write("return QtGui.QApplication.translate(context, text, disambig)")
-        indenter.dedent()
-        indenter.dedent()
-        indenter.write("")
+        if self._compiler_context.prologue:
+            writePrologue(indenter, self._compiler_context.runtime)
 
         indenter.write("class Ui_%s(object):" % self.uiname)
         indenter.indent()
         indenter.write("def setupUi(self, %s):" % widgetname)
         indenter.indent()
+
+        # This is where any deferred imports of resource modules go.
+        self._setupUiStart = indenter.mark()
         w = self.factory.createQObject(classname, widgetname, (),
                                    is_attribute = False,
                                    no_instantiation = True)
@@ -109,11 +168,49 @@ class UICompiler(UIParser):
         w.uiclass = "Ui_%s" % self.uiname
         return w
 
+    def traverseWidgetTree(self, elem):
+        # When using the runtime helpers the items of a combo box are added,
+        # and their text set, with single calls.
+        w = self.stack.topwidget
+
+        if self._compiler_context.runtime and isinstance(w, qtproxies.QtGui.QComboBox) and not self.stack.topIsLayout():
+            items = elem.findall("item")
+
+            # Note that the parser's getProperty() doesn't convert the value.
+            if items and not [i for i in items if self.getProperty(i, "icon") is not None]:
+                write_code("_uic.addItems(%s, %d)" % (w, len(items)))
+
+                texts = []
+                for item in items:
+                    text = self.wprops.getProperty(item, "text")
+                    texts.append(as_string("" if text is None else text))
+
+                qtproxies.i18n_print("_uic.setItemTexts(%s, (%s, ))" % (w,
+                        ", ".join(texts)))
+
+                for child in iter(elem):
+                    if child.tag != "item":
+                        UIParser.traverseWidgetTree(self, [child])
+
+                return
+
+        UIParser.traverseWidgetTree(self, elem)
+
     def setDelayedProps(self):
         write_code("")
         write_code("self.retranslateUi(%s)" % self.toplevelWidget)
         UIParser.setDelayedProps(self)
 
+    def beginBatch(self):
+        # Whether updates are enabled is only known when the code is run.
+        write_code("_updatesEnabled = %s.updatesEnabled()" % self.toplevelWidget)
+        self.updates_enabled = Literal("_updatesEnabled")
+        self.toplevelWidget.setUpdatesEnabled(False)
+
+    def endBatch(self):
+        write_code("")
+        UIParser.endBatch(self)
+
     def finalize(self):
         indenter = getIndenter()
         indenter.level = 1
@@ -121,8 +218,9 @@ class UICompiler(UIParser):
         indenter.write("def retranslateUi(self, %s):" % self.toplevelWidget)
         indenter.indent()
 
-        if qtproxies.i18n_strings:
-            for s in qtproxies.i18n_strings:
+        i18n_strings = self._compiler_context.i18n_strings
+        if i18n_strings:
+            for s in i18n_strings:
                 indenter.write(s)
         else:
             indenter.write("pass")
@@ -135,16 +233,36 @@ class UICompiler(UIParser):
         self._resources = self.resources
 
     def compileUi(self, input_stream, output_stream, from_imports, resource_suffix):
-        createCodeIndenter(output_stream)
-        w = self.parse(input_stream, resource_suffix)
+        # All the compiler's state is held in the context which is made active
+        # for the current thread for the duration of the compilation.
+        pushContext(self._compiler_context)
 
-        indenter = getIndenter()
-        indenter.write("")
+        try:
+            createCodeIndenter(output_stream)
+            w = self.parse(input_stream, resource_suffix)
+
+            indenter = getIndenter()
+            indenter.write("")
+
+            self.factory._cpolicy._writeOutImports()
 
-        self.factory._cpolicy._writeOutImports()
+            if self._compiler_context.defer_resources:
+                # The resource modules are imported when the form is first set
+                # up.  Subsequent imports just find them in sys.modules.
+                if self._resources:
+                    level = indenter.level
+                    indenter.level = 2
+                    indenter.insert(self._setupUiStart,
+                            [import_statement(res, from_imports)
+                                    for res in self._resources] + [""])
+                    indenter.level = level
+            else:
+                for res in self._resources:
+                    write_import(res, from_imports)
 
-        for res in self._resources:
-            write_import(res, from_imports)
+            indenter.flush()
+        finally:
+            popContext()
 
         return {"widgetname": str(w),
                 "uiclass" : w.uiclass,
@@ -0,0 +1,86 @@
+#############################################################################
+##
+## Copyright (c) 2014 Riverbank Computing Limited <info@riverbankcomputing.com>
+##
+## This file is part of PyQt.
+##
+## This file may be used under the terms of the GNU General Public
+## License versions 2.0 or 3.0 as published by the Free Software
+## Foundation and appearing in the files LICENSE.GPL2 and LICENSE.GPL3
+## included in the packaging of this file.  Alternatively you may (at
+## your option) use any later version of the GNU General Public
+## License if such license has been publicly approved by Riverbank
+## Computing Limited (or its successors, if any) and the KDE Free Qt
+## Foundation. In addition, as a special exception, Riverbank gives you
+## certain additional rights. These rights are described in the Riverbank
+## GPL Exception version 1.1, which can be found in the file
+## GPL_EXCEPTION.txt in this package.
+##
+## If you are unsure which license is appropriate for your use, please
+## contact the sales department at sales@riverbankcomputing.com.
+##
+## This file is provided AS IS with NO WARRANTY OF ANY KIND, INCLUDING THE
+## WARRANTY OF DESIGN, MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE.
+##
+#############################################################################
+
+
+import threading
+
+
+class CompilerContext(object):
+    """ Encapsulate the state of a single compilation so that any number of
+    compilations can be run at the same time in different threads.
+    """
+
+    def __init__(self, indentwidth=4, prologue=True, runtime=False, defer_resources=False):
+        """ Initialise the context.  indentwidth is the indentation width using
+        spaces.  If it is 0 then a tab is used.  prologue is set if the
+        imports of QtCore and QtGui and the _fromUtf8() and _translate()
+        helpers are generated.  It is cleared when they are provided by a
+        bundle of forms.  runtime is set if the generated code uses the
+        helpers in PyQt4.uic.runtime rather than defining its own.
+        defer_resources is set if the resource modules are imported when
+        setupUi() is called rather than when the generated module is imported.
+        """
+
+        self.indentwidth = indentwidth
+        self.prologue = prologue
+        self.runtime = runtime
+        self.defer_resources = defer_resources
+
+        # The code writer.
+        self.indenter = None
+
+        # The statements of the generated retranslateUi() method and the
+        # translation context they use.
+        self.i18n_strings = []
+        self.i18n_context = ""
+
+
+# Each thread has its own stack of active contexts.  It is a stack so that a
+# compilation may itself compile another .ui file.
+_active = threading.local()
+
+
+def pushContext(context):
+    """ Make a context the active one for the current thread. """
+
+    try:
+        stack = _active.stack
+    except AttributeError:
+        stack = _active.stack = []
+
+    stack.append(context)
+
+
+def popContext():
+    """ Restore the context that was active before the current one. """
+
+    _active.stack.pop()
+
+
+def getContext():
+    """ Return the active context for the current thread. """
+
+    return _active.stack[-1]
@@ -38,15 +38,24 @@
 #############################################################################
 
 
-indentwidth = 4
+from PyQt4.uic.Compiler.context import getContext
 
-_indenter = None
 
 class _IndentedCodeWriter(object):
-    def __init__(self, output):
+    def __init__(self, output, indentwidth=4):
         self.level = 0
         self.output = output
 
+        # The generated lines are buffered and written in one go by flush().
+        self._lines = []
+
+        if indentwidth > 0:
+            self._indent = " " * indentwidth
+        else:
+            self._indent = "\t"
+
+        self._indents = {}
+
     def indent(self):
         self.level += 1
 
@@ -54,24 +63,51 @@ class _IndentedCodeWriter(object):
         self.level -= 1
 
     def write(self, line):
-        if line.strip():
-            if indentwidth > 0:
-                indent = " " * indentwidth
-                line = line.replace("\t", indent)
-            else:
-                indent = "\t"
-
-            self.output.write("%s%s\n" % (indent * self.level, line))
+        if line and not line.isspace():
+            if "\t" in line:
+                line = line.replace("\t", self._indent)
+
+            level = self.level
+            indent = self._indents.get(level)
+            if indent is None:
+                indent = self._indents[level] = self._indent * level
+
+            self._lines.append(indent + line + "\n")
         else:
-            self.output.write("\n")
+            self._lines.append("\n")
+
+    def mark(self):
+        """ Return the position of the next line so that lines can be inserted
+        there later.
+        """
+
+        return len(self._lines)
+
+    def insert(self, position, lines):
+        """ Insert a number of lines, indented at the current level, at a
+        position returned by mark().
+        """
+
+        tail = self._lines[position:]
+        del self._lines[position:]
+
+        for line in lines:
+            self.write(line)
+
+        self._lines.extend(tail)
+
+    def flush(self):
+        if self._lines:
+            self.output.write("".join(self._lines))
+            self._lines = []
 
 
 def createCodeIndenter(output):
-    global _indenter
-    _indenter = _IndentedCodeWriter(output)
+    context = getContext()
+    context.indenter = _IndentedCodeWriter(output, context.indentwidth)
 
 def getIndenter():
-    return _indenter
+    return getContext().indenter
 
 def write_code(string):
-    _indenter.write(string)
+    getContext().indenter.write(string)
@@ -41,11 +41,15 @@
 from PyQt4.uic.Compiler.indenter import write_code
 
 
-def write_import(module_name, from_imports):
+def import_statement(module_name, from_imports):
     if from_imports:
-        write_code("from . import %s" % module_name)
-    else:
-        write_code("import %s" % module_name)
+        return "from . import %s" % module_name
+
+    return "import %s" % module_name
+
+
+def write_import(module_name, from_imports):
+    write_code(import_statement(module_name, from_imports))
 
 
 def moduleMember(module, name):
@@ -41,6 +41,11 @@
 from PyQt4.uic.Compiler.misc import Literal, moduleMember
 
 
+# The literal proxy classes that have been created on the fly keyed by the
+# scope in which they were looked up and their name.
+_literal_proxies = {}
+
+
 class ProxyMetaclass(type):
     """ ProxyMetaclass is the meta-class for proxies. """
 
@@ -74,24 +79,29 @@ class ProxyMetaclass(type):
         if not hasattr(proxy, 'module'):
             proxy.module = ''
 
-    def __getattribute__(cls, name):
-        try:
-            return type.__getattribute__(cls, name)
-        except AttributeError:
-            # Make sure __init__()'s use of hasattr() works.
-            if name == 'module':
-                raise
+    def __getattr__(cls, name):
+        # Make sure __init__()'s use of hasattr() works.
+        if name == 'module':
+            raise AttributeError(name)
 
+        # Anything else is assumed to be a literal value (typically an enum
+        # member) scoped by this proxy.  These are created on the fly but only
+        # once for each scope.
+        scope = moduleMember(cls.module, cls.__name__)
+        key = (scope, name)
+
+        proxy = _literal_proxies.get(key)
+        if proxy is None:
             # Avoid a circular import.
             from PyQt4.uic.Compiler.qtproxies import LiteralProxyClass
 
-            return type(name, (LiteralProxyClass, ),
-                        {"module": moduleMember(type.__getattribute__(cls, "module"),
-                                                type.__getattribute__(cls, "__name__"))})
+            proxy = type(name, (LiteralProxyClass, ), {"module": scope})
+            _literal_proxies[key] = proxy
+
+        return proxy
 
     def __str__(cls):
-        return moduleMember(type.__getattribute__(cls, "module"),
-                            type.__getattribute__(cls, "__name__"))
+        return moduleMember(cls.module, cls.__name__)
 
     def __or__(self, r_op):
         return Literal("%s|%s" % (self, r_op))
@@ -46,19 +46,21 @@ except NameError:
     from sets import Set as set
 
 from PyQt4.uic.Compiler.indenter import write_code
-from PyQt4.uic.Compiler.qtproxies import QtGui, Literal, strict_getattr
+from PyQt4.uic.Compiler.qtproxies import QtCore, QtGui, Literal, find_proxy
 
 
 logger = logging.getLogger(__name__)
 DEBUG = logger.debug
 
 
+# The proxy types created for widgets from plugin modules.  They depend only on
+# their names and so are shared by every compilation.
+_proxy_types = {}
+
+
 class _QtGuiWrapper(object):
     def search(clsname):
-        try:
-            return strict_getattr(QtGui, clsname)
-        except AttributeError:
-            return None
+        return find_proxy(QtGui, clsname)
 
     search = staticmethod(search)
 
@@ -79,7 +81,14 @@ class _ModuleWrapper(object):
     def search(self, cls):
         if cls in self._classes:
             self._used = True
-            return type(cls, (QtGui.QWidget,), {"module": self._module})
+
+            key = (self._module, cls)
+            proxy = _proxy_types.get(key)
+            if proxy is None:
+                proxy = type(cls, (QtGui.QWidget,), {"module": self._module})
+                _proxy_types[key] = proxy
+
+            return proxy
         else:
             return None
 
@@ -95,6 +104,7 @@ class _CustomWidgetLoader(object):
     def __init__(self):
         self._widgets = {}
         self._usedWidgets = set()
+        self._proxies = {}
 
     def addCustomWidget(self, widgetClass, baseClass, module):
         assert widgetClass not in self._widgets
@@ -103,8 +113,9 @@ class _CustomWidgetLoader(object):
     def _resolveBaseclass(self, baseClass):
         try:
             for x in range(0, 10):
-                try: return strict_getattr(QtGui, baseClass)
-                except AttributeError: pass
+                cls = find_proxy(QtGui, baseClass)
+                if cls is not None:
+                    return cls
 
                 baseClass = self._widgets[baseClass][0]
             else:
@@ -114,15 +125,22 @@ class _CustomWidgetLoader(object):
             raise ValueError("unknown baseclass %s" % baseClass)
 
     def search(self, cls):
-        try:
-            baseClass = self._resolveBaseclass(self._widgets[cls][0])
+        proxy = self._proxies.get(cls)
+
+        if proxy is None:
+            widget = self._widgets.get(cls)
+            if widget is None:
+                return None
+
+            baseClass = self._resolveBaseclass(widget[0])
             DEBUG("resolved baseclass of %s: %s" % (cls, baseClass))
-        except KeyError:
-            return None
+
+            proxy = type(cls, (baseClass, ), {"module" : ""})
+            self._proxies[cls] = proxy
 
         self._usedWidgets.add(cls)
 
-        return type(cls, (baseClass, ), {"module" : ""})
+        return proxy
 
     def _writeImportCode(self):
         imports = {}
@@ -135,8 +153,9 @@ class _CustomWidgetLoader(object):
 
 
 class CompilerCreatorPolicy(object):
-    def __init__(self):
+    def __init__(self, runtime=False):
         self._modules = []
+        self._runtime = runtime
 
     def createQtGuiWrapper(self):
         return _QtGuiWrapper
@@ -158,8 +177,21 @@ class CompilerCreatorPolicy(object):
         return method(rname, *args)
 
     def getSlot(self, object, slotname):
+        # Rename slots that correspond to Python keyword arguments.
+        if slotname == 'raise':
+            slotname += '_'
+
         return Literal("%s.%s" % (object, slotname))
 
+    def connectSlotsByName(self, object):
+        # The form class doesn't know what slots the widget it is applied to
+        # has.  The runtime helper connects those of the form's own objects
+        # directly, otherwise Qt searches for them.
+        if self._runtime:
+            write_code("_uic.connectSlotsByName(%s, self)" % object)
+        else:
+            QtCore.QMetaObject.connectSlotsByName(object)
+
     def _writeOutImports(self):
         for module in self._modules:
             module._writeImportCode()
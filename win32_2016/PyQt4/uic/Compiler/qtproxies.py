@@ -41,6 +41,7 @@
 import sys
 import re
 
+from PyQt4.uic.Compiler.context import getContext
 from PyQt4.uic.Compiler.indenter import write_code
 from PyQt4.uic.Compiler.misc import Literal, moduleMember
 
@@ -52,11 +53,8 @@ else:
     from PyQt4.uic.port_v2.as_string import as_string
 
 
-i18n_strings = []
-i18n_context = ""
-
 def i18n_print(string):
-    i18n_strings.append(string)
+    getContext().i18n_strings.append(string)
 
 def i18n_void_func(name):
     def _printer(self, *args):
@@ -70,10 +68,21 @@ def i18n_func(name):
 
     return _printer
 
-def strict_getattr(module, clsname):
+def find_proxy(module, clsname):
+    """ Return the proxy class with the given name or None if the name is not
+    that of a real proxy.
+    """
+
     cls = getattr(module, clsname)
     if issubclass(cls, LiteralProxyClass):
-        raise AttributeError(cls)
+        return None
+
+    return cls
+
+def strict_getattr(module, clsname):
+    cls = find_proxy(module, clsname)
+    if cls is None:
+        raise AttributeError(clsname)
     else:
         return cls
 
@@ -82,6 +91,7 @@ class i18n_string(object):
     def __init__(self, string, disambig):
         self.string = string
         self.disambig = disambig
+        self.context = getContext().i18n_context
 
     def __str__(self):
         if self.disambig is None:
@@ -89,7 +99,7 @@ class i18n_string(object):
         else:
             disambig = as_string(self.disambig, encode=False)
 
-        return '_translate("%s", %s, %s)' % (i18n_context, as_string(self.string, encode=False), disambig)
+        return '_translate("%s", %s, %s)' % (self.context, as_string(self.string, encode=False), disambig)
 
 
 # Classes with this flag will be handled as literal values. If functions are
@@ -135,6 +145,38 @@ class ProxyClassMember(object):
                 write_code(func_call)
 
 
+    def __getitem__(self, idx):
+        return ProxySignalWithArguments(self.proxy, self.function_name, idx)
+
+    def connect(self, slot):
+        # The member is a signal with no arguments or that uses the default
+        # overload.
+        write_code("%s.connect(%s)" % (self, slot))
+
+
+class ProxySignalWithArguments(object):
+    """ This is a proxy for (what should be) a signal that passes arguments.
+    """
+
+    def __init__(self, sender, signal_name, signal_index):
+        self._sender = sender
+        self._signal_name = signal_name
+
+        # Convert the signal index, which will be a single argument or a tuple
+        # of arguments, to quoted strings.  An empty tuple selects the overload
+        # without arguments.
+        if signal_index == ():
+            self._signal_index = "()"
+        elif isinstance(signal_index, tuple):
+            self._signal_index = ", ".join(["'%s'" % a for a in signal_index])
+        else:
+            self._signal_index = "'%s'" % signal_index
+
+    def connect(self, slot):
+        write_code("%s.%s[%s].connect(%s)" % (self._sender, self._signal_name,
+                self._signal_index, slot))
+
+
 class ProxyClass(ProxyBase):
     flags = 0
 
@@ -160,11 +202,9 @@ class ProxyClass(ProxyBase):
     def __str__(self):
         return self._uic_name
 
-    def __getattribute__(self, attribute):
-        try:
-            return object.__getattribute__(self, attribute)
-        except AttributeError:
-            return ProxyClassMember(self, attribute, self.flags)
+    def __getattr__(self, attribute):
+        # This is only called for attributes that don't really exist.
+        return ProxyClassMember(self, attribute, self.flags)
 
 
 class LiteralProxyClass(ProxyClass):
@@ -0,0 +1,356 @@
+#############################################################################
+##
+## Copyright (c) 2014 Riverbank Computing Limited <info@riverbankcomputing.com>
+##
+## This file is part of PyQt.
+##
+## This file may be used under the terms of the GNU General Public
+## License versions 2.0 or 3.0 as published by the Free Software
+## Foundation and appearing in the files LICENSE.GPL2 and LICENSE.GPL3
+## included in the packaging of this file.  Alternatively you may (at
+## your option) use any later version of the GNU General Public
+## License if such license has been publicly approved by Riverbank
+## Computing Limited (or its successors, if any) and the KDE Free Qt
+## Foundation. In addition, as a special exception, Riverbank gives you
+## certain additional rights. These rights are described in the Riverbank
+## GPL Exception version 1.1, which can be found in the file
+## GPL_EXCEPTION.txt in this package.
+##
+## If you are unsure which license is appropriate for your use, please
+## contact the sales department at sales@riverbankcomputing.com.
+##
+## This file is provided AS IS with NO WARRANTY OF ANY KIND, INCLUDING THE
+## WARRANTY OF DESIGN, MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE.
+##
+#############################################################################
+
+
+# A background load reads a .ui file on a worker thread and creates the form on
+# the GUI thread.  The worker parses and optimizes the XML, resolves the enums
+# and sets of the Qt namespace and classes, and reads and decodes the image
+# files used by pixmap and icon properties.  Widgets, pixmaps and icons can
+# only be created on the GUI thread so the rest of the work is done there once
+# the worker has finished.
+
+
+import threading
+
+from PyQt4 import QtCore, QtGui
+from PyQt4.uic.icon_cache import file_name
+from PyQt4.uic.Loader.loader import DynamicUILoader, _LoaderProperties
+from PyQt4.uic.uiparser import UIParser
+
+
+# The futures whose forms are still to be created.  They are referenced here
+# so that the caller doesn't have to keep a reference to get a callback.
+_pending = set()
+
+
+class PreparedForm(object):
+    """ The parts of a form that have been prepared without a GUI. """
+
+    def __init__(self, uifile, document, enums, images):
+        """ Initialise the prepared form. """
+
+        self.uifile = uifile
+        self.document = document
+        self.enums = enums
+        self.images = images
+
+
+def _resolveEnum(text):
+    """ Return the value of the text of an enum or set property, or None if it
+    may refer to a custom widget.
+    """
+
+    value = None
+
+    for cpp_name in text.split('|'):
+        try:
+            prefix, membername = cpp_name.split("::")
+        except ValueError:
+            prefix = "Qt"
+            membername = cpp_name
+
+        if prefix == "Qt":
+            scope = QtCore.Qt
+        else:
+            scope = getattr(QtGui, prefix, None)
+            if scope is None:
+                return None
+
+        member = getattr(scope, membername, None)
+        if member is None:
+            return None
+
+        if value is None:
+            value = member
+        else:
+            value |= member
+
+    return value
+
+
+def prepareUi(uifile, optimize=()):
+    """ Read a .ui file and return a PreparedForm.  This may be called from
+    any thread.  optimize is as for loadUi().
+    """
+
+    from PyQt4.uic.optimizer import optimizerFor
+
+    filename, base_dir = DynamicUILoader._source(uifile)
+
+    document = UIParser.readUiFile(filename)
+
+    optimizer = optimizerFor(optimize)
+    if optimizer is not None:
+        optimizer.optimize(document.getroot())
+
+    root = document.getroot()
+
+    enums = {}
+
+    for tag in ('enum', 'set'):
+        for elem in root.iter(tag):
+            if elem.text and elem.text not in enums:
+                value = _resolveEnum(elem.text)
+                if value is not None:
+                    enums[elem.text] = value
+
+    # Resources are not available until their modules are imported.
+    file_names = set()
+
+    for elem in root.iter('pixmap'):
+        if elem.text:
+            file_names.add(file_name(elem.text, base_dir))
+
+    for elem in root.iter('iconset'):
+        if elem.get('theme') is not None:
+            continue
+
+        for e in [elem] + list(elem):
+            if e.text and e.text.strip():
+                file_names.add(file_name(e.text, base_dir))
+
+    images = {}
+
+    for fname in file_names:
+        if fname.startswith(':'):
+            continue
+
+        image = QtGui.QImage(fname)
+        if not image.isNull():
+            images[fname] = image
+
+    return PreparedForm(uifile, document, enums, images)
+
+
+class _PreparedProperties(_LoaderProperties):
+    """ The properties of a form that has been prepared. """
+
+    prepared = None
+
+    def _enum(self, prop):
+        value = self.prepared.enums.get(prop.text)
+        if value is None:
+            value = _LoaderProperties._enum(self, prop)
+
+        return value
+
+    def _set(self, prop):
+        value = self.prepared.enums.get(prop.text)
+        if value is None:
+            value = _LoaderProperties._set(self, prop)
+
+        return value
+
+    def _pixmap(self, prop):
+        if prop.text:
+            image = self.prepared.images.get(file_name(prop.text,
+                    self._base_dir))
+
+            if image is not None:
+                return QtGui.QPixmap.fromImage(image)
+
+        return _LoaderProperties._pixmap(self, prop)
+
+
+class _PreparedUILoader(DynamicUILoader):
+    """ A loader that creates a form that has been prepared. """
+
+    def __init__(self, package, prepared):
+        DynamicUILoader.__init__(self, package)
+
+        self.wprops = _PreparedProperties(self.factory, QtCore, QtGui)
+        self.wprops.prepared = prepared
+
+        self._prepared = prepared
+
+    def readDocument(self, filename, resource_suffix, base_dir=''):
+        self.wprops.set_base_dir(base_dir)
+        self.wprops.icon_cache.images = self._prepared.images
+
+        self._resource_suffix = resource_suffix
+
+        return self._prepared.document
+
+
+def createPreparedUi(prepared, baseinstance=None, package='',
+        resource_suffix='_rc'):
+    """ Create the user interface of a PreparedForm and return it.  This must
+    be called from the GUI thread.  The other arguments are as for loadUi().
+    """
+
+    loader = _PreparedUILoader(package, prepared)
+
+    return loader.loadUi(prepared.uifile, baseinstance, resource_suffix)
+
+
+class LoadUiFuture(QtCore.QObject):
+    """ The result of a .ui file being loaded in the background.  The form is
+    created on the GUI thread once the worker thread has prepared it, at
+    which point the callbacks are called and finished is emitted, each with
+    the future.
+    """
+
+    finished = QtCore.pyqtSignal(object)
+
+    # Emitted by the worker thread when it has finished.
+    _prepared = QtCore.pyqtSignal()
+
+    def __init__(self, uifile, baseinstance=None, package='',
+            resource_suffix='_rc', optimize=()):
+        """ Initialise the future and start the worker thread.  The arguments
+        are as for loadUi().
+        """
+
+        QtCore.QObject.__init__(self)
+
+        self._uifile = uifile
+        self._baseinstance = baseinstance
+        self._package = package
+        self._resource_suffix = resource_suffix
+        self._optimize = optimize
+
+        self._form = None
+        self._result = None
+        self._exception = None
+        self._done = False
+        self._creating = False
+        self._callbacks = []
+
+        # Set by the worker thread when it has finished.
+        self._ready = threading.Event()
+
+        _pending.add(self)
+
+        # The worker's signal is queued to the thread of the future so that
+        # the form is only ever created on the GUI thread.
+        self._prepared.connect(self._create, QtCore.Qt.QueuedConnection)
+
+        self._thread = threading.Thread(target=self._prepare,
+                name='PyQt4UicPrepare')
+        self._thread.daemon = True
+        self._thread.start()
+
+    def done(self):
+        """ Return True if the form has been created or couldn't be. """
+
+        return self._done
+
+    def result(self):
+        """ Return the top-level widget of the form, waiting for it to be
+        prepared and creating it if necessary.  The exception is raised if
+        the form couldn't be created.  This must be called from the GUI
+        thread.  RuntimeError is raised if it is called while the form is
+        being created, eg. by a slot run by a nested event loop.
+        """
+
+        self._checkReentrant('result')
+        self._create()
+
+        if self._exception is not None:
+            raise self._exception
+
+        return self._result
+
+    def exception(self):
+        """ Return the exception raised while loading the form, waiting for it
+        to be prepared and creating it if necessary.  None is returned if
+        there was no exception.  This must be called from the GUI thread.
+        RuntimeError is raised as for result().
+        """
+
+        self._checkReentrant('exception')
+        self._create()
+
+        return self._exception
+
+    def add_done_callback(self, fn):
+        """ Add a callable that is passed the future when the form has been
+        created.  It is called immediately if the form has already been
+        created.
+        """
+
+        if self._done:
+            fn(self)
+        else:
+            self._callbacks.append(fn)
+
+    def _checkReentrant(self, name):
+        """ Raise RuntimeError if the form is being created. """
+
+        if self._creating:
+            raise RuntimeError(
+                    "%s() cannot be called while the form is being created" %
+                            name)
+
+    def _prepare(self):
+        """ Prepare the form.  This is called from the worker thread. """
+
+        try:
+            self._form = prepareUi(self._uifile, self._optimize)
+        except Exception as e:
+            self._exception = e
+
+        self._ready.set()
+        self._prepared.emit()
+
+    def _create(self):
+        """ Create the form, if it hasn't already been, once it has been
+        prepared.
+        """
+
+        # Events processed while the form is being created may deliver the
+        # queued signal.
+        if self._done or self._creating:
+            return
+
+        self._ready.wait()
+
+        self._creating = True
+
+        try:
+            if self._exception is None:
+                try:
+                    self._result = createPreparedUi(self._form,
+                            self._baseinstance, self._package,
+                            self._resource_suffix)
+                except Exception as e:
+                    self._exception = e
+        finally:
+            self._creating = False
+
+        self._form = None
+        self._baseinstance = None
+        self._done = True
+
+        _pending.discard(self)
+
+        callbacks = self._callbacks
+        self._callbacks = []
+
+        for fn in callbacks:
+            fn(self)
+
+        self.finished.emit(self)
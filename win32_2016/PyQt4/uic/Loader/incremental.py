@@ -0,0 +1,392 @@
+#############################################################################
+##
+## Copyright (c) 2014 Riverbank Computing Limited <info@riverbankcomputing.com>
+##
+## This file is part of PyQt.
+##
+## This file may be used under the terms of the GNU General Public
+## License versions 2.0 or 3.0 as published by the Free Software
+## Foundation and appearing in the files LICENSE.GPL2 and LICENSE.GPL3
+## included in the packaging of this file.  Alternatively you may (at
+## your option) use any later version of the GNU General Public
+## License if such license has been publicly approved by Riverbank
+## Computing Limited (or its successors, if any) and the KDE Free Qt
+## Foundation. In addition, as a special exception, Riverbank gives you
+## certain additional rights. These rights are described in the Riverbank
+## GPL Exception version 1.1, which can be found in the file
+## GPL_EXCEPTION.txt in this package.
+##
+## If you are unsure which license is appropriate for your use, please
+## contact the sales department at sales@riverbankcomputing.com.
+##
+## This file is provided AS IS with NO WARRANTY OF ANY KIND, INCLUDING THE
+## WARRANTY OF DESIGN, MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE.
+##
+#############################################################################
+
+
+# An incremental load creates a form in a number of steps driven by the event
+# loop so that the application stays responsive while a large form is created.
+# The first step creates the top-level widget and its immediate children.  The
+# contents of the other widgets are then created a level at a time, with the
+# pages of tab widgets, stacked widgets, tool boxes and wizards that are not
+# initially shown last, in steps that each take about the time allowed.  The
+# connections, tab order and any properties that refer to other widgets are set
+# once every widget exists.
+
+
+import timeit
+
+from PyQt4 import QtCore, QtGui
+from PyQt4.uic.Loader.loader import DynamicUILoader
+
+
+# The tags of the children of a widget that can be created after the widget
+# has been added to its parent.  The contents of widgets with any other child
+# (eg. the items of item views) are created with the widget.
+_DEFERRABLE_TAGS = ('property', 'attribute', 'layout', 'widget', 'zorder',
+        'addaction')
+
+# The containers that only show one of their pages at a time.
+_PAGED_CLASSES = (QtGui.QTabWidget, QtGui.QStackedWidget, QtGui.QToolBox,
+        QtGui.QWizard)
+
+# The containers that show the children that are added to them as Qt layouts
+# do.  The children of other widgets must be shown explicitly if they are
+# created once the widget is visible.
+_MANAGING_CLASSES = _PAGED_CLASSES + (QtGui.QDockWidget, QtGui.QMainWindow,
+        QtGui.QSplitter)
+
+
+class _IncrementalUILoader(DynamicUILoader):
+    """ A loader that defers creating the contents of widgets. """
+
+    def __init__(self, package):
+        DynamicUILoader.__init__(self, package)
+
+        self.created = 0
+        self.total = 0
+
+        self._deferring = False
+        self._visible = []
+        self._hidden = []
+
+        # The number of pages of each paged container created so far.
+        self._pages = {}
+
+        # Set while the contents of a widget that isn't initially shown are
+        # being created.
+        self._creatingHidden = False
+
+        # The widgets created by the current step that are not managed by a
+        # layout.
+        self._unmanaged = []
+
+    def begin(self, filename, toplevelInst, resource_suffix):
+        """ Read a .ui file and create the top-level widget and its immediate
+        children.  The top-level widget is returned.
+        """
+
+        self.toplevelInst = toplevelInst
+
+        filename, basedir = self._source(filename)
+        document = self.readDocument(filename, resource_suffix, basedir)
+
+        self._document = document
+        self._branches = list(self.branchHandlers())
+
+        top = document.find('widget')
+        if top is not None:
+            self.total = len(top.findall('.//widget'))
+
+        self._deferring = True
+
+        # Handle the branches up to and including the widget tree.
+        while self._branches:
+            tagname, actor = self._branches.pop(0)
+
+            elem = document.find(tagname)
+            if elem is not None:
+                actor(elem)
+
+            if tagname == 'widget':
+                break
+
+        # The form isn't visible yet.
+        self._unmanaged = []
+
+        return self.toplevelWidget
+
+    def pending(self):
+        """ Return True if there are widgets whose contents are still to be
+        created.
+        """
+
+        return bool(self._visible or self._hidden)
+
+    def createNext(self):
+        """ Create the contents of the next widget. """
+
+        if self._visible:
+            elem, widget, layout_widget = self._visible.pop(0)
+            self._creatingHidden = False
+        else:
+            elem, widget, layout_widget = self._hidden.pop(0)
+            self._creatingHidden = True
+
+        self.stack.push(widget)
+        self.layout_widget = layout_widget
+        self.traverseWidgetTree(elem)
+        self.layout_widget = False
+        self.stack.popWidget()
+
+        # Like Qt, a widget that is created once its parent is visible isn't
+        # shown with it unless a layout shows it.
+        for child in self._unmanaged:
+            parent = child.parentWidget()
+
+            if parent is not None and parent.isVisible() and not child.testAttribute(QtCore.Qt.WA_WState_ExplicitShowHide):
+                child.show()
+
+        self._unmanaged = []
+
+    def end(self):
+        """ Complete the form once every widget has been created and return
+        the top-level widget.
+        """
+
+        self._deferring = False
+
+        self.completeUserInterface()
+
+        for tagname, actor in self._branches:
+            elem = self._document.find(tagname)
+            if elem is not None:
+                actor(elem)
+
+        self.finalize()
+        w = self.toplevelWidget
+        self.reset()
+
+        self._document = None
+
+        return w
+
+    def setupObject(self, clsname, parent, branch, is_attribute=True):
+        obj = DynamicUILoader.setupObject(self, clsname, parent, branch,
+                is_attribute)
+
+        if branch.tag == 'widget':
+            self.created += 1
+
+            if not self.stack.topIsLayout() and not isinstance(self.stack.topwidget, _MANAGING_CLASSES):
+                self._unmanaged.append(obj)
+
+        return obj
+
+    def createWidget(self, elem):
+        DynamicUILoader.createWidget(self, elem)
+
+        # The currentIndex property of a paged container is only set once the
+        # form is complete.  The page that it shows is made current as soon
+        # as it has been added rather than leave the first page showing.
+        container = self.stack.topwidget
+
+        if self._deferring and isinstance(container, _PAGED_CLASSES):
+            current = self._currentIndex(container)
+
+            if current != 0 and self._pages.get(container) == current + 1:
+                container.setCurrentIndex(current)
+
+    # The handlers are looked up in the table rather than as methods.
+    widgetTreeItemHandlers = dict(DynamicUILoader.widgetTreeItemHandlers,
+            widget=createWidget)
+
+    def populateWidget(self, elem):
+        if not self._deferring:
+            DynamicUILoader.populateWidget(self, elem)
+            return
+
+        current = self._isCurrentPage()
+
+        if not self._deferrable(elem):
+            DynamicUILoader.populateWidget(self, elem)
+            return
+
+        # Pages that are not shown initially, and their contents, are created
+        # last.
+        if self._creatingHidden or not current:
+            queue = self._hidden
+        else:
+            queue = self._visible
+
+        queue.append((elem, self.stack.topwidget, self.layout_widget))
+
+    def _isCurrentPage(self):
+        """ Return False if the widget at the top of the stack is a page of a
+        paged container that isn't initially shown.  The pages are counted so
+        this must be called once for each of them.
+        """
+
+        container = None
+        for item in reversed(self.stack[:-1]):
+            if isinstance(item, QtGui.QWidget):
+                container = item
+                break
+
+        if not isinstance(container, _PAGED_CLASSES):
+            return True
+
+        index = self._pages.get(container, 0)
+        self._pages[container] = index + 1
+
+        return index == self._currentIndex(container)
+
+    def _currentIndex(self, container):
+        """ Return the index of the page of a paged container that is
+        initially shown.
+        """
+
+        # A wizard starts with its first page and the others start with the
+        # one given by their currentIndex property.
+        current = 0
+
+        if not isinstance(container, QtGui.QWizard):
+            for widget, layout, setter, args in self.wprops.delayed_props:
+                if widget is container and not layout and setter == 'setCurrentIndex':
+                    current = args
+
+        return current
+
+    def completeUserInterface(self):
+        # This is done once every widget has been created.
+        if not self._deferring:
+            DynamicUILoader.completeUserInterface(self)
+
+    @staticmethod
+    def _deferrable(elem):
+        """ Return True if the contents of a widget element can be created
+        later.
+        """
+
+        contents = False
+
+        for child in elem:
+            if child.tag not in _DEFERRABLE_TAGS:
+                return False
+
+            if child.tag in ('layout', 'widget'):
+                contents = True
+
+        return contents
+
+
+class IncrementalLoader(QtCore.QObject):
+    """ Create a form from a .ui file in a number of steps driven by the event
+    loop.  progress is emitted after each step with the number of widgets
+    created so far and the total number.  finished is emitted with the
+    top-level widget once the form is complete.  failed is emitted with the
+    exception if the form couldn't be created.
+    """
+
+    progress = QtCore.pyqtSignal(int, int)
+    finished = QtCore.pyqtSignal(object)
+    failed = QtCore.pyqtSignal(object)
+
+    def __init__(self, uifile, budget_ms=20, baseinstance=None, package='',
+            resource_suffix='_rc', optimize=()):
+        """ Initialise the loader and create the top-level widget and its
+        immediate children.  The remaining steps are started when the event
+        loop next runs.  budget_ms is the number of milliseconds that each
+        step should take.  The other arguments are as for loadUi().
+        """
+
+        QtCore.QObject.__init__(self)
+
+        from PyQt4.uic.optimizer import optimizerFor
+
+        self._budget = budget_ms / 1000.0
+        self._loader = _IncrementalUILoader(package)
+        self._loader.optimizer = optimizerFor(optimize)
+        self._widget = self._loader.begin(uifile, baseinstance,
+                resource_suffix)
+        self._finished = False
+
+        # The loader lives until the form is complete so that the caller
+        # doesn't have to keep a reference to it.  It is then deleted.
+        self.setParent(self._widget)
+
+        self._timer = QtCore.QTimer(self)
+        self._timer.setInterval(0)
+        self._timer.timeout.connect(self.step)
+        self._timer.start()
+
+    def widget(self):
+        """ Return the top-level widget of the form.  It is complete only
+        once finished has been emitted.
+        """
+
+        return self._widget
+
+    def isFinished(self):
+        """ Return True if the form is complete or couldn't be created. """
+
+        return self._finished
+
+    def step(self):
+        """ Create the contents of widgets until the time allowed for a step
+        has been used.  This is called by the event loop but may also be
+        called directly.
+        """
+
+        if self._finished:
+            return
+
+        loader = self._loader
+        start = timeit.default_timer()
+
+        try:
+            while loader.pending():
+                loader.createNext()
+
+                if timeit.default_timer() - start >= self._budget:
+                    break
+
+            complete = not loader.pending()
+            if complete:
+                loader.end()
+        except Exception as e:
+            self._stop()
+            loader.reset()
+            self.failed.emit(e)
+            return
+
+        self.progress.emit(loader.created, loader.total)
+
+        if complete:
+            self._stop()
+            self.finished.emit(self._widget)
+
+    def finish(self):
+        """ Create the rest of the form immediately and return the top-level
+        widget.
+        """
+
+        budget = self._budget
+        self._budget = float('inf')
+
+        try:
+            self.step()
+        finally:
+            self._budget = budget
+
+        return self._widget
+
+    def _stop(self):
+        """ Stop the steps and schedule the deletion of the loader and its
+        timer.  The loader's own methods may still be called.
+        """
+
+        self._finished = True
+        self._timer.stop()
+        self.deleteLater()
@@ -41,14 +41,51 @@
 import os.path
 
 from PyQt4 import QtGui, QtCore
+from PyQt4.uic.properties import Properties, needsWidget
 from PyQt4.uic.uiparser import UIParser
 from PyQt4.uic.Loader.qobjectcreator import LoaderCreatorPolicy
+from PyQt4.uic.Loader.translations import translationCache
+from PyQt4.uic.Loader.valuepool import valuePool
+
+
+class _LoaderProperties(Properties):
+    """ The properties of a form being loaded. """
+
+    def _translate(self, text, disambig):
+        return translationCache().translate(self.uiname, text, disambig)
+
+    # Value types are shared across all loaded forms.
+    def _color(self, prop):
+        return valuePool().value('color', prop,
+                lambda: Properties._color(self, prop))
+
+    def _font(self, prop):
+        return valuePool().value('font', prop,
+                lambda: Properties._font(self, prop))
+
+    def _gradient(self, prop):
+        return valuePool().value('gradient', prop,
+                lambda: Properties._gradient(self, prop))
+
+    def _brush(self, prop):
+        return valuePool().value('brush', prop,
+                lambda: Properties._brush(self, prop))
+
+    #@needsWidget
+    def _sizepolicy(self, prop, widget):
+        # The widget's own height-for-width is copied to the size policy.
+        return valuePool().value('sizepolicy', prop,
+                lambda: Properties._sizepolicy(self, prop, widget),
+                widget.sizePolicy().hasHeightForWidth())
+    _sizepolicy = needsWidget(_sizepolicy)
 
 
 class DynamicUILoader(UIParser):
     def __init__(self, package):
         UIParser.__init__(self, QtCore, QtGui, LoaderCreatorPolicy(package))
 
+        self.wprops = _LoaderProperties(self.factory, QtCore, QtGui)
+
     def createToplevelWidget(self, classname, widgetname):
         if self.toplevelInst is not None:
             if not isinstance(self.toplevelInst, self.factory.findQObjectType(classname)):
@@ -61,11 +98,20 @@ class DynamicUILoader(UIParser):
     def loadUi(self, filename, toplevelInst, resource_suffix):
         self.toplevelInst = toplevelInst
 
-        if hasattr(filename, 'read'):
-            basedir = ''
-        else:
-            # Allow the filename to be a QString.
-            filename = str(filename)
-            basedir = os.path.dirname(filename)
+        filename, basedir = self._source(filename)
 
         return self.parse(filename, resource_suffix, basedir)
+
+    @staticmethod
+    def _source(filename):
+        """ Return a tuple of the file name or file object to read and the
+        directory that relative file names are relative to.
+        """
+
+        if hasattr(filename, 'read'):
+            return filename, ''
+
+        # Allow the filename to be a QString.
+        filename = str(filename)
+
+        return filename, os.path.dirname(filename)
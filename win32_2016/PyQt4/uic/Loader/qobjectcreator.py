@@ -42,6 +42,8 @@ import sys
 
 from PyQt4 import QtGui
 
+from PyQt4.uic import runtime
+
 
 class _QtGuiWrapper(object):
     def search(cls):
@@ -139,3 +141,7 @@ class LoaderCreatorPolicy(object):
             slotname += '_'
 
         return getattr(object, slotname)
+
+    def connectSlotsByName(self, object):
+        # The form's objects are also attributes of the form.
+        runtime.connectSlotsByName(object, object)
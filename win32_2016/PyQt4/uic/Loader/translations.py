@@ -0,0 +1,135 @@
+#############################################################################
+##
+## Copyright (c) 2014 Riverbank Computing Limited <info@riverbankcomputing.com>
+##
+## This file is part of PyQt.
+##
+## This file may be used under the terms of the GNU General Public
+## License versions 2.0 or 3.0 as published by the Free Software
+## Foundation and appearing in the files LICENSE.GPL2 and LICENSE.GPL3
+## included in the packaging of this file.  Alternatively you may (at
+## your option) use any later version of the GNU General Public
+## License if such license has been publicly approved by Riverbank
+## Computing Limited (or its successors, if any) and the KDE Free Qt
+## Foundation. In addition, as a special exception, Riverbank gives you
+## certain additional rights. These rights are described in the Riverbank
+## GPL Exception version 1.1, which can be found in the file
+## GPL_EXCEPTION.txt in this package.
+##
+## If you are unsure which license is appropriate for your use, please
+## contact the sales department at sales@riverbankcomputing.com.
+##
+## This file is provided AS IS with NO WARRANTY OF ANY KIND, INCLUDING THE
+## WARRANTY OF DESIGN, MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE.
+##
+#############################################################################
+
+
+# The translations of the strings of the forms created by loadUi() are cached
+# for the life of the process so that a string shared by many forms (or a form
+# that is loaded many times) costs one call to QApplication.translate().  The
+# cache is discarded whenever a translator is installed or removed.
+
+
+import os
+
+from PyQt4 import QtCore, QtGui
+
+
+class _LanguageChangeWatcher(QtGui.QWidget):
+    """ A hidden top-level widget that is told by the application when a
+    translator is installed or removed.  A widget is used rather than an event
+    filter on the application because the latter would see every event.
+    """
+
+    def __init__(self, cache):
+        QtGui.QWidget.__init__(self)
+
+        self._cache = cache
+
+    def changeEvent(self, event):
+        # Note that the application posts the event so translations made
+        # before the event loop next runs may be stale until then.
+        if event.type() == QtCore.QEvent.LanguageChange:
+            self._cache.invalidate()
+
+        QtGui.QWidget.changeEvent(self, event)
+
+
+class TranslationCache(object):
+    """ A cache of translations keyed by the context, text and disambiguation
+    of each string.
+    """
+
+    def __init__(self):
+        """ Initialise the cache.  If PYQT4_UIC_NO_TRANSLATORS is set then the
+        application is assumed not to have any translators installed and
+        strings are passed straight through until one is.
+        """
+
+        self._translations = {}
+        self._passThrough = os.environ.get('PYQT4_UIC_NO_TRANSLATORS',
+                '0') not in ('', '0')
+        self._watcher = None
+
+        # Decide once how QApplication.translate() is to be called.
+        try:
+            encoding = QtGui.QApplication.UnicodeUTF8
+        except AttributeError:
+            self._qtTranslate = QtGui.QApplication.translate
+        else:
+            def qtTranslate(context, text, disambig):
+                return QtGui.QApplication.translate(context, text, disambig,
+                        encoding)
+
+            self._qtTranslate = qtTranslate
+
+    def translate(self, context, text, disambig):
+        """ Return the translation of a string. """
+
+        # The watcher can't be created until there is an application.
+        if self._watcher is None:
+            self._watcher = _LanguageChangeWatcher(self)
+
+        if self._passThrough:
+            return text
+
+        key = (context, text, disambig)
+
+        try:
+            return self._translations[key]
+        except KeyError:
+            pass
+
+        translated = self._translations[key] = self._qtTranslate(context,
+                text, disambig)
+
+        return translated
+
+    def invalidate(self):
+        """ Discard the cached translations.  Any pass through stops as a
+        translator has been installed or removed.
+        """
+
+        self._translations.clear()
+        self._passThrough = False
+
+    def __len__(self):
+        """ Return the number of cached translations. """
+
+        return len(self._translations)
+
+
+# The process-wide cache.
+_cache = None
+
+
+def translationCache():
+    """ Return the process-wide translation cache. """
+
+    global _cache
+
+    if _cache is None:
+        _cache = TranslationCache()
+
+    return _cache
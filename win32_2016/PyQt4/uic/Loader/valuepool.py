@@ -0,0 +1,108 @@
+#############################################################################
+##
+## Copyright (c) 2014 Riverbank Computing Limited <info@riverbankcomputing.com>
+##
+## This file is part of PyQt.
+##
+## This file may be used under the terms of the GNU General Public
+## License versions 2.0 or 3.0 as published by the Free Software
+## Foundation and appearing in the files LICENSE.GPL2 and LICENSE.GPL3
+## included in the packaging of this file.  Alternatively you may (at
+## your option) use any later version of the GNU General Public
+## License if such license has been publicly approved by Riverbank
+## Computing Limited (or its successors, if any) and the KDE Free Qt
+## Foundation. In addition, as a special exception, Riverbank gives you
+## certain additional rights. These rights are described in the Riverbank
+## GPL Exception version 1.1, which can be found in the file
+## GPL_EXCEPTION.txt in this package.
+##
+## If you are unsure which license is appropriate for your use, please
+## contact the sales department at sales@riverbankcomputing.com.
+##
+## This file is provided AS IS with NO WARRANTY OF ANY KIND, INCLUDING THE
+## WARRANTY OF DESIGN, MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE.
+##
+#############################################################################
+
+
+# Qt's value types (fonts, colours, brushes, gradients and size policies) are
+# implicitly shared and are copied when they are passed to a setter, so the
+# forms created by loadUi() can share a single instance of each distinct
+# value.  The values are keyed by the content of the element that describes
+# them so a value that is used more than once, in one form or in many, is
+# only converted once for the life of the process.
+
+
+# The maximum number of values that are pooled.  The pool is emptied if it is
+# reached, which is only likely if forms are being generated.
+MAX_VALUES = 4096
+
+
+def elementKey(elem):
+    """ Return a hashable key that describes the content of an XML element. """
+
+    children = tuple([elementKey(child) for child in elem])
+    attrib = elem.attrib
+
+    if attrib:
+        attrib = tuple(sorted(attrib.items()))
+    else:
+        attrib = ()
+
+    return (elem.tag, attrib, elem.text, children)
+
+
+class ValuePool(object):
+    """ A pool of shared values keyed by the content of their elements. """
+
+    def __init__(self):
+        """ Initialise the pool. """
+
+        self._values = {}
+        self.hits = 0
+
+    def value(self, kind, elem, create, *extra):
+        """ Return the value of a kind described by an element, calling create
+        with no arguments if it isn't in the pool.  Any extra arguments are
+        also part of the key.
+        """
+
+        key = (kind, elementKey(elem)) + extra
+
+        try:
+            value = self._values[key]
+        except KeyError:
+            if len(self._values) >= MAX_VALUES:
+                self._values.clear()
+
+            value = self._values[key] = create()
+        else:
+            self.hits += 1
+
+        return value
+
+    def clear(self):
+        """ Empty the pool. """
+
+        self._values.clear()
+        self.hits = 0
+
+    def __len__(self):
+        """ Return the number of pooled values. """
+
+        return len(self._values)
+
+
+# The process-wide pool.
+_pool = None
+
+
+def valuePool():
+    """ Return the process-wide value pool. """
+
+    global _pool
+
+    if _pool is None:
+        _pool = ValuePool()
+
+    return _pool
@@ -38,9 +38,13 @@
 #############################################################################
 
 
-__all__ = ("compileUi", "compileUiDir", "loadUiType", "loadUi", "widgetPluginPath")
+__all__ = ("compileUi", "compileUiDir", "loadUiType", "loadUi",
+        "loadUiAsync", "loadUiIncremental", "widgetPluginPath")
 
-from PyQt4.uic.Compiler import indenter, compiler
+
+# Note that the compiler and the loader are only imported when first used so
+# that importing this package is cheap for applications that only need one of
+# them.
 
 
 _header = """# -*- coding: utf-8 -*-
@@ -76,8 +80,8 @@ if __name__ == "__main__":
 """
 
 
-def compileUiDir(dir, recurse=False, map=None, **compileUi_args):
-    """compileUiDir(dir, recurse=False, map=None, **compileUi_args)
+def compileUiDir(dir, recurse=False, map=None, bundle=None, **compileUi_args):
+    """compileUiDir(dir, recurse=False, map=None, bundle=None, **compileUi_args)
 
     Creates Python modules from Qt Designer .ui files in a directory or
     directory tree.
@@ -92,54 +96,91 @@ def compileUiDir(dir, recurse=False, map=None, **compileUi_args):
     created.  The callable should return a tuple of the name of the directory
     in which the Python module will be created and the (possibly modified)
     name of the module.  The default is None.
+    bundle is the optional name of a single Python module (if it ends with
+    '.py') or package (otherwise) that the code of all the forms is written to
+    instead of a module for each.  The code of a form is only executed when
+    it is requested by calling the bundle's form() function with the name
+    the form's module would have had.  The directory returned by map is
+    ignored.  The default is None.
     compileUi_args are any additional keyword arguments that are passed to
     the compileUi() function that is called to create each Python module.
     """
 
     import os
 
-    # Compile a single .ui file.
-    def compile_ui(ui_dir, ui_file):
-        # Ignore if it doesn't seem to be a .ui file.
-        if ui_file.endswith('.ui'):
-            py_dir = ui_dir
-            py_file = ui_file[:-3] + '.py'
+    if recurse:
+        ui_files = [(root, ui) for root, _, files in os.walk(dir)
+                for ui in files]
+    else:
+        ui_files = [(dir, ui) for ui in os.listdir(dir)
+                if os.path.isfile(os.path.join(dir, ui))]
 
-            # Allow the caller to change the name of the .py file or generate
-            # it in a different directory.
-            if map is not None:
-                py_dir, py_file = map(py_dir, py_file)
+    if bundle is None:
+        for ui_dir, ui in ui_files:
+            _compileUiFile(ui_dir, ui, map, compileUi_args)
 
-            # Make sure the destination directory exists.
-            try:
-                os.makedirs(py_dir)
-            except:
-                pass
+        return
 
-            ui_path = os.path.join(ui_dir, ui_file)
-            py_path = os.path.join(py_dir, py_file)
+    from PyQt4.uic.formbundle import compileUiBundle
 
-            ui_file = open(ui_path, 'r')
-            py_file = open(py_path, 'w')
+    forms = []
 
-            try:
-                compileUi(ui_file, py_file, **compileUi_args)
-            finally:
-                ui_file.close()
-                py_file.close()
+    for ui_dir, ui in ui_files:
+        if not ui.endswith('.ui'):
+            continue
 
-    if recurse:
-        for root, _, files in os.walk(dir):
-            for ui in files:
-                compile_ui(root, ui)
-    else:
-        for ui in os.listdir(dir):
-            if os.path.isfile(os.path.join(dir, ui)):
-                compile_ui(dir, ui)
+        py_file = ui[:-3] + '.py'
+        if map is not None:
+            _, py_file = map(ui_dir, py_file)
+
+        forms.append((os.path.splitext(py_file)[0], os.path.join(ui_dir, ui)))
 
+    compileUiBundle(forms, bundle, **compileUi_args)
 
-def compileUi(uifile, pyfile, execute=False, indent=4, pyqt3_wrapper=False, from_imports=False, resource_suffix='_rc'):
-    """compileUi(uifile, pyfile, execute=False, indent=4, pyqt3_wrapper=False, from_imports=False, resource_suffix='_rc')
+
+def _compileUiFile(ui_dir, ui_file, map, compileUi_args):
+    """ Compile a single .ui file in a directory as compileUiDir() does and
+    return the name of the Python module created or None if the file doesn't
+    seem to be a .ui file.
+    """
+
+    import os
+
+    # Ignore if it doesn't seem to be a .ui file.
+    if not ui_file.endswith('.ui'):
+        return None
+
+    py_dir = ui_dir
+    py_file = ui_file[:-3] + '.py'
+
+    # Allow the caller to change the name of the .py file or generate it in a
+    # different directory.
+    if map is not None:
+        py_dir, py_file = map(py_dir, py_file)
+
+    # Make sure the destination directory exists.
+    try:
+        os.makedirs(py_dir)
+    except:
+        pass
+
+    ui_path = os.path.join(ui_dir, ui_file)
+    py_path = os.path.join(py_dir, py_file)
+
+    ui_file = open(ui_path, 'r')
+    py_file = open(py_path, 'w')
+
+    try:
+        compileUi(ui_file, py_file, **compileUi_args)
+    finally:
+        ui_file.close()
+        py_file.close()
+
+    return py_path
+
+
+def compileUi(uifile, pyfile, execute=False, indent=4, pyqt3_wrapper=False, from_imports=False, resource_suffix='_rc', profiler=None, runtime=False, defer_resources=False, optimize=(), batch=False):
+    """compileUi(uifile, pyfile, execute=False, indent=4, pyqt3_wrapper=False, from_imports=False, resource_suffix='_rc', profiler=None, runtime=False, defer_resources=False, optimize=(), batch=False)
 
     Creates a Python module from a Qt Designer .ui file.
 
@@ -158,31 +199,59 @@ def compileUi(uifile, pyfile, execute=False, indent=4, pyqt3_wrapper=False, from
     from the resource file by pyrcc4.  The default is '_rc', i.e. if the .ui
     file specified a resource file called foo.qrc then the corresponding Python
     module is foo_rc.
+    profiler is an optional PyQt4.uic.profiler.Profiler instance that records
+    the time taken by the compilation.
+    runtime is optionally set to generate code that imports its helpers from
+    PyQt4.uic.runtime rather than defining its own.  The forms then share the
+    helpers and the fonts they create.  The default is False.
+    defer_resources is optionally set to generate code that imports the
+    resource modules when setupUi() is first called rather than when the
+    module is imported.  The default is False.
+    optimize is an optional sequence of the names of the passes of
+    PyQt4.uic.optimizer that are applied to the .ui file, or an Optimizer
+    instance.  The default is to apply none of them.
+    batch is optionally set to generate code that suspends the updates of the
+    top-level widget, and the activation of its layouts, until setupUi() has
+    created the whole form.  The default is False.
     """
 
     from time import ctime
-    from PyQt4.QtCore import PYQT_VERSION_STR
+    from PyQt4.uic.Compiler import compiler, context
+    from PyQt4.uic.optimizer import optimizerFor
+    from PyQt4.uic.pyqtversion import versions
 
     try:
         uifname = uifile.name
     except AttributeError:
         uifname = uifile
 
-    indenter.indentwidth = indent
+    compiler_context = context.CompilerContext(indent, runtime=runtime,
+            defer_resources=defer_resources)
 
-    pyfile.write(_header % (uifname, ctime(), PYQT_VERSION_STR))
+    pyfile.write(_header % (uifname, ctime(), versions()[0]))
 
-    winfo = compiler.UICompiler().compileUi(uifile, pyfile, from_imports, resource_suffix)
+    ui_compiler = compiler.UICompiler(compiler_context)
+    ui_compiler.optimizer = optimizerFor(optimize)
+    ui_compiler.batch = batch
+
+    if profiler is not None:
+        profiler.instrument(ui_compiler)
+
+    winfo = ui_compiler.compileUi(uifile, pyfile, from_imports, resource_suffix)
+
+    code = compiler_context.indenter
 
     if pyqt3_wrapper:
-        indenter.write_code(_pyqt3_wrapper_code % winfo)
+        code.write(_pyqt3_wrapper_code % winfo)
 
     if execute:
-        indenter.write_code(_display_code % winfo)
+        code.write(_display_code % winfo)
+
+    code.flush()
 
 
-def loadUiType(uifile, from_imports=False, resource_suffix='_rc'):
-    """loadUiType(uifile, from_imports=False) -> (form class, base class)
+def loadUiType(uifile, from_imports=False, resource_suffix='_rc', profiler=None, optimize=(), batch=False):
+    """loadUiType(uifile, from_imports=False, resource_suffix='_rc', profiler=None, optimize=(), batch=False) -> (form class, base class)
 
     Load a Qt Designer .ui file and return the generated form class and the Qt
     base class.
@@ -195,11 +264,16 @@ def loadUiType(uifile, from_imports=False, resource_suffix='_rc'):
     from the resource file by pyrcc4.  The default is '_rc', i.e. if the .ui
     file specified a resource file called foo.qrc then the corresponding Python
     module is foo_rc.
+    profiler is an optional PyQt4.uic.profiler.Profiler instance that records
+    the time taken to compile the .ui file.
+    optimize and batch are as for compileUi().
     """
 
     import sys
 
     from PyQt4 import QtGui
+    from PyQt4.uic.Compiler import compiler
+    from PyQt4.uic.optimizer import optimizerFor
 
     if sys.hexversion >= 0x03000000:
         from PyQt4.uic.port_v3.string_io import StringIO
@@ -207,7 +281,14 @@ def loadUiType(uifile, from_imports=False, resource_suffix='_rc'):
         from PyQt4.uic.port_v2.string_io import StringIO
 
     code_string = StringIO()
-    winfo = compiler.UICompiler().compileUi(uifile, code_string, from_imports, resource_suffix)
+    ui_compiler = compiler.UICompiler()
+    ui_compiler.optimizer = optimizerFor(optimize)
+    ui_compiler.batch = batch
+
+    if profiler is not None:
+        profiler.instrument(ui_compiler)
+
+    winfo = ui_compiler.compileUi(uifile, code_string, from_imports, resource_suffix)
 
     ui_globals = {}
     exec(code_string.getvalue(), ui_globals)
@@ -215,8 +296,8 @@ def loadUiType(uifile, from_imports=False, resource_suffix='_rc'):
     return (ui_globals[winfo["uiclass"]], getattr(QtGui, winfo["baseclass"]))
 
 
-def loadUi(uifile, baseinstance=None, package='', resource_suffix='_rc'):
-    """loadUi(uifile, baseinstance=None, package='') -> widget
+def loadUi(uifile, baseinstance=None, package='', resource_suffix='_rc', profiler=None, memory_report=False, optimize=(), batch=False):
+    """loadUi(uifile, baseinstance=None, package='', resource_suffix='_rc', profiler=None, memory_report=False, optimize=(), batch=False) -> widget
 
     Load a Qt Designer .ui file and return an instance of the user interface.
 
@@ -231,12 +312,106 @@ def loadUi(uifile, baseinstance=None, package='', resource_suffix='_rc'):
     from the resource file by pyrcc4.  The default is '_rc', i.e. if the .ui
     file specified a resource file called foo.qrc then the corresponding Python
     module is foo_rc.
+    profiler is an optional PyQt4.uic.profiler.Profiler instance that records
+    the time taken to create the user interface.
+    memory_report is optionally set to account for the memory used to create
+    the user interface.  If it is True then a report is written to stderr.
+    Alternatively it may be a PyQt4.uic.memory.MemoryReport instance that is
+    populated but not written.
+    optimize is as for compileUi().
+    batch is optionally set to suspend the updates of the top-level widget,
+    and the activation of its layouts, until the whole form has been created.
+    The default is False.
     """
 
     from PyQt4.uic.Loader.loader import DynamicUILoader
+    from PyQt4.uic.optimizer import optimizerFor
+
+    loader = DynamicUILoader(package)
+    loader.optimizer = optimizerFor(optimize)
+    loader.batch = batch
+
+    if profiler is not None:
+        profiler.instrument(loader)
+
+    if memory_report:
+        from PyQt4.uic.memory import MemoryReport
+
+        if isinstance(memory_report, MemoryReport):
+            report = None
+        else:
+            memory_report = report = MemoryReport(getattr(uifile, 'name', uifile))
+
+        memory_report.instrument(loader)
+    else:
+        report = None
+
+    widget = loader.loadUi(uifile, baseinstance, resource_suffix)
+
+    if report is not None:
+        import sys
+
+        report.report(sys.stderr)
+
+    return widget
+
+
+def loadUiIncremental(uifile, budget_ms=20, baseinstance=None, package='', resource_suffix='_rc', optimize=()):
+    """loadUiIncremental(uifile, budget_ms=20, baseinstance=None, package='', resource_suffix='_rc', optimize=()) -> IncrementalLoader
+
+    Load a Qt Designer .ui file in a number of steps driven by the event loop
+    and return a PyQt4.uic.Loader.incremental.IncrementalLoader instance.
+
+    The top-level widget and its immediate children are created before this
+    returns and the top-level widget, available from the loader's widget()
+    method, may be shown immediately.  The contents of the other widgets are
+    created in later steps, with the pages of containers that are not shown
+    initially created last.  The loader emits progress(created, total) after
+    each step and finished(widget) when the form is complete.
+
+    budget_ms is the number of milliseconds that each step should take.  The
+    other arguments are as for loadUi().
+    """
+
+    from PyQt4.uic.Loader.incremental import IncrementalLoader
+
+    return IncrementalLoader(uifile, budget_ms, baseinstance, package,
+            resource_suffix, optimize)
+
+
+def loadUiAsync(uifile, callback=None, baseinstance=None, package='', resource_suffix='_rc', optimize=()):
+    """loadUiAsync(uifile, callback=None, baseinstance=None, package='', resource_suffix='_rc', optimize=()) -> LoadUiFuture
+
+    Load a Qt Designer .ui file, preparing it on a worker thread, and return a
+    PyQt4.uic.Loader.background.LoadUiFuture instance.
+
+    The worker thread parses and optimizes the .ui file, resolves the values
+    of enums and reads the image files used by the form.  The user interface
+    is then created on the GUI thread when the event loop next runs.  The
+    future's result() method returns the top-level widget, waiting for the
+    worker thread and creating the user interface immediately if necessary.
+
+    callback is an optional callable that is passed the future once the user
+    interface has been created.  It is called on the GUI thread.  The other
+    arguments are as for loadUi().
+    """
+
+    from PyQt4.uic.Loader.background import LoadUiFuture
+
+    future = LoadUiFuture(uifile, baseinstance, package, resource_suffix,
+            optimize)
+
+    if callback is not None:
+        future.add_done_callback(callback)
+
+    return future
+
 
-    return DynamicUILoader(package).loadUi(uifile, baseinstance, resource_suffix)
+# The list of directories that are searched for widget plugins.  This is
+# defined here, rather than imported from objcreator, so that the object
+# creator is not imported until it is needed.
+import os as _os
 
+widgetPluginPath = [_os.path.join(_os.path.dirname(__file__), 'widget-plugins')]
 
-# The list of directories that are searched for widget plugins.
-from PyQt4.uic.objcreator import widgetPluginPath
+del _os
@@ -0,0 +1,442 @@
+#############################################################################
+##
+## Copyright (c) 2014 Riverbank Computing Limited <info@riverbankcomputing.com>
+##
+## This file is part of PyQt.
+##
+## This file may be used under the terms of the GNU General Public
+## License versions 2.0 or 3.0 as published by the Free Software
+## Foundation and appearing in the files LICENSE.GPL2 and LICENSE.GPL3
+## included in the packaging of this file.  Alternatively you may (at
+## your option) use any later version of the GNU General Public
+## License if such license has been publicly approved by Riverbank
+## Computing Limited (or its successors, if any) and the KDE Free Qt
+## Foundation. In addition, as a special exception, Riverbank gives you
+## certain additional rights. These rights are described in the Riverbank
+## GPL Exception version 1.1, which can be found in the file
+## GPL_EXCEPTION.txt in this package.
+##
+## If you are unsure which license is appropriate for your use, please
+## contact the sales department at sales@riverbankcomputing.com.
+##
+## This file is provided AS IS with NO WARRANTY OF ANY KIND, INCLUDING THE
+## WARRANTY OF DESIGN, MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE.
+##
+#############################################################################
+
+
+# This module can be run as a script to rank the .ui files below a number of
+# directories by their predicted load cost without creating any Qt objects,
+# eg.
+#
+#     python -m PyQt4.uic.analyzer //server/tools
+
+
+import json
+import os
+import sys
+
+from xml.etree.ElementTree import parse
+
+
+# The relative cost of each of the things that are counted.  These are used to
+# rank forms and are not a prediction of absolute time.
+COST_WEIGHTS = {
+    'widgets': 1.0,
+    'layouts': 0.5,
+    'spacers': 0.2,
+    'actions': 0.5,
+    'items': 0.3,
+    'properties': 0.05,
+    'palette_roles': 0.05,
+    'fonts': 0.2,
+    'stylesheets': 1.0,
+    'icons': 1.0,
+    'image_kbytes': 0.1,
+    'connections': 0.2,
+}
+
+# The thresholds above which slow patterns are reported.
+PALETTE_WIDGETS = 5
+LARGE_ITEM_LIST = 100
+STYLESHEET_WIDGETS = 20
+
+
+class FormComplexity(object):
+    """ The complexity metrics of a .ui file and any slow patterns found in
+    it.
+    """
+
+    def __init__(self, path):
+        """ Initialise the metrics of the .ui file with the given path. """
+
+        self.path = path
+        self.error = None
+
+        self.widgets = 0
+        self.layouts = 0
+        self.spacers = 0
+        self.actions = 0
+        self.custom_widgets = 0
+        self.depth = 0
+        self.items = 0
+        self.max_items = 0
+        self.properties = 0
+        self.palettes = 0
+        self.palette_roles = 0
+        self.fonts = 0
+        self.stylesheets = 0
+        self.stylesheet_bytes = 0
+        self.icons = 0
+        self.images = 0
+        self.image_bytes = 0
+        self.connections = 0
+
+        # A list of (code, message) tuples.
+        self.warnings = []
+
+    @property
+    def cost(self):
+        """ The predicted relative cost of loading the form. """
+
+        cost = 0.0
+
+        for name, weight in COST_WEIGHTS.items():
+            if name == 'image_kbytes':
+                value = self.image_bytes / 1024.0
+            else:
+                value = getattr(self, name)
+
+            cost += value * weight
+
+        return cost
+
+    def density(self, name):
+        """ Return the proportion of widgets that have a palette, font or style
+        sheet.
+        """
+
+        if self.widgets == 0:
+            return 0.0
+
+        return getattr(self, name) / float(self.widgets)
+
+    def warn(self, code, message):
+        """ Record a slow pattern. """
+
+        self.warnings.append((code, message))
+
+    def as_dict(self):
+        """ Return the metrics as a dict that can be serialised as JSON. """
+
+        d = dict(self.__dict__)
+        d['warnings'] = [{'code': code, 'message': message}
+                for code, message in self.warnings]
+        d['cost'] = self.cost
+
+        return d
+
+
+class FormAnalyzer(object):
+    """ Analyze the structure of .ui files.  The element tree is traversed in
+    the same way as UIParser does but only counted, so no Qt objects are
+    created and Qt does not need to be installed.
+    """
+
+    def analyze(self, ui_file):
+        """ Return the FormComplexity of a .ui file.  Any error reading the file
+        is recorded in the result rather than raised.
+        """
+
+        self._form = form = FormComplexity(ui_file)
+        self._base_dir = os.path.dirname(ui_file)
+        self._icons = set()
+        self._images = set()
+
+        try:
+            root = parse(ui_file).getroot()
+        except Exception as e:
+            form.error = "%s: %s" % (e.__class__.__name__, e)
+            return form
+
+        elem = root.find('widget')
+        if elem is not None:
+            self.createWidget(elem, 0, False)
+
+        elem = root.find('customwidgets')
+        if elem is not None:
+            form.custom_widgets = len(elem.findall('customwidget'))
+
+        elem = root.find('connections')
+        if elem is not None:
+            form.connections = len(elem.findall('connection'))
+
+        form.icons = len(self._icons)
+        form.images = len(self._images)
+
+        if form.palettes > PALETTE_WIDGETS:
+            form.warn('palettes',
+                    "%d widgets have their own palette (%d colour roles), "
+                    "set the palette once on a common parent" % (
+                            form.palettes, form.palette_roles))
+
+        if form.stylesheets > STYLESHEET_WIDGETS:
+            form.warn('stylesheets',
+                    "%d widgets have their own style sheet, use a single "
+                    "style sheet with selectors" % form.stylesheets)
+
+        return form
+
+    def traverseWidgetTree(self, elem, depth, in_layout):
+        for child in iter(elem):
+            try:
+                handler = self.widgetTreeItemHandlers[child.tag]
+            except KeyError:
+                continue
+
+            handler(self, child, depth, in_layout)
+
+    def createWidget(self, elem, depth, in_layout):
+        form = self._form
+
+        form.widgets += 1
+        form.depth = max(form.depth, depth + 1)
+
+        name = elem.attrib.get('name', '')
+
+        for prop in elem.findall('property'):
+            self._property(prop, name, in_layout)
+
+        for attr in elem.findall('attribute'):
+            self._property(attr, name, False)
+
+        # Count the static items of an item view.
+        nr_items = _count_items(elem)
+        if nr_items:
+            form.items += nr_items
+            form.max_items = max(form.max_items, nr_items)
+
+            if nr_items > LARGE_ITEM_LIST:
+                form.warn('large-item-list',
+                        "%s has %d static items, populate it from code or "
+                        "use a model" % (name, nr_items))
+
+            for item in elem.iter('item'):
+                for prop in item.findall('property'):
+                    self._property(prop, name, False)
+
+        self.traverseWidgetTree(elem, depth + 1, False)
+
+    def createLayout(self, elem, depth, in_layout):
+        self._form.layouts += 1
+
+        for prop in elem.findall('property'):
+            self._property(prop, elem.attrib.get('name', ''), False)
+
+        self.traverseWidgetTree(elem, depth, True)
+
+    def createSpacer(self, elem, depth, in_layout):
+        self._form.spacers += 1
+
+    def handleItem(self, elem, depth, in_layout):
+        # Only the items of layouts are handled here, those of item views are
+        # counted with their widget.
+        if in_layout:
+            self.traverseWidgetTree(elem, depth, True)
+
+    def createAction(self, elem, depth, in_layout):
+        self._form.actions += 1
+
+        for prop in elem.findall('property'):
+            self._property(prop, elem.attrib.get('name', ''), False)
+
+    def createActionGroup(self, elem, depth, in_layout):
+        self.traverseWidgetTree(elem, depth, False)
+
+    widgetTreeItemHandlers = {
+        "widget"    : createWidget,
+        "layout"    : createLayout,
+        "spacer"    : createSpacer,
+        "item"      : handleItem,
+        "action"    : createAction,
+        "actiongroup": createActionGroup,
+        }
+
+    def _property(self, prop, owner, in_layout):
+        """ Account for a property of a widget, layout, action or item. """
+
+        form = self._form
+
+        form.properties += 1
+
+        if len(prop) == 0:
+            return
+
+        name = prop.attrib.get('name')
+        value = prop[0]
+
+        if value.tag == 'palette':
+            form.palettes += 1
+            form.palette_roles += len(value.findall('*/colorrole'))
+
+        elif value.tag == 'font':
+            form.fonts += 1
+
+        elif value.tag == 'iconset':
+            self._iconset(value, owner)
+
+        elif value.tag == 'pixmap':
+            if value.text:
+                self._image(value.text, owner)
+
+        elif name == 'styleSheet':
+            text = value.text or ''
+            if text:
+                form.stylesheets += 1
+                form.stylesheet_bytes += len(text)
+
+        elif name == 'geometry' and in_layout:
+            form.warn('geometry-in-layout',
+                    "%s has a geometry but is managed by a layout which will "
+                    "override it" % owner)
+
+    def _iconset(self, iconset, owner):
+        """ Account for an icon set. """
+
+        key = [iconset.attrib.get('theme'), iconset.text]
+
+        for role in iconset:
+            key.append((role.tag, role.text))
+
+            if role.text:
+                self._image(role.text, owner)
+
+        if len(iconset) == 0 and iconset.text:
+            self._image(iconset.text, owner)
+
+        self._icons.add(tuple(key))
+
+    def _image(self, file_name, owner):
+        """ Account for an image file. """
+
+        file_name = file_name.strip()
+
+        if file_name in self._images:
+            return
+
+        self._images.add(file_name)
+
+        # Images in resource files are compiled in.
+        if file_name.startswith(':'):
+            return
+
+        if file_name.startswith('\\\\') or file_name.startswith('//'):
+            self._form.warn('network-image',
+                    "%s uses the image %s on a network share which will be "
+                    "read every time the form is loaded" % (owner, file_name))
+        elif os.path.isabs(file_name) or (len(file_name) > 1 and file_name[1] == ':'):
+            self._form.warn('absolute-image',
+                    "%s uses the image %s with an absolute path" % (owner,
+                            file_name))
+        else:
+            file_name = os.path.join(self._base_dir, file_name)
+
+        try:
+            self._form.image_bytes += os.path.getsize(file_name)
+        except OSError:
+            pass
+
+
+def _count_items(elem):
+    """ Return the number of items, including nested items, of an element. """
+
+    nr_items = 0
+
+    for item in elem.findall('item'):
+        nr_items += 1 + _count_items(item)
+
+    return nr_items
+
+
+def find_ui_files(paths):
+    """ Return the list of .ui files given a list of files and directories. """
+
+    ui_files = []
+
+    for path in paths:
+        if os.path.isdir(path):
+            for root, dirs, files in os.walk(path):
+                dirs.sort()
+
+                for fname in sorted(files):
+                    if fname.endswith('.ui'):
+                        ui_files.append(os.path.join(root, fname))
+        else:
+            ui_files.append(path)
+
+    return ui_files
+
+
+def main(argv=None):
+    """ Analyze a number of .ui files and rank them by their predicted load
+    cost.  Return the exit status.
+    """
+
+    import optparse
+
+    parser = optparse.OptionParser(
+            usage="python -m PyQt4.uic.analyzer [options] <ui-file|dir> ...")
+    parser.add_option("-n", "--top", dest="top", action="store", type="int",
+            default=0, metavar="N",
+            help="only show the N most costly forms [default: all]")
+    parser.add_option("--json", dest="json", action="store", type="string",
+            default=None, metavar="FILE",
+            help="write the metrics of every form as JSON to FILE")
+    parser.add_option("-q", "--quiet", dest="quiet", action="store_true",
+            default=False, help="do not show the slow patterns found")
+
+    opts, args = parser.parse_args(argv)
+
+    if not args:
+        parser.error("at least one ui-file or directory must be specified")
+
+    analyzer = FormAnalyzer()
+    forms = [analyzer.analyze(ui_file) for ui_file in find_ui_files(args)]
+    forms.sort(key=lambda f: f.cost, reverse=True)
+
+    shown = forms[:opts.top] if opts.top > 0 else forms
+
+    sys.stdout.write("%8s %7s %7s %5s %7s %6s %6s %6s %6s %9s %6s  %s\n" % (
+            "Cost", "Widgets", "Layouts", "Depth", "Items", "Pal%",
+            "Font%", "Style%", "Icons", "Image KiB", "Conns", "Form"))
+
+    for form in shown:
+        if form.error is not None:
+            sys.stdout.write("%8s  %s: %s\n" % ("error", form.path,
+                    form.error))
+            continue
+
+        sys.stdout.write("%8.1f %7d %7d %5d %7d %6.1f %6.1f %6.1f %6d %9.1f %6d  %s\n" % (
+                form.cost, form.widgets, form.layouts, form.depth,
+                form.items, form.density('palettes') * 100,
+                form.density('fonts') * 100,
+                form.density('stylesheets') * 100, form.icons,
+                form.image_bytes / 1024.0, form.connections, form.path))
+
+        if not opts.quiet:
+            for code, message in form.warnings:
+                sys.stdout.write("%8s  [%s] %s\n" % ("", code, message))
+
+    if opts.json:
+        f = open(opts.json, 'w')
+
+        try:
+            json.dump([form.as_dict() for form in forms], f, indent=2)
+        finally:
+            f.close()
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -29,6 +29,27 @@ import sys
 import logging
 
 from PyQt4.uic import compileUi, loadUi
+from PyQt4.uic.exceptions import NoSuchWidgetError
+
+
+def error_message(e):
+    """ Return the message describing an exception raised while compiling a
+    .ui file in the same way that pyuic4 does.
+    """
+
+    if isinstance(e, IOError):
+        return "Error: %s: \"%s\"" % (e.strerror, e.filename)
+
+    if isinstance(e, SyntaxError):
+        return "Error in input file: %s" % e
+
+    if isinstance(e, NoSuchWidgetError):
+        if e.args[0].startswith("Q3"):
+            return "Error: Q3Support widgets are not supported by PyQt4."
+
+        return str(e)
+
+    return "An unexpected error occurred: %s: %s" % (e.__class__.__name__, e)
 
 
 class Driver(object):
@@ -58,6 +79,12 @@ class Driver(object):
         there was no error.
         """
 
+        if getattr(self._opts, 'server', False):
+            return self._serve()
+
+        if getattr(self._opts, 'watch', None):
+            return self._watch()
+
         if self._opts.preview:
             return self._preview()
 
@@ -73,11 +100,58 @@ class Driver(object):
         from PyQt4 import QtGui
 
         app = QtGui.QApplication([self._ui_file])
-        widget = loadUi(self._ui_file)
+        profiler = self._create_profiler()
+        optimize = self._create_optimizer()
+        widget = loadUi(self._ui_file, profiler=profiler, optimize=optimize,
+                batch=self._opts.batch)
+        self._report_profile(profiler)
+        self._report_optimizer(optimize)
         widget.show()
 
         return app.exec_()
 
+    def _serve(self):
+        """ Run a compile server until a client shuts it down.  Return the exit
+        status to be passed back to the parent process.
+        """
+
+        from PyQt4.uic.exceptions import CompileServerError
+        from PyQt4.uic.server import CompileServer
+
+        try:
+            server = CompileServer(self._opts.address)
+        except CompileServerError as e:
+            sys.stderr.write("Error: %s\n" % e)
+            return 1
+
+        server.serve_forever()
+
+        return 0
+
+    def _watch(self):
+        """ Watch a directory of .ui files and recompile those that change
+        until interrupted.  Return the exit status to be passed back to the
+        parent process.
+        """
+
+        from PyQt4.uic.watcher import UiDirWatcher
+
+        opts = self._opts
+
+        watcher = UiDirWatcher(opts.watch, recurse=opts.recurse,
+                interval=opts.interval, debounce=opts.debounce,
+                jobs=opts.jobs, execute=opts.execute, indent=opts.indent,
+                pyqt3_wrapper=opts.pyqt3_wrapper,
+                from_imports=opts.from_imports,
+                resource_suffix=opts.resource_suffix, runtime=opts.runtime,
+                defer_resources=opts.defer_resources, optimize=opts.optimize,
+                flatten=getattr(opts, 'optimize_flatten', ''),
+                optimize_report=getattr(opts, 'optimize_report', False),
+                batch=opts.batch)
+        watcher.watch()
+
+        return 0
+
     def _generate(self):
         """ Generate the Python code. """
 
@@ -94,9 +168,59 @@ class Driver(object):
             else:
                 pyfile = open(self._opts.output, 'wt')
 
+        profiler = self._create_profiler()
+        optimize = self._create_optimizer()
+
         compileUi(self._ui_file, pyfile, self._opts.execute, self._opts.indent,
                 self._opts.pyqt3_wrapper, self._opts.from_imports,
-                self._opts.resource_suffix)
+                self._opts.resource_suffix, profiler, self._opts.runtime,
+                self._opts.defer_resources, optimize, self._opts.batch)
+
+        self._report_profile(profiler)
+        self._report_optimizer(optimize)
+
+    def _create_profiler(self):
+        """ Return a profiler if one was requested, otherwise None. """
+
+        if getattr(self._opts, 'profile', False) or getattr(self._opts, 'profile_trace', None):
+            from PyQt4.uic.profiler import Profiler
+
+            return Profiler()
+
+        return None
+
+    def _report_profile(self, profiler):
+        """ Report the results of a profiler as requested. """
+
+        if profiler is None:
+            return
+
+        if self._opts.profile:
+            profiler.report(sys.stderr)
+
+        if self._opts.profile_trace:
+            profiler.write_trace(self._opts.profile_trace)
+
+    def _create_optimizer(self):
+        """ Return the optimize argument to pass, which is an optimizer if its
+        changes are to be reported or objects are to be flattened.
+        """
+
+        report = getattr(self._opts, 'optimize_report', False)
+        flatten = getattr(self._opts, 'optimize_flatten', '')
+
+        if self._opts.optimize and (report or flatten):
+            from PyQt4.uic.optimizer import Optimizer
+
+            return Optimizer(self._opts.optimize, flatten)
+
+        return self._opts.optimize
+
+    def _report_optimizer(self, optimize):
+        """ Report the changes made by an optimizer as requested. """
+
+        if getattr(optimize, 'changes', None) is not None:
+            optimize.report(sys.stderr)
 
     def on_IOError(self, e):
         """ Handle an IOError exception. """
@@ -124,7 +248,7 @@ class Driver(object):
 
             traceback.print_exception(*sys.exc_info())
         else:
-            from PyQt4 import QtCore
+            from PyQt4.uic.pyqtversion import versions
 
             sys.stderr.write("""An unexpected error occurred.
 Check that you are using the latest version of PyQt and send an error report to
@@ -133,4 +257,4 @@ support@riverbankcomputing.com, including the following information:
   * your version of PyQt (%s)
   * the UI file that caused this error
   * the debug output of pyuic4 (use the -d flag when calling pyuic4)
-""" % QtCore.PYQT_VERSION_STR)
+""" % versions()[0])
@@ -47,3 +47,6 @@ class UnsupportedPropertyError(Exception):
 
 class WidgetPluginError(Exception):
     pass
+
+class CompileServerError(Exception):
+    pass
@@ -0,0 +1,333 @@
+#############################################################################
+##
+## Copyright (c) 2014 Riverbank Computing Limited <info@riverbankcomputing.com>
+##
+## This file is part of PyQt.
+##
+## This file may be used under the terms of the GNU General Public
+## License versions 2.0 or 3.0 as published by the Free Software
+## Foundation and appearing in the files LICENSE.GPL2 and LICENSE.GPL3
+## included in the packaging of this file.  Alternatively you may (at
+## your option) use any later version of the GNU General Public
+## License if such license has been publicly approved by Riverbank
+## Computing Limited (or its successors, if any) and the KDE Free Qt
+## Foundation. In addition, as a special exception, Riverbank gives you
+## certain additional rights. These rights are described in the Riverbank
+## GPL Exception version 1.1, which can be found in the file
+## GPL_EXCEPTION.txt in this package.
+##
+## If you are unsure which license is appropriate for your use, please
+## contact the sales department at sales@riverbankcomputing.com.
+##
+## This file is provided AS IS with NO WARRANTY OF ANY KIND, INCLUDING THE
+## WARRANTY OF DESIGN, MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE.
+##
+#############################################################################
+
+# A bundle contains the code of a number of forms with a single copy of the
+# imports and helpers that the code uses.  The code of a form is only executed
+# when the form is first requested by name by calling the bundle's form()
+# function.  A bundle is either a single module, in which the code of each
+# form is wrapped in a function, or a package, in which the code of each form
+# is a sub-module that is only imported when needed.
+
+
+import os
+import sys
+import time
+
+if sys.hexversion >= 0x03000000:
+    from PyQt4.uic.port_v3.string_io import StringIO
+else:
+    from PyQt4.uic.port_v2.string_io import StringIO
+
+
+_bundle_header = """# -*- coding: utf-8 -*-
+
+# Form implementation bundle generated from reading ui files
+#
+# Created: %s
+#      by: PyQt4 UI code generator %s
+#
+# WARNING! All changes made in this file will be lost!
+#
+# Forms:
+%s
+
+"""
+
+
+_module_runtime = """
+# The function that creates each form keyed by the name of the form.
+_forms = {
+%s
+}
+
+_created = {}
+
+
+def forms():
+\t\"\"\" Return the sorted names of the forms in the bundle. \"\"\"
+
+\treturn sorted(_forms.keys())
+
+
+def form(name):
+\t\"\"\" Return the module containing the code of a form, executing the code
+\twhen the form is first requested.
+\t\"\"\"
+
+\tmodule = _created.get(name)
+
+\tif module is None:
+\t\timport types
+
+\t\tmodule = types.ModuleType('%%s.%%s' %% (__name__, name))
+\t\tmodule.__dict__.update(_forms[name]())
+\t\t_created[name] = module
+
+\treturn module
+"""
+
+
+_package_runtime = """
+# The names of the forms, each of which is a sub-module.
+_forms = (
+%s
+)
+
+
+def forms():
+\t\"\"\" Return the sorted names of the forms in the bundle. \"\"\"
+
+\treturn list(_forms)
+
+
+def form(name):
+\t\"\"\" Return the module containing the code of a form, importing it when the
+\tform is first requested.
+\t\"\"\"
+
+\tif name not in _forms:
+\t\traise KeyError(name)
+
+\timport sys
+
+\tmname = '%%s.%%s' %% (__name__, name)
+\t__import__(mname)
+
+\treturn sys.modules[mname]
+"""
+
+
+def compileForm(uifile, indent=4, pyqt3_wrapper=False, from_imports=False, resource_suffix='_rc', profiler=None, runtime=False, defer_resources=False, optimize=(), batch=False):
+    """ Return the code of a form without the header, the imports of QtCore
+    and QtGui and the helpers that are provided by a bundle.  The arguments
+    are the same as those of compileUi().
+    """
+
+    from PyQt4.uic import _pyqt3_wrapper_code
+    from PyQt4.uic.Compiler import compiler, context
+    from PyQt4.uic.optimizer import optimizerFor
+
+    code = StringIO()
+    compiler_context = context.CompilerContext(indent, prologue=False,
+            runtime=runtime, defer_resources=defer_resources)
+
+    ui_compiler = compiler.UICompiler(compiler_context)
+    ui_compiler.optimizer = optimizerFor(optimize)
+    ui_compiler.batch = batch
+
+    if profiler is not None:
+        profiler.instrument(ui_compiler)
+
+    winfo = ui_compiler.compileUi(uifile, code, from_imports, resource_suffix)
+
+    if pyqt3_wrapper:
+        compiler_context.indenter.write(_pyqt3_wrapper_code % winfo)
+
+    compiler_context.indenter.flush()
+
+    return code.getvalue()
+
+
+def _writePrologue(pyfile, indent, runtime):
+    """ Write the imports of QtCore and QtGui and the helpers that are shared
+    by the forms.
+    """
+
+    from PyQt4.uic.Compiler import compiler, context, indenter
+
+    context.pushContext(context.CompilerContext(indent))
+
+    try:
+        indenter.createCodeIndenter(pyfile)
+        code = indenter.getIndenter()
+        compiler.writePrologue(code, runtime)
+        code.flush()
+    finally:
+        context.popContext()
+
+
+def _indentUnit(indent):
+    """ Return the string used for each level of indentation. """
+
+    if indent > 0:
+        return " " * indent
+
+    return "\t"
+
+
+def _writeRuntime(pyfile, runtime, index, indent):
+    """ Write the code that gives access to the forms. """
+
+    unit = _indentUnit(indent)
+
+    runtime = runtime % "\n".join([unit + entry for entry in index])
+    pyfile.write(runtime.replace("\t", unit))
+
+
+def _writeHeader(pyfile, forms):
+    """ Write the header of a bundle listing the forms it contains. """
+
+    from PyQt4.uic.pyqtversion import versions
+
+    listing = "\n".join(["#     %s: '%s'" % (name, uifile)
+            for name, uifile in forms])
+
+    pyfile.write(_bundle_header % (time.ctime(), versions()[0], listing))
+
+
+def _checkForms(forms):
+    """ Check that the names of the forms are unique. """
+
+    names = set()
+
+    for name, uifile in forms:
+        if name in names:
+            raise ValueError("more than one form is called '%s'" % name)
+
+        names.add(name)
+
+
+def compileUiBundle(forms, bundle, execute=False, indent=4, pyqt3_wrapper=False, from_imports=False, resource_suffix='_rc', profiler=None, runtime=False, defer_resources=False, optimize=(), batch=False):
+    """compileUiBundle(forms, bundle, execute=False, indent=4, pyqt3_wrapper=False, from_imports=False, resource_suffix='_rc', profiler=None, runtime=False, defer_resources=False, optimize=(), batch=False)
+
+    Creates a bundle of the Python code of a number of Qt Designer .ui files.
+
+    forms is a sequence of tuples of the name of a form and the name of its
+    .ui file.  The name of a form is what is passed to the bundle's form()
+    function to get the module containing its code.
+    bundle is the name of the Python module to create if it ends with '.py',
+    otherwise it is the name of the directory of the Python package to
+    create.  A form in a package must have a name that is a valid module
+    name.  Relative imports of resource modules (see from_imports) are
+    relative to the package.
+    execute is not supported by bundles.
+    The remaining arguments are the same as those of compileUi().
+    """
+
+    if execute:
+        raise ValueError("bundles cannot contain code to display forms")
+
+    forms = sorted(forms)
+    _checkForms(forms)
+
+    compile_args = dict(indent=indent, pyqt3_wrapper=pyqt3_wrapper,
+            from_imports=from_imports, resource_suffix=resource_suffix,
+            profiler=profiler, runtime=runtime,
+            defer_resources=defer_resources, optimize=optimize,
+            batch=batch)
+
+    if bundle.endswith('.py'):
+        _writeModule(forms, bundle, compile_args)
+    else:
+        _writePackage(forms, bundle, compile_args)
+
+
+def _writeModule(forms, bundle, compile_args):
+    """ Write a bundle as a single module. """
+
+    indent = compile_args['indent']
+    unit = _indentUnit(indent)
+
+    pyfile = open(bundle, 'w')
+
+    try:
+        _writeHeader(pyfile, forms)
+        _writePrologue(pyfile, indent, compile_args['runtime'])
+
+        index = []
+
+        for nr, (name, uifile) in enumerate(forms):
+            code = compileForm(uifile, **compile_args)
+
+            # The code of the form is executed when the function is called
+            # and the names it defines are returned.
+            func = "_form_%d" % nr
+
+            pyfile.write("\n# %s\n" % name)
+            pyfile.write("def %s():\n" % func)
+
+            for line in code.splitlines():
+                if line.strip():
+                    pyfile.write(unit + line + "\n")
+                else:
+                    pyfile.write("\n")
+
+            pyfile.write("\n%sreturn locals()\n\n" % unit)
+
+            index.append("%r: %s," % (name, func))
+
+        _writeRuntime(pyfile, _module_runtime, index, indent)
+    finally:
+        pyfile.close()
+
+
+def _writePackage(forms, bundle, compile_args):
+    """ Write a bundle as a package with a sub-module for each form. """
+
+    from PyQt4.uic import _header
+    from PyQt4.uic.pyqtversion import versions
+
+    for name, _ in forms:
+        if not _isModuleName(name):
+            raise ValueError("'%s' is not a valid module name" % name)
+
+    if not os.path.isdir(bundle):
+        os.makedirs(bundle)
+
+    pyfile = open(os.path.join(bundle, '__init__.py'), 'w')
+
+    try:
+        _writeHeader(pyfile, forms)
+        _writePrologue(pyfile, compile_args['indent'],
+                compile_args['runtime'])
+        _writeRuntime(pyfile, _package_runtime,
+                ["%r," % name for name, _ in forms], compile_args['indent'])
+    finally:
+        pyfile.close()
+
+    for name, uifile in forms:
+        code = compileForm(uifile, **compile_args)
+
+        pyfile = open(os.path.join(bundle, name + '.py'), 'w')
+
+        try:
+            pyfile.write(_header % (uifile, time.ctime(), versions()[0]))
+            pyfile.write("from PyQt4 import QtCore, QtGui\n\n")
+            if compile_args['runtime']:
+                pyfile.write("from . import _fromUtf8, _translate, _uic\n\n")
+            else:
+                pyfile.write("from . import _fromUtf8, _translate\n\n")
+            pyfile.write(code)
+        finally:
+            pyfile.close()
+
+
+def _isModuleName(name):
+    """ Return True if a name is a valid module name. """
+
+    import re
+
+    return re.match(r'^[A-Za-z_][A-Za-z0-9_]*$', name) is not None
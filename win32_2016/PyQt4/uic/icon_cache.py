@@ -34,6 +34,17 @@ else:
     from PyQt4.uic.port_v2.as_string import as_string
 
 
+def file_name(fname, base_dir):
+    """ Convert a relative filename if we have a base directory. """
+
+    fname = fname.replace("\\", "\\\\")
+
+    if base_dir != '' and fname[0] != ':' and not os.path.isabs(fname):
+        fname = os.path.join(base_dir, fname)
+
+    return fname
+
+
 class IconCache(object):
     """Maintain a cache of icons.  If an icon is used more than once by a GUI
     then ensure that only one copy is created.
@@ -47,6 +58,9 @@ class IconCache(object):
         self._base_dir = ''
         self._cache = []
 
+        # Any images that have already been read, keyed by file name.
+        self.images = {}
+
     def set_base_dir(self, base_dir):
         """ Set the base directory to be used for all relative filenames. """
 
@@ -85,11 +99,28 @@ class IconCache(object):
 
             icon = self._object_factory.createQObject("QIcon", name, (),
                     is_attribute=False)
-            iset.set_icon(icon, self._qtgui_module)
+            iset.set_icon(icon, self._qtgui_module, self.images)
             self._cache.append(iset)
 
         return iset.icon
 
+    def memory_usage(self):
+        """ Return a tuple of the number of icons, the number of pixmaps and
+        the number of bytes of pixel data held by the pixmaps of the cache.
+        Pixmaps of icons that were created from a single file (ie. with no
+        roles) are not included.
+        """
+
+        nr_pixmaps = 0
+        nr_bytes = 0
+
+        for iset in self._cache:
+            for pixmap in iset.pixmaps:
+                nr_pixmaps += 1
+                nr_bytes += pixmap.width() * pixmap.height() * pixmap.depth() // 8
+
+        return len(self._cache), nr_pixmaps, nr_bytes
+
 
 class _IconSet(object):
     """An icon set, ie. the mode and state and the pixmap used for each."""
@@ -98,39 +129,38 @@ class _IconSet(object):
         """Initialise the icon set from an XML tag."""
 
         # Set the pre-Qt v4.4 fallback (ie. with no roles).
-        self._fallback = self._file_name(iconset.text, base_dir)
+        self._fallback = file_name(iconset.text, base_dir)
         self._use_fallback = True
 
         # Parse the icon set.
         self._roles = {}
 
         for i in iconset:
-            file_name = i.text
-            if file_name is not None:
-                file_name = self._file_name(file_name, base_dir)
+            fname = i.text
+            if fname is not None:
+                fname = file_name(fname, base_dir)
 
-            self._roles[i.tag] = file_name
+            self._roles[i.tag] = fname
             self._use_fallback = False
 
         # There is no real icon yet.
         self.icon = None
+        self.pixmaps = []
 
-    @staticmethod
-    def _file_name(fname, base_dir):
-        """ Convert a relative filename if we have a base directory. """
-
-        fname = fname.replace("\\", "\\\\")
-
-        if base_dir != '' and fname[0] != ':' and not os.path.isabs(fname):
-            fname = os.path.join(base_dir, fname)
+    def set_icon(self, icon, qtgui_module, images=None):
+        """Save the icon and set its attributes.  images is an optional dict
+        of any images that have already been read, keyed by file name.
+        """
 
-        return fname
-
-    def set_icon(self, icon, qtgui_module):
-        """Save the icon and set its attributes."""
+        if images is None:
+            images = {}
 
         if self._use_fallback:
-            icon.addFile(self._fallback)
+            image = images.get(self._fallback)
+            if image is None:
+                icon.addFile(self._fallback)
+            else:
+                icon.addPixmap(qtgui_module.QPixmap.fromImage(image))
         else:
             for role, pixmap in self._roles.items():
                 if role.endswith("off"):
@@ -145,9 +175,17 @@ class _IconSet(object):
                 mode = getattr(qtgui_module.QIcon, mode.title())
 
                 if pixmap:
-                    icon.addPixmap(qtgui_module.QPixmap(pixmap), mode, state)
+                    image = images.get(pixmap)
+                    if image is None:
+                        qpixmap = qtgui_module.QPixmap(pixmap)
+                    else:
+                        qpixmap = qtgui_module.QPixmap.fromImage(image)
+
+                    self.pixmaps.append(qpixmap)
                 else:
-                    icon.addPixmap(qtgui_module.QPixmap(), mode, state)
+                    qpixmap = qtgui_module.QPixmap()
+
+                icon.addPixmap(qpixmap, mode, state)
 
         self.icon = icon
 
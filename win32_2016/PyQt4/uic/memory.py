@@ -0,0 +1,444 @@
+#############################################################################
+##
+## Copyright (c) 2014 Riverbank Computing Limited <info@riverbankcomputing.com>
+##
+## This file is part of PyQt.
+##
+## This file may be used under the terms of the GNU General Public
+## License versions 2.0 or 3.0 as published by the Free Software
+## Foundation and appearing in the files LICENSE.GPL2 and LICENSE.GPL3
+## included in the packaging of this file.  Alternatively you may (at
+## your option) use any later version of the GNU General Public
+## License if such license has been publicly approved by Riverbank
+## Computing Limited (or its successors, if any) and the KDE Free Qt
+## Foundation. In addition, as a special exception, Riverbank gives you
+## certain additional rights. These rights are described in the Riverbank
+## GPL Exception version 1.1, which can be found in the file
+## GPL_EXCEPTION.txt in this package.
+##
+## If you are unsure which license is appropriate for your use, please
+## contact the sales department at sales@riverbankcomputing.com.
+##
+## This file is provided AS IS with NO WARRANTY OF ANY KIND, INCLUDING THE
+## WARRANTY OF DESIGN, MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE.
+##
+#############################################################################
+
+
+# This module can be run as a script to load a number of .ui files and report
+# the memory used by each of them, eg.
+#
+#     python -m PyQt4.uic.memory tool1.ui tool2.ui
+
+
+import json
+import os
+import sys
+
+try:
+    import tracemalloc
+except ImportError:
+    tracemalloc = None
+
+from PyQt4.uic.profiler import PARSER_PHASES
+
+
+def _rss():
+    """ Return the resident set size of the process or None if it cannot be
+    determined.  This is the fallback when tracemalloc is not available.
+    """
+
+    try:
+        import psutil
+    except ImportError:
+        return None
+
+    return psutil.Process(os.getpid()).memory_info().rss
+
+
+class MemoryReport(object):
+    """ Account for the memory used when a .ui file is loaded.  The Python
+    memory retained by, and the peak allocated during, each phase of the
+    parser is recorded using tracemalloc, along with the allocation sites
+    responsible for most of the retained memory.  Without tracemalloc (eg. on
+    Python v2) the change in the resident set size of the process is recorded
+    instead if psutil is installed.  The number of objects created of each
+    class and the icons and pixmaps held by the icon cache are also recorded.
+    """
+
+    def __init__(self, name=None, top=10):
+        """ Initialise the report.  name is the optional name of the .ui file.
+        top is the number of allocation sites to record.
+        """
+
+        self.name = name
+        self.top = top
+
+        if tracemalloc is not None:
+            self.source = 'tracemalloc'
+        elif _rss() is not None:
+            self.source = 'rss'
+        else:
+            self.source = None
+
+        # A list of (phase, retained bytes, peak bytes) tuples in the order in
+        # which the phases finished.  Either size may be None.
+        self.phases = []
+
+        # A list of (location, retained bytes, allocations) tuples.
+        self.top_allocations = []
+
+        self.objects = {}
+        self.icons = 0
+        self.pixmaps = 0
+        self.pixmap_bytes = 0
+
+        self._stack = []
+        self._stop_tracing = False
+        self._snapshot = None
+
+    @property
+    def retained(self):
+        """ The number of bytes retained by the whole parse or None if it is
+        not known.
+        """
+
+        for phase, retained, _ in self.phases:
+            if phase == 'parse':
+                return retained
+
+        return None
+
+    @property
+    def peak(self):
+        """ The peak number of bytes allocated during the whole parse or None
+        if it is not known.
+        """
+
+        for phase, _, peak in self.phases:
+            if phase == 'parse':
+                return peak
+
+        return None
+
+    @property
+    def notes(self):
+        """ A list of explanations of the figures that are not available or are
+        only approximate.
+        """
+
+        notes = []
+
+        if self.source is None:
+            notes.append("Python memory figures are not available: "
+                    "tracemalloc requires Python v3.4 or later (this is "
+                    "Python v%d.%d) and psutil, which is used instead, is not "
+                    "installed." % sys.version_info[:2])
+        elif self.source == 'rss':
+            notes.append("tracemalloc requires Python v3.4 or later (this is "
+                    "Python v%d.%d) so retained memory is measured as the "
+                    "change in the resident set size of the process and "
+                    "includes memory not allocated by Python." %
+                            sys.version_info[:2])
+            notes.append("Peak memory and allocation sites require "
+                    "tracemalloc and are not available.")
+        elif getattr(tracemalloc, 'reset_peak', None) is None:
+            notes.append("Peak memory requires Python v3.9 or later and is "
+                    "not available.")
+
+        return notes
+
+    def instrument(self, parser):
+        """ Instrument a parser, normally a DynamicUILoader, so that its memory
+        usage is recorded.  The parser is returned.
+        """
+
+        for attr, phase in PARSER_PHASES:
+            method = getattr(parser, attr, None)
+            if method is not None:
+                setattr(parser, attr, self._wrap_phase(method, phase))
+
+        # The icon cache is replaced when the parser is reset at the end of the
+        # parse so it must be inspected before then.
+        finalize = parser.finalize
+
+        def finalize_wrapper():
+            self.icons, self.pixmaps, self.pixmap_bytes = parser.wprops.icon_cache.memory_usage()
+
+            return finalize()
+
+        parser.finalize = finalize_wrapper
+
+        factory = parser.factory
+        create = factory.createQObject
+        objects = self.objects
+
+        def create_wrapper(classname, *args, **kwargs):
+            objects[classname] = objects.get(classname, 0) + 1
+
+            return create(classname, *args, **kwargs)
+
+        factory.createQObject = create_wrapper
+
+        return parser
+
+    def _wrap_phase(self, func, phase):
+        """ Return a wrapper around a phase that records its memory usage. """
+
+        def wrapper(*args, **kwargs):
+            self._start(phase)
+
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self._finish(phase)
+
+        return wrapper
+
+    def _start(self, phase):
+        """ Start measuring a phase. """
+
+        if self.source == 'tracemalloc':
+            if not self._stack:
+                if not tracemalloc.is_tracing():
+                    tracemalloc.start()
+                    self._stop_tracing = True
+
+                self._snapshot = self._take_snapshot()
+
+            current, peak = tracemalloc.get_traced_memory()
+
+            # Peaks can only be isolated if the peak can be reset (Python
+            # v3.9 and later), in which case the peak so far must be saved
+            # for any enclosing phase.
+            reset_peak = getattr(tracemalloc, 'reset_peak', None)
+
+            if reset_peak is not None:
+                if self._stack:
+                    outer = self._stack[-1]
+                    outer[1] = max(outer[1], peak)
+
+                reset_peak()
+                peak = current
+            else:
+                peak = None
+
+            self._stack.append([current, peak])
+        elif self.source == 'rss':
+            self._stack.append([_rss(), None])
+        else:
+            self._stack.append([None, None])
+
+    def _finish(self, phase):
+        """ Finish measuring a phase. """
+
+        start, peak = self._stack.pop()
+
+        if self.source == 'tracemalloc':
+            current, traced_peak = tracemalloc.get_traced_memory()
+
+            if peak is not None:
+                peak = max(peak, traced_peak)
+
+                if self._stack:
+                    outer = self._stack[-1]
+                    outer[1] = max(outer[1], peak)
+
+                peak -= start
+
+            retained = current - start
+
+            if not self._stack:
+                self._record_top_allocations()
+
+                if self._stop_tracing:
+                    tracemalloc.stop()
+                    self._stop_tracing = False
+        elif self.source == 'rss':
+            retained = _rss() - start
+        else:
+            retained = None
+
+        self.phases.append((phase, retained, peak))
+
+    @staticmethod
+    def _take_snapshot():
+        """ Take a snapshot that excludes tracemalloc's own allocations. """
+
+        return tracemalloc.take_snapshot().filter_traces(
+                (tracemalloc.Filter(False, tracemalloc.__file__), ))
+
+    def _record_top_allocations(self):
+        """ Record the allocation sites that retained the most memory. """
+
+        stats = self._take_snapshot().compare_to(self._snapshot, 'lineno')
+        self._snapshot = None
+
+        self.top_allocations = []
+
+        for stat in stats:
+            if stat.size_diff <= 0:
+                continue
+
+            frame = stat.traceback[0]
+            self.top_allocations.append(("%s:%d" % (frame.filename,
+                    frame.lineno), stat.size_diff, stat.count_diff))
+
+            if len(self.top_allocations) == self.top:
+                break
+
+    def as_dict(self):
+        """ Return the report as a dict that can be serialised as JSON. """
+
+        return {
+            'name': self.name,
+            'source': self.source,
+            'notes': self.notes,
+            'retained': self.retained,
+            'peak': self.peak,
+            'phases': [{'phase': phase, 'retained': retained, 'peak': peak}
+                    for phase, retained, peak in self.phases],
+            'top_allocations': [{'location': location, 'retained': size,
+                    'allocations': count}
+                    for location, size, count in self.top_allocations],
+            'objects': dict(self.objects),
+            'icons': self.icons,
+            'pixmaps': self.pixmaps,
+            'pixmap_bytes': self.pixmap_bytes,
+        }
+
+    def report(self, out):
+        """ Write a human readable report to a file object. """
+
+        if self.name:
+            out.write("Memory used by %s\n\n" % self.name)
+
+        for note in self.notes:
+            out.write(note + "\n")
+
+        if self.notes:
+            out.write("\n")
+
+        if self.source is not None:
+            out.write("%-30s %14s %14s\n" % ("Phase", "Retained KiB",
+                    "Peak KiB"))
+
+            order = dict([(phase, nr) for nr, (_, phase) in enumerate(PARSER_PHASES)])
+
+            for phase, retained, peak in sorted(self.phases,
+                    key=lambda p: order.get(p[0], len(order))):
+                out.write("%-30s %14s %14s\n" % (phase, _kib(retained),
+                        _kib(peak)))
+
+            out.write("\n")
+
+        if self.top_allocations:
+            out.write("%-50s %14s %8s\n" % ("Allocated at", "Retained KiB",
+                    "Blocks"))
+
+            for location, size, count in self.top_allocations:
+                if len(location) > 50:
+                    location = '...' + location[-47:]
+
+                out.write("%-50s %14s %8d\n" % (location, _kib(size), count))
+
+            out.write("\n")
+
+        out.write("%-30s %8s\n" % ("Class", "Created"))
+
+        for name, count in sorted(self.objects.items(),
+                key=lambda item: item[1], reverse=True):
+            out.write("%-30s %8d\n" % (name, count))
+
+        out.write("\nIcons: %d, pixmaps: %d, pixmap data: %s KiB\n" % (
+                self.icons, self.pixmaps, _kib(self.pixmap_bytes)))
+
+
+def _kib(nr_bytes):
+    """ Format a number of bytes as KiB. """
+
+    if nr_bytes is None:
+        return "n/a"
+
+    return "%.1f" % (nr_bytes / 1024.0)
+
+
+def main(argv=None):
+    """ Load a number of .ui files, keeping them all alive, and report the
+    memory used by each.  Return the exit status.
+    """
+
+    import optparse
+
+    parser = optparse.OptionParser(
+            usage="python -m PyQt4.uic.memory [options] <ui-file> ...")
+    parser.add_option("--top", dest="top", action="store", type="int",
+            default=10, metavar="N",
+            help="show the N allocation sites that retain the most memory "
+                    "[default: 10]")
+    parser.add_option("--json", dest="json", action="store", type="string",
+            default=None, metavar="FILE",
+            help="write the reports as JSON to FILE")
+    parser.add_option("-q", "--quiet", dest="quiet", action="store_true",
+            default=False, help="only show the summary")
+
+    opts, args = parser.parse_args(argv)
+
+    if not args:
+        parser.error("at least one ui-file must be specified")
+
+    from PyQt4 import QtGui
+    from PyQt4.uic import loadUi
+
+    app = QtGui.QApplication.instance()
+    if app is None:
+        app = QtGui.QApplication(sys.argv[:1])
+
+    reports = []
+    widgets = []
+
+    for ui_file in args:
+        report = MemoryReport(ui_file, opts.top)
+        widgets.append(loadUi(ui_file, memory_report=report))
+        reports.append(report)
+
+        if not opts.quiet:
+            report.report(sys.stdout)
+            sys.stdout.write("\n")
+
+    # Rank the forms by the memory they retain.
+    sys.stdout.write("%-50s %14s %14s %10s\n" % ("Form", "Retained KiB",
+            "Peak KiB", "Pixmap KiB"))
+
+    for report in sorted(reports, key=lambda r: r.retained or 0,
+            reverse=True):
+        sys.stdout.write("%-50s %14s %14s %10s\n" % (report.name,
+                _kib(report.retained), _kib(report.peak),
+                _kib(report.pixmap_bytes)))
+
+    # Explain any figures shown as n/a.
+    notes = []
+    for report in reports:
+        for note in report.notes:
+            if note not in notes:
+                notes.append(note)
+
+    if notes:
+        sys.stdout.write("\n")
+
+        for note in notes:
+            sys.stdout.write(note + "\n")
+
+    if opts.json:
+        f = open(opts.json, 'w')
+
+        try:
+            json.dump([r.as_dict() for r in reports], f, indent=2)
+        finally:
+            f.close()
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -45,13 +45,15 @@ from PyQt4.uic.exceptions import NoSuchWidgetError, WidgetPluginError
 
 if sys.hexversion >= 0x03000000:
     from PyQt4.uic.port_v3.load_plugin import load_plugin
+    from PyQt4.uic.port_v3.string_io import StringIO
 else:
     from PyQt4.uic.port_v2.load_plugin import load_plugin
+    from PyQt4.uic.port_v2.string_io import StringIO
 
 
 # The list of directories that are searched for widget plugins.  This is
-# exposed as part of the API.
-widgetPluginPath = [os.path.join(os.path.dirname(__file__), 'widget-plugins')]
+# exposed as part of the API and is the same list as PyQt4.uic.widgetPluginPath.
+from PyQt4.uic import widgetPluginPath
 
 
 MATCH = True
@@ -60,6 +62,66 @@ MODULE = 0
 CW_FILTER = 1
 
 
+# The name of the index of a zip archive built by bundle.py.
+ARCHIVE_INDEX = 'index.json'
+
+
+def _readArchived(filename):
+    """ Return the contents of a file in the zip archive that this module was
+    imported from, or None if the module wasn't imported from an archive or
+    the file isn't in it.
+    """
+
+    loader = globals().get('__loader__')
+
+    # Only a zipimporter has an archive.
+    if not hasattr(loader, 'archive'):
+        return None
+
+    try:
+        return loader.get_data(filename)
+    except IOError:
+        return None
+
+
+def _pluginFiles(plugindir):
+    """ Return an iterator over the name and open file of each widget plugin
+    in a directory.  The directory may be in the zip archive that this module
+    was imported from, in which case the plugins are those in the archive's
+    index.
+    """
+
+    try:
+        plugins = os.listdir(plugindir)
+    except:
+        plugins = None
+
+    if plugins is not None:
+        for filename in plugins:
+            if filename.endswith('.py'):
+                filename = os.path.join(plugindir, filename)
+                yield filename, open(filename, 'rU')
+
+        return
+
+    index = _readArchived(
+            os.path.join(os.path.dirname(__file__), ARCHIVE_INDEX))
+    if index is None:
+        return
+
+    import json
+
+    for filename in json.loads(index.decode('utf-8'))['widget-plugins']:
+        filename = os.path.join(plugindir, filename)
+
+        source = _readArchived(filename)
+        if source is not None:
+            if sys.hexversion >= 0x03000000:
+                source = source.decode('utf-8')
+
+            yield filename, StringIO(source.replace('\r\n', '\n'))
+
+
 class QObjectCreator(object):
     def __init__(self, creatorPolicy):
         self._cpolicy = creatorPolicy
@@ -69,17 +131,7 @@ class QObjectCreator(object):
 
         # Get the optional plugins.
         for plugindir in widgetPluginPath:
-            try:
-                plugins = os.listdir(plugindir)
-            except:
-                plugins = []
-
-            for filename in plugins:
-                if not filename.endswith('.py'):
-                    continue
-
-                filename = os.path.join(plugindir, filename)
-
+            for filename, plugin in _pluginFiles(plugindir):
                 plugin_globals = {
                     "MODULE": MODULE,
                     "CW_FILTER": CW_FILTER,
@@ -88,7 +140,7 @@ class QObjectCreator(object):
 
                 plugin_locals = {}
 
-                if load_plugin(open(filename, 'rU'), plugin_globals, plugin_locals):
+                if load_plugin(plugin, plugin_globals, plugin_locals):
                     pluginType = plugin_locals["pluginType"]
                     if pluginType == MODULE:
                         modinfo = plugin_locals["moduleInformation"]()
@@ -136,6 +188,9 @@ class QObjectCreator(object):
     def getSlot(self, obj, slotname):
         return self._cpolicy.getSlot(obj, slotname)
 
+    def connectSlotsByName(self, obj):
+        self._cpolicy.connectSlotsByName(obj)
+
     def addCustomWidget(self, widgetClass, baseClass, module):
         for cwFilter in self._cwFilters:
             match, result = cwFilter(widgetClass, baseClass, module)
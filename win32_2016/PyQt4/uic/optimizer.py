@@ -0,0 +1,829 @@
+#############################################################################
+##
+## Copyright (c) 2014 Riverbank Computing Limited <info@riverbankcomputing.com>
+##
+## This file is part of PyQt.
+##
+## This file may be used under the terms of the GNU General Public
+## License versions 2.0 or 3.0 as published by the Free Software
+## Foundation and appearing in the files LICENSE.GPL2 and LICENSE.GPL3
+## included in the packaging of this file.  Alternatively you may (at
+## your option) use any later version of the GNU General Public
+## License if such license has been publicly approved by Riverbank
+## Computing Limited (or its successors, if any) and the KDE Free Qt
+## Foundation. In addition, as a special exception, Riverbank gives you
+## certain additional rights. These rights are described in the Riverbank
+## GPL Exception version 1.1, which can be found in the file
+## GPL_EXCEPTION.txt in this package.
+##
+## If you are unsure which license is appropriate for your use, please
+## contact the sales department at sales@riverbankcomputing.com.
+##
+## This file is provided AS IS with NO WARRANTY OF ANY KIND, INCLUDING THE
+## WARRANTY OF DESIGN, MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE.
+##
+#############################################################################
+
+
+# The optimizer rewrites the XML of a .ui file before it is compiled or
+# loaded so that the form is quicker to create but looks and behaves the same.
+# Each optimization is a separate pass that is only run if it is asked for.
+
+
+import re
+
+
+# The names of the passes in the order in which they are run.
+PASSES = ('properties', 'layouts', 'stylesheets')
+
+# An object name that can be used as an ID selector.
+_IDENTIFIER = re.compile(r'[A-Za-z_][A-Za-z0-9_]*$')
+
+# A word that may be a reference to an object.
+_WORD = re.compile(r'[A-Za-z_][A-Za-z0-9_]*')
+
+# The classes of widgets whose style sheets are not hoisted out of, because
+# they are popups that may not take the style of their parents.
+_POPUP_CLASSES = ('QMenu', )
+
+# The base classes of the standard widgets whose default property values are
+# known.  Custom widgets may have different defaults and are left alone.
+_BASE_CLASSES = {
+    'QFrame': 'QWidget',
+    'QLabel': 'QFrame',
+    'QAbstractButton': 'QWidget',
+    'QPushButton': 'QAbstractButton',
+    'QToolButton': 'QAbstractButton',
+    'QCheckBox': 'QAbstractButton',
+    'QRadioButton': 'QAbstractButton',
+    'QLineEdit': 'QWidget',
+    'QAbstractSpinBox': 'QWidget',
+    'QSpinBox': 'QAbstractSpinBox',
+    'QDoubleSpinBox': 'QAbstractSpinBox',
+    'QComboBox': 'QWidget',
+    'QGroupBox': 'QWidget',
+    'QAbstractSlider': 'QWidget',
+    'QSlider': 'QAbstractSlider',
+    'QScrollBar': 'QAbstractSlider',
+    'QDial': 'QAbstractSlider',
+    'QProgressBar': 'QWidget',
+    'QAbstractScrollArea': 'QFrame',
+    'QScrollArea': 'QAbstractScrollArea',
+    'QAbstractItemView': 'QAbstractScrollArea',
+    'QListView': 'QAbstractItemView',
+    'QListWidget': 'QListView',
+    'QTreeView': 'QAbstractItemView',
+    'QTreeWidget': 'QTreeView',
+    'QTableView': 'QAbstractItemView',
+    'QTableWidget': 'QTableView',
+    'QTextEdit': 'QAbstractScrollArea',
+    'QTextBrowser': 'QTextEdit',
+    'QPlainTextEdit': 'QAbstractScrollArea',
+    'QTabWidget': 'QWidget',
+    'QStackedWidget': 'QFrame',
+    'QToolBox': 'QFrame',
+    'QDialog': 'QWidget',
+    'QMainWindow': 'QWidget',
+    'QDialogButtonBox': 'QWidget',
+}
+
+# The default values of the properties of the standard widgets, as the tag
+# and text of the element that Designer writes, keyed by the class that sets
+# them.  Properties whose defaults depend on the platform, the style or the
+# widget's parent, or that interact with the order in which other properties
+# are set (eg. ranges), are not included.
+_DEFAULTS = {
+    'QWidget': {
+        'enabled': ('bool', 'true'),
+        'autoFillBackground': ('bool', 'false'),
+        'mouseTracking': ('bool', 'false'),
+        'toolTip': ('string', ''),
+        'statusTip': ('string', ''),
+        'whatsThis': ('string', ''),
+        'accessibleName': ('string', ''),
+        'accessibleDescription': ('string', ''),
+        'styleSheet': ('string', ''),
+    },
+    'QFrame': {
+        'lineWidth': ('number', '1'),
+        'midLineWidth': ('number', '0'),
+    },
+    'QLabel': {
+        'text': ('string', ''),
+        'textFormat': ('enum', 'Qt::AutoText'),
+        'scaledContents': ('bool', 'false'),
+        'wordWrap': ('bool', 'false'),
+        'margin': ('number', '0'),
+        'indent': ('number', '-1'),
+        'openExternalLinks': ('bool', 'false'),
+    },
+    'QAbstractButton': {
+        'text': ('string', ''),
+        'checkable': ('bool', 'false'),
+        'checked': ('bool', 'false'),
+        'autoRepeat': ('bool', 'false'),
+        'autoExclusive': ('bool', 'false'),
+    },
+    'QPushButton': {
+        'default': ('bool', 'false'),
+        'flat': ('bool', 'false'),
+    },
+    'QToolButton': {
+        'autoRaise': ('bool', 'false'),
+    },
+    'QCheckBox': {
+        'tristate': ('bool', 'false'),
+    },
+    'QRadioButton': {
+        'autoExclusive': ('bool', 'true'),
+    },
+    'QLineEdit': {
+        'text': ('string', ''),
+        'inputMask': ('string', ''),
+        'maxLength': ('number', '32767'),
+        'frame': ('bool', 'true'),
+        'echoMode': ('enum', 'QLineEdit::Normal'),
+        'readOnly': ('bool', 'false'),
+        'placeholderText': ('string', ''),
+    },
+    'QAbstractSpinBox': {
+        'wrapping': ('bool', 'false'),
+        'frame': ('bool', 'true'),
+        'readOnly': ('bool', 'false'),
+        'specialValueText': ('string', ''),
+        'accelerated': ('bool', 'false'),
+        'keyboardTracking': ('bool', 'true'),
+    },
+    'QSpinBox': {
+        'prefix': ('string', ''),
+        'suffix': ('string', ''),
+    },
+    'QDoubleSpinBox': {
+        'prefix': ('string', ''),
+        'suffix': ('string', ''),
+    },
+    'QComboBox': {
+        'editable': ('bool', 'false'),
+        'maxVisibleItems': ('number', '10'),
+        'duplicatesEnabled': ('bool', 'false'),
+        'frame': ('bool', 'true'),
+    },
+    'QGroupBox': {
+        'title': ('string', ''),
+        'flat': ('bool', 'false'),
+        'checkable': ('bool', 'false'),
+    },
+    'QAbstractSlider': {
+        'tracking': ('bool', 'true'),
+        'invertedAppearance': ('bool', 'false'),
+        'invertedControls': ('bool', 'false'),
+    },
+    'QProgressBar': {
+        'textVisible': ('bool', 'true'),
+        'invertedAppearance': ('bool', 'false'),
+    },
+    'QScrollArea': {
+        'widgetResizable': ('bool', 'false'),
+    },
+    'QAbstractItemView': {
+        'alternatingRowColors': ('bool', 'false'),
+        'dragEnabled': ('bool', 'false'),
+    },
+    'QTreeView': {
+        'uniformRowHeights': ('bool', 'false'),
+    },
+    'QTextEdit': {
+        'readOnly': ('bool', 'false'),
+        'undoRedoEnabled': ('bool', 'true'),
+        'tabChangesFocus': ('bool', 'false'),
+        'acceptRichText': ('bool', 'true'),
+    },
+    'QTextBrowser': {
+        'readOnly': ('bool', 'true'),
+        'undoRedoEnabled': ('bool', 'false'),
+        'openExternalLinks': ('bool', 'false'),
+        'openLinks': ('bool', 'true'),
+    },
+    'QPlainTextEdit': {
+        'readOnly': ('bool', 'false'),
+        'undoRedoEnabled': ('bool', 'true'),
+        'tabChangesFocus': ('bool', 'false'),
+    },
+    'QTabWidget': {
+        'tabsClosable': ('bool', 'false'),
+        'movable': ('bool', 'false'),
+        'documentMode': ('bool', 'false'),
+    },
+    'QDialog': {
+        'sizeGripEnabled': ('bool', 'false'),
+        'modal': ('bool', 'false'),
+    },
+    'QMainWindow': {
+        'animated': ('bool', 'true'),
+        'documentMode': ('bool', 'false'),
+        'dockNestingEnabled': ('bool', 'false'),
+    },
+    'QDialogButtonBox': {
+        'centerButtons': ('bool', 'false'),
+    },
+}
+
+# The tags of the property values whose text may be stripped.
+_STRIPPED_TAGS = ('number', 'bool', 'enum')
+
+
+# The names that Designer gives to layouts.  The parser names unnamed ones
+# after their class.
+_LAYOUT_NAME = re.compile(
+        r'((vertical|horizontal|grid|form)Layout(_\d+)?|[vh]boxlayout|gridlayout|formlayout)$')
+
+# The properties that set the margins and spacing of a layout.
+_MARGINS = ('margin', 'leftMargin', 'topMargin', 'rightMargin', 'bottomMargin')
+_SPACINGS = ('spacing', 'horizontalSpacing', 'verticalSpacing')
+
+# The element attribute that tells the parser not to set an object's name.
+NO_OBJECT_NAME = 'pyuicNoObjectName'
+
+
+def passNames(names):
+    """ Return a tuple of pass names from either a comma separated string or a
+    sequence of names.  ValueError is raised if a name is unknown.
+    """
+
+    if hasattr(names, 'split'):
+        names = names.split(',')
+
+    names = tuple([name.strip() for name in names if name.strip()])
+
+    for name in names:
+        if name not in PASSES:
+            raise ValueError("unknown optimization '%s'" % name)
+
+    return names
+
+
+class _Widget(object):
+    """ A widget element and its place in the widget tree. """
+
+    def __init__(self, elem, parent, managed=False):
+        self.elem = elem
+        self.parent = parent
+        self.managed = managed
+        self.depth = 0 if parent is None else parent.depth + 1
+        self.name = elem.get('name')
+        self.stylesheet = None
+
+        for prop in elem.findall('property'):
+            if prop.get('name') == 'styleSheet':
+                self.stylesheet = prop
+                break
+
+    def styleSheetText(self):
+        """ Return the non-empty text of the widget's style sheet or None. """
+
+        if self.stylesheet is None:
+            return None
+
+        string = self.stylesheet.find('string')
+        if string is None or not string.text or not string.text.strip():
+            return None
+
+        return string.text
+
+    def ancestors(self):
+        """ Return an iterator over the widget's ancestors, nearest first. """
+
+        widget = self.parent
+
+        while widget is not None:
+            yield widget
+            widget = widget.parent
+
+
+def _classDefaults(classname):
+    """ Return the default property values of a standard widget class or None
+    if it isn't a standard widget.
+    """
+
+    if classname != 'QWidget' and classname not in _BASE_CLASSES:
+        return None
+
+    hierarchy = []
+    while classname is not None:
+        hierarchy.insert(0, classname)
+        classname = _BASE_CLASSES.get(classname)
+
+    defaults = {}
+    for classname in hierarchy:
+        defaults.update(_DEFAULTS.get(classname, {}))
+
+    return defaults
+
+
+def _propertyValue(prop):
+    """ Return the tag and text of the value of a property, or None if it isn't
+    a simple value.  Only the text of values that Qt Designer may write with
+    surrounding whitespace is stripped as it is significant in a string.
+    """
+
+    if len(prop) != 1:
+        return None
+
+    value = prop[0]
+
+    if len(value) != 0:
+        return None
+
+    text = value.text or ''
+
+    if value.tag in _STRIPPED_TAGS:
+        text = text.strip()
+
+    return (value.tag, text)
+
+
+def _widgetTree(root):
+    """ Return the list of widgets of a form with the top-level widget first.
+    """
+
+    widgets = []
+
+    def walk(elem, parent, in_layout=False):
+        for child in elem:
+            if child.tag == 'widget':
+                # A widget in a layout item has its geometry managed.
+                widget = _Widget(child, parent, in_layout and elem.tag == 'item')
+                widgets.append(widget)
+                walk(child, widget)
+            elif child.tag == 'layout':
+                walk(child, parent, True)
+            elif child.tag == 'item':
+                walk(child, parent, in_layout)
+
+    walk(root, None)
+
+    return widgets
+
+
+def _objectNames(root):
+    """ Return a tuple of the set of object names that can safely be used as
+    selectors and the set of names that are duplicated.  The parser makes
+    duplicated names unique by appending a number to them.
+    """
+
+    counts = {}
+
+    for elem in root.iter():
+        if elem.tag in ('widget', 'layout', 'action', 'actiongroup'):
+            name = elem.get('name') or elem.get('class', '')[1:].lower()
+            counts[name] = counts.get(name, 0) + 1
+
+    duplicates = set([name for name, count in counts.items() if count > 1])
+    unique = set()
+
+    for name, count in counts.items():
+        if count != 1 or not _IDENTIFIER.match(name):
+            continue
+
+        if name.rstrip('0123456789') in duplicates:
+            continue
+
+        unique.add(name)
+
+    return unique
+
+
+def _layoutName(layout):
+    """ Return the name of a layout element as it will be named by the parser.
+    """
+
+    return layout.get('name') or layout.get('class', '')[1:].lower()
+
+
+def _hasZeroMargins(layout):
+    """ Return True if a layout element has no margins and only margin and
+    spacing properties.
+    """
+
+    for prop in layout.findall('property'):
+        name = prop.get('name')
+
+        if name in _MARGINS:
+            if _propertyValue(prop) != ('number', '0'):
+                return False
+        elif name not in _SPACINGS:
+            return False
+
+    return True
+
+
+def _hasSpacing(layout):
+    """ Return True if a layout element sets its own spacing. """
+
+    names = set([prop.get('name') for prop in layout.findall('property')])
+
+    if 'spacing' in names:
+        return True
+
+    if layout.get('class') in ('QHBoxLayout', 'QVBoxLayout'):
+        return False
+
+    return 'horizontalSpacing' in names and 'verticalSpacing' in names
+
+
+def _references(root):
+    """ Return the set of identifiers that appear anywhere in a form other than
+    as the name of an object.
+    """
+
+    references = set()
+
+    for elem in root.iter():
+        if elem.text:
+            references.update(_WORD.findall(elem.text))
+
+        for attr, value in elem.attrib.items():
+            if attr != 'name' or elem.tag not in ('widget', 'layout', 'action', 'actiongroup'):
+                references.update(_WORD.findall(value))
+
+    return references
+
+
+class Optimizer(object):
+    """ Apply a number of optimization passes to the XML of a .ui file. """
+
+    def __init__(self, passes=PASSES, flatten=()):
+        """ Initialise the optimizer.  passes is a sequence of the names of
+        the passes to run or a comma separated string of them.  flatten is a
+        sequence of the names of the widgets and layouts that the layouts pass
+        may remove, or a comma separated string of them.  The form will not
+        have an attribute for a removed object so only those that no code
+        uses should be named.
+        """
+
+        if hasattr(flatten, 'split'):
+            flatten = flatten.split(',')
+
+        self.passes = passNames(passes)
+        self.flatten = frozenset([name.strip() for name in flatten
+                if name.strip()])
+        self.changes = []
+
+    def optimize(self, root):
+        """ Optimize the root element of a .ui file in place. """
+
+        for name in PASSES:
+            if name in self.passes:
+                getattr(self, '_' + name)(root)
+
+    def note(self, message):
+        """ Record a change made by a pass. """
+
+        self.changes.append(message)
+
+    def report(self, out):
+        """ Write the changes made by the passes to a file object. """
+
+        for message in self.changes:
+            out.write(message + "\n")
+
+    def _properties(self, root):
+        """ Remove the properties that have no effect: the geometry of widgets
+        managed by a layout and the properties of standard widgets that are
+        set to their default values.  The object names that Designer gives to
+        layouts are not set if nothing in the form refers to them.  The names
+        of widgets are always set as code outside the form may use them, eg.
+        to connect slots by name.
+        """
+
+        for widget in _widgetTree(root):
+            defaults = _classDefaults(widget.elem.get('class'))
+
+            for prop in widget.elem.findall('property'):
+                name = prop.get('name')
+
+                # Dynamic properties have no defaults.
+                if prop.get('stdset', '1') == '0':
+                    continue
+
+                if name == 'geometry' and widget.managed:
+                    reason = "it is managed by a layout"
+                elif defaults is not None and name in defaults and defaults[name] == _propertyValue(prop):
+                    reason = "it is the default"
+                else:
+                    continue
+
+                widget.elem.remove(prop)
+
+                if prop is widget.stylesheet:
+                    widget.stylesheet = None
+
+                self.note("properties: removed %s of %s as %s" % (name,
+                        widget.name, reason))
+
+        references = _references(root)
+
+        for layout in root.iter('layout'):
+            name = _layoutName(layout)
+
+            if _LAYOUT_NAME.match(name) and name not in references:
+                layout.set(NO_OBJECT_NAME, 'true')
+
+                self.note("properties: removed the object name of %s" % name)
+
+    def _layouts(self, root):
+        """ Remove the levels of layout that make no difference to the
+        geometry of the widgets.  A widget in a layout that holds nothing but
+        a layout without margins is replaced by the layout.  A box layout in a
+        layout that holds a single item is replaced by the item.  Only the
+        objects named in flatten are removed, and only if nothing in the form
+        refers to them.  The others that could be are noted.
+        """
+
+        references = _references(root)
+        suggested = set()
+
+        changed = True
+        while changed:
+            changed = False
+
+            parents = {}
+            for elem in root.iter():
+                for child in elem:
+                    parents[child] = elem
+
+            for item in list(root.iter('item')):
+                if len(item) != 1 or parents.get(item) is None or parents[item].tag != 'layout':
+                    continue
+
+                child = item[0]
+
+                if child.tag == 'widget':
+                    name = child.get('name')
+                    replacement = self._wrappedLayout(child, item, parents,
+                            references)
+                    if replacement is None:
+                        continue
+
+                    action = "wrapped %s" % _layoutName(replacement)
+                elif child.tag == 'layout':
+                    name = _layoutName(child)
+                    replacement = self._singleItem(child, item, references)
+                    if replacement is None:
+                        continue
+
+                    action = "held %s" % replacement.get('name',
+                            replacement.tag)
+                else:
+                    continue
+
+                if name not in self.flatten:
+                    if name not in suggested:
+                        suggested.add(name)
+                        self.note("layouts: %s that %s could be flattened" % (
+                                name, action))
+
+                    continue
+
+                self.note("layouts: removed %s that %s" % (name, action))
+
+                item.remove(child)
+                item.append(replacement)
+                changed = True
+
+    @staticmethod
+    def _wrappedLayout(widget, item, parents, references):
+        """ Return the layout that can replace a widget in a layout item or
+        None if the widget is needed.
+        """
+
+        name = widget.get('name')
+
+        if widget.get('class') != 'QWidget' or name in references:
+            return None
+
+        layouts = widget.findall('layout')
+        if len(layouts) != 1:
+            return None
+
+        layout = layouts[0]
+
+        # The geometry of a widget in a layout is ignored.
+        for child in widget:
+            if child is layout:
+                continue
+
+            if child.tag != 'property' or child.get('name') != 'geometry':
+                return None
+
+        # The parser gives the layout of a widget like this no margins unless
+        # they are set, and a nested layout has none by default.
+        if not _hasZeroMargins(layout):
+            return None
+
+        # A nested layout without its own spacing takes the spacing of the
+        # layouts it is nested in rather than the style's default.
+        if len(layout.findall('item')) > 1 and not _hasSpacing(layout):
+            outer = parents[item]
+
+            while True:
+                if [p for p in outer.findall('property') if p.get('name') in _SPACINGS]:
+                    return None
+
+                outer_item = parents.get(outer)
+                if outer_item is None or outer_item.tag != 'item':
+                    break
+
+                outer = parents[outer_item]
+
+        return layout
+
+    @staticmethod
+    def _singleItem(layout, item, references):
+        """ Return the element of the single item of a box layout that can
+        replace the layout in a layout item or None if the layout is needed.
+        """
+
+        if layout.get('class') not in ('QHBoxLayout', 'QVBoxLayout'):
+            return None
+
+        if _layoutName(layout) in references:
+            return None
+
+        if layout.get('stretch', '0') != '0' or not _hasZeroMargins(layout):
+            return None
+
+        items = [child for child in layout if child.tag != 'property']
+        if len(items) != 1 or items[0].tag != 'item' or len(items[0]) != 1:
+            return None
+
+        # An alignment gives an item its size hint rather than the space the
+        # layout is given, so both items must fill their space.
+        if item.get('alignment') is not None or items[0].get('alignment') is not None:
+            return None
+
+        return items[0][0]
+
+    def _stylesheets(self, root):
+        """ Hoist identical style sheets set on a number of widgets to their
+        nearest common ancestor.  A style sheet without any selectors applies
+        to its widget and the widget's children, and takes precedence over
+        the style sheets of the widget's ancestors.  It is therefore only
+        hoisted if it has no selectors and the ancestor and the widgets in
+        between have no style sheet of their own.  It is then applied using
+        ID selectors for the widget and its children.  Note that application
+        code that replaces the style sheet of the ancestor will also remove
+        the hoisted ones.
+        """
+
+        widgets = _widgetTree(root)
+        names = _objectNames(root)
+
+        groups = {}
+
+        for widget in widgets:
+            text = widget.styleSheetText()
+            if text is None or '{' in text:
+                continue
+
+            if widget.stylesheet.find('string').get('notr') != 'true':
+                continue
+
+            if widget.parent is None or widget.name not in names:
+                continue
+
+            groups.setdefault(text.strip(), []).append(widget)
+
+        hoisted = {}
+
+        for text, members in groups.items():
+            # The widgets that can't be hoisted to the common ancestor of all
+            # of them may be able to be hoisted to a nearer one.
+            pending = [members]
+
+            while pending:
+                members = pending.pop()
+                if len(members) < 2:
+                    continue
+
+                ancestor = self._commonAncestor(members)
+                if ancestor is None:
+                    continue
+
+                valid = [w for w in members if self._canHoist(w, ancestor)]
+
+                if len(valid) == len(members):
+                    hoisted.setdefault(ancestor, []).append((text, members))
+                elif valid:
+                    pending.append(valid)
+                    pending.append([w for w in members if w not in valid])
+
+        for ancestor, rules in sorted(hoisted.items(),
+                key=lambda item: (item[0].depth, item[0].name)):
+            # Sort the rules so that the sheet is the same for every run.
+            rules.sort(key=lambda rule: [w.name for w in rule[1]])
+
+            sheet = []
+
+            for text, members in rules:
+                selectors = []
+
+                for widget in members:
+                    selectors.append('#%s' % widget.name)
+                    selectors.append('#%s *' % widget.name)
+
+                    widget.elem.remove(widget.stylesheet)
+
+                sheet.append('%s { %s }' % (', '.join(selectors), text))
+
+            self._setStyleSheet(ancestor, '\n'.join(sheet))
+
+            self.note("stylesheets: hoisted %d style sheets to %s" % (
+                    sum([len(members) for _, members in rules]),
+                    ancestor.name))
+
+    @staticmethod
+    def _commonAncestor(widgets):
+        """ Return the nearest common ancestor of a number of widgets or None
+        if they don't have one.
+        """
+
+        common = None
+
+        for widget in widgets:
+            chain = list(widget.ancestors())
+
+            if common is None:
+                common = chain
+            else:
+                common = [a for a in chain if a in common]
+
+        if not common:
+            return None
+
+        return common[0]
+
+    @staticmethod
+    def _canHoist(widget, ancestor):
+        """ Return True if a widget's style sheet can be hoisted to an
+        ancestor.
+        """
+
+        if widget.elem.get('class') in _POPUP_CLASSES:
+            return False
+
+        for a in widget.ancestors():
+            if a.styleSheetText() is not None:
+                return False
+
+            if a.elem.get('class') in _POPUP_CLASSES:
+                return False
+
+            if a is ancestor:
+                return a.name is not None
+
+        return False
+
+    @staticmethod
+    def _setStyleSheet(widget, sheet):
+        """ Set the style sheet of a widget element, replacing any empty one.
+        """
+
+        from PyQt4.uic.uiparser import SubElement
+
+        if widget.stylesheet is None:
+            # Put the property after any others so that it is set before any
+            # children are created.
+            position = 0
+            for index, child in enumerate(widget.elem):
+                if child.tag in ('class', 'property'):
+                    position = index + 1
+
+            prop = SubElement(widget.elem, 'property', name='styleSheet')
+            widget.elem.remove(prop)
+            widget.elem.insert(position, prop)
+            widget.stylesheet = prop
+        else:
+            prop = widget.stylesheet
+
+            for child in list(prop):
+                prop.remove(child)
+
+        string = SubElement(prop, 'string', notr='true')
+        string.text = sheet
+
+
+def optimizerFor(optimize):
+    """ Return the optimizer to use given the optimize argument of compileUi()
+    and loadUi(), ie. None, a sequence of pass names, a comma separated string
+    of them or an Optimizer instance.  None is returned if no passes are to be
+    run.
+    """
+
+    if not optimize:
+        return None
+
+    if isinstance(optimize, Optimizer):
+        return optimize
+
+    return Optimizer(optimize)
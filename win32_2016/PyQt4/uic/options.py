@@ -0,0 +1,126 @@
+#############################################################################
+##
+## Copyright (c) 2014 Riverbank Computing Limited <info@riverbankcomputing.com>
+##
+## This file is part of PyQt.
+##
+## This file may be used under the terms of the GNU General Public
+## License versions 2.0 or 3.0 as published by the Free Software
+## Foundation and appearing in the files LICENSE.GPL2 and LICENSE.GPL3
+## included in the packaging of this file.  Alternatively you may (at
+## your option) use any later version of the GNU General Public
+## License if such license has been publicly approved by Riverbank
+## Computing Limited (or its successors, if any) and the KDE Free Qt
+## Foundation. In addition, as a special exception, Riverbank gives you
+## certain additional rights. These rights are described in the Riverbank
+## GPL Exception version 1.1, which can be found in the file
+## GPL_EXCEPTION.txt in this package.
+##
+## If you are unsure which license is appropriate for your use, please
+## contact the sales department at sales@riverbankcomputing.com.
+##
+## This file is provided AS IS with NO WARRANTY OF ANY KIND, INCLUDING THE
+## WARRANTY OF DESIGN, MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE.
+##
+#############################################################################
+
+
+import optparse
+
+from PyQt4.uic.optimizer import PASSES, passNames
+
+
+def version():
+    """ Return the version string of pyuic4. """
+
+    from PyQt4.uic.pyqtversion import versions
+
+    return "Python User Interface Compiler %s for Qt version %s" % versions()
+
+
+def _optimize_callback(option, opt_str, value, parser):
+    """ Convert the value of --optimize to a tuple of pass names. """
+
+    try:
+        parser.values.optimize = passNames(value)
+    except ValueError as e:
+        raise optparse.OptionValueError("%s: %s" % (opt_str, e))
+
+
+def create_parser(usage="pyuic4 [options] <ui-file>", version=None):
+    """ Create the command line parser shared by pyuic4 and its client.  usage
+    is the usage string.  version is the optional version string.
+    """
+
+    parser = optparse.OptionParser(usage=usage, version=version)
+    parser.add_option("-p", "--preview", dest="preview", action="store_true",
+            default=False,
+            help="show a preview of the UI instead of generating code")
+    parser.add_option("-o", "--output", dest="output", default="-",
+            metavar="FILE",
+            help="write generated code to FILE instead of stdout")
+    parser.add_option("-x", "--execute", dest="execute", action="store_true",
+            default=False,
+            help="generate extra code to test and display the class")
+    parser.add_option("-d", "--debug", dest="debug", action="store_true",
+            default=False, help="show debug output")
+    parser.add_option("-i", "--indent", dest="indent", action="store",
+            type="int", default=4, metavar="N",
+            help="set indent width to N spaces, tab if N is 0 [default: 4]")
+    parser.add_option("-w", "--pyqt3-wrapper", dest="pyqt3_wrapper",
+            action="store_true", default=False,
+            help="generate a PyQt v3 style wrapper")
+
+    g = optparse.OptionGroup(parser, title="Code generation options")
+    g.add_option("--from-imports", dest="from_imports", action="store_true",
+            default=False, help="generate imports relative to '.'")
+    g.add_option("--resource-suffix", dest="resource_suffix", action="store",
+            type="string", default="_rc", metavar="SUFFIX",
+            help="append SUFFIX to the basename of resource files [default: _rc]")
+    g.add_option("--runtime", dest="runtime", action="store_true",
+            default=False,
+            help="import the helpers used by the generated code from "
+                    "PyQt4.uic.runtime")
+    g.add_option("--defer-resources", dest="defer_resources",
+            action="store_true", default=False,
+            help="import resource modules when the form is first set up "
+                    "rather than when the generated module is imported")
+    g.add_option("--optimize", dest="optimize", action="callback",
+            type="string", default=(), metavar="PASSES",
+            callback=_optimize_callback,
+            help="apply the comma separated optimization PASSES (%s) to the "
+                    "ui-file" % ", ".join(PASSES))
+    g.add_option("--optimize-flatten", dest="optimize_flatten",
+            action="store", type="string", default="", metavar="NAMES",
+            help="allow the layouts optimization to remove the comma "
+                    "separated widgets and layouts NAMES, the form then has "
+                    "no attributes for them")
+    g.add_option("--optimize-report", dest="optimize_report",
+            action="store_true", default=False,
+            help="write the changes made by the optimization passes to "
+                    "stderr, or with each compilation when watching")
+    g.add_option("--batch", dest="batch", action="store_true", default=False,
+            help="suspend updates and layout activation until the form has "
+                    "been created")
+    parser.add_option_group(g)
+
+    g = optparse.OptionGroup(parser, title="Profiling options")
+    g.add_option("--profile", dest="profile", action="store_true",
+            default=False,
+            help="write the time taken by each phase, class and property "
+                    "type to stderr")
+    g.add_option("--profile-trace", dest="profile_trace", action="store",
+            type="string", default=None, metavar="FILE",
+            help="write a Chrome trace event file of the profile to FILE")
+    parser.add_option_group(g)
+
+    g = optparse.OptionGroup(parser, title="Compile server options")
+    g.add_option("--address", dest="address", action="store", type="string",
+            default=None, metavar="ADDRESS",
+            help="use ADDRESS (a named pipe, a socket file name or host:port) "
+                    "for the compile server, host:port also needs "
+                    "$PYUIC4_SERVER_AUTHKEY [default: $PYUIC4_SERVER or a "
+                    "per-user address]")
+    parser.add_option_group(g)
+
+    return parser
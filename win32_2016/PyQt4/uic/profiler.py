@@ -0,0 +1,236 @@
+#############################################################################
+##
+## Copyright (c) 2014 Riverbank Computing Limited <info@riverbankcomputing.com>
+##
+## This file is part of PyQt.
+##
+## This file may be used under the terms of the GNU General Public
+## License versions 2.0 or 3.0 as published by the Free Software
+## Foundation and appearing in the files LICENSE.GPL2 and LICENSE.GPL3
+## included in the packaging of this file.  Alternatively you may (at
+## your option) use any later version of the GNU General Public
+## License if such license has been publicly approved by Riverbank
+## Computing Limited (or its successors, if any) and the KDE Free Qt
+## Foundation. In addition, as a special exception, Riverbank gives you
+## certain additional rights. These rights are described in the Riverbank
+## GPL Exception version 1.1, which can be found in the file
+## GPL_EXCEPTION.txt in this package.
+##
+## If you are unsure which license is appropriate for your use, please
+## contact the sales department at sales@riverbankcomputing.com.
+##
+## This file is provided AS IS with NO WARRANTY OF ANY KIND, INCLUDING THE
+## WARRANTY OF DESIGN, MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE.
+##
+#############################################################################
+
+
+import json
+import os
+import threading
+from timeit import default_timer
+
+
+# The parser methods that are instrumented as phases and the names of the
+# phases.  parse() is followed by the handlers of the branches of a .ui file
+# and then by the steps that complete the widget tree.
+PARSER_PHASES = (
+    ('parse', 'parse'),
+    ('optimize', 'optimize'),
+    ('readDefaults', 'layoutdefault'),
+    ('classname', 'class'),
+    ('buttonGroups', 'buttongroups'),
+    ('customWidgets', 'customwidgets'),
+    ('createUserInterface', 'widget'),
+    ('createConnections', 'connections'),
+    ('setTaborder', 'tabstops'),
+    ('readResources', 'resources'),
+    ('addActions', 'addActions'),
+    ('setBuddies', 'setBuddies'),
+    ('setDelayedProps', 'setDelayedProps'),
+    ('finalize', 'finalize'),
+)
+
+
+class Profiler(object):
+    """ Record where the time goes when a .ui file is compiled or loaded.  The
+    wall time of each phase of the parser, the number of objects created and
+    the time taken to create them (by class), and the time taken to convert
+    property values (by type) are recorded.  The same profiler may be used for
+    several .ui files in which case the results are accumulated.  A profiler
+    must not be shared between threads.
+    """
+
+    def __init__(self):
+        """ Initialise the profiler. """
+
+        # Each of these maps a name to a list of the number of calls, the
+        # total time and the time excluding any nested calls that are also
+        # recorded.
+        self.phases = {}
+        self.classes = {}
+        self.instantiations = {}
+        self.properties = {}
+
+        self._events = []
+        self._nested = []
+        self._origin = default_timer()
+
+    def instrument(self, parser):
+        """ Instrument a parser, ie. a UICompiler or a DynamicUILoader, so that
+        its activity is recorded.  The parser is returned.
+        """
+
+        for attr, phase in PARSER_PHASES:
+            method = getattr(parser, attr, None)
+            if method is not None:
+                setattr(parser, attr,
+                        self._wrap(method, 'phase', self.phases, phase))
+
+        factory = parser.factory
+        factory.createQObject = self._wrap(factory.createQObject, 'create',
+                self.classes, _classname)
+
+        policy = factory._cpolicy
+        policy.instantiate = self._wrap(policy.instantiate, 'instantiate',
+                self.instantiations, _type_name)
+
+        wprops = parser.wprops
+        wprops.convert = self._wrap(wprops.convert, 'property',
+                self.properties, _property_type)
+
+        return parser
+
+    def _wrap(self, func, category, stats, key):
+        """ Return a wrapper around a callable that records each call.  key is
+        either the name to record the call against or a callable that returns
+        the name given the call's arguments.
+        """
+
+        nested = self._nested
+        events = self._events
+
+        def wrapper(*args, **kwargs):
+            name = key(args) if callable(key) else key
+
+            nested.append(0.0)
+            start = default_timer()
+
+            try:
+                return func(*args, **kwargs)
+            finally:
+                elapsed = default_timer() - start
+                exclusive = elapsed - nested.pop()
+
+                if nested:
+                    nested[-1] += elapsed
+
+                entry = stats.get(name)
+                if entry is None:
+                    stats[name] = [1, elapsed, exclusive]
+                else:
+                    entry[0] += 1
+                    entry[1] += elapsed
+                    entry[2] += exclusive
+
+                events.append((category, name, start, elapsed,
+                        threading.current_thread().ident))
+
+        return wrapper
+
+    def stats(self):
+        """ Return the recorded statistics as a dict that can be serialised as
+        JSON.  Times are in seconds.
+        """
+
+        stats = {}
+
+        for name in ('phases', 'classes', 'instantiations', 'properties'):
+            stats[name] = dict([(k, {'calls': v[0], 'total': v[1], 'self': v[2]})
+                    for k, v in getattr(self, name).items()])
+
+        return stats
+
+    def report(self, out):
+        """ Write a human readable report of the recorded statistics to a file
+        object.
+        """
+
+        out.write("%-30s %8s %12s %12s\n" % ("Phase", "Calls", "Total ms",
+                "Self ms"))
+
+        for _, phase in PARSER_PHASES:
+            entry = self.phases.get(phase)
+            if entry is not None:
+                out.write("%-30s %8d %12.3f %12.3f\n" % (phase, entry[0],
+                        entry[1] * 1000, entry[2] * 1000))
+
+        out.write("\n%-30s %8s %12s %12s\n" % ("Class", "Created", "Total ms",
+                "Ctor ms"))
+
+        for name, entry in _by_total(self.classes):
+            inst = self.instantiations.get(name)
+            inst_ms = inst[1] * 1000 if inst is not None else 0.0
+
+            out.write("%-30s %8d %12.3f %12.3f\n" % (name, entry[0],
+                    entry[1] * 1000, inst_ms))
+
+        out.write("\n%-30s %8s %12s %12s\n" % ("Property type", "Converted",
+                "Total ms", "Self ms"))
+
+        for name, entry in _by_total(self.properties):
+            out.write("%-30s %8d %12.3f %12.3f\n" % (name, entry[0],
+                    entry[1] * 1000, entry[2] * 1000))
+
+    def trace_events(self):
+        """ Return the recorded calls as a list of Chrome trace events. """
+
+        pid = os.getpid()
+        origin = self._origin
+
+        return [{'name': name, 'cat': category, 'ph': 'X',
+                'ts': (start - origin) * 1000000,
+                'dur': elapsed * 1000000, 'pid': pid, 'tid': tid}
+                for category, name, start, elapsed, tid in self._events]
+
+    def write_trace(self, trace_file):
+        """ Write the recorded calls in the Chrome trace event format (as
+        understood by chrome://tracing) to a file name or file object.
+        """
+
+        trace = {'traceEvents': self.trace_events(),
+                'displayTimeUnit': 'ms'}
+
+        if hasattr(trace_file, 'write'):
+            json.dump(trace, trace_file)
+        else:
+            f = open(trace_file, 'w')
+
+            try:
+                json.dump(trace, f)
+            finally:
+                f.close()
+
+
+def _by_total(stats):
+    """ Return the items of some statistics sorted by decreasing total time. """
+
+    return sorted(stats.items(), key=lambda item: item[1][1], reverse=True)
+
+
+def _classname(args):
+    """ Return the name of the class passed to createQObject(). """
+
+    return args[0]
+
+
+def _type_name(args):
+    """ Return the name of the type passed to instantiate(). """
+
+    return getattr(args[0], '__name__', None) or str(args[0])
+
+
+def _property_type(args):
+    """ Return the type of the property passed to convert(). """
+
+    return args[0][0].tag
@@ -54,9 +54,6 @@ else:
 logger = logging.getLogger(__name__)
 DEBUG = logger.debug
 
-QtCore = None
-QtGui = None
-
 
 def int_list(prop):
     return [int(child.text) for child in prop]
@@ -66,9 +63,6 @@ def float_list(prop):
 
 bool_ = lambda v: v == "true"
 
-def qfont_enum(v):
-    return getattr(QtGui.QFont, v)
-
 def needsWidget(func):
     func.needsWidget = True
     return func
@@ -76,9 +70,8 @@ def needsWidget(func):
 
 class Properties(object):
     def __init__(self, factory, QtCore_mod, QtGui_mod):
-        global QtGui, QtCore
-        QtGui = QtGui_mod
-        QtCore = QtCore_mod
+        self.QtGui = QtGui_mod
+        self.QtCore = QtCore_mod
         self.factory = factory
 
         self._base_dir = ''
@@ -94,7 +87,7 @@ class Properties(object):
     def reset(self):
         self.buddies = []
         self.delayed_props = []
-        self.icon_cache = IconCache(self.factory, QtGui)
+        self.icon_cache = IconCache(self.factory, self.QtGui)
 
     def _pyEnumMember(self, cpp_name):
         try:
@@ -104,7 +97,7 @@ class Properties(object):
             membername = cpp_name
 
         if prefix == "Qt":
-            return getattr(QtCore.Qt, membername)
+            return getattr(self.QtCore.Qt, membername)
 
         scope = self.factory.findQObjectType(prefix)
         if scope is None:
@@ -147,15 +140,16 @@ class Properties(object):
         if prop.get('notr', notr) == 'true':
             return text
 
-        disambig = prop.get('comment')
+        return self._translate(text, prop.get('comment'))
 
+    def _translate(self, text, disambig):
         # Allow for Qt5 without deprecated features.
         try:
-            encoding = QtGui.QApplication.UnicodeUTF8
-            translated = QtGui.QApplication.translate(self.uiname, text,
+            encoding = self.QtGui.QApplication.UnicodeUTF8
+            translated = self.QtGui.QApplication.translate(self.uiname, text,
                     disambig, encoding)
         except AttributeError:
-            translated = QtGui.QApplication.translate(self.uiname, text,
+            translated = self.QtGui.QApplication.translate(self.uiname, text,
                     disambig)
 
         return translated
@@ -174,25 +168,25 @@ class Properties(object):
         if alpha != 255:
             args.append(alpha)
 
-        return QtGui.QColor(*args)
+        return self.QtGui.QColor(*args)
 
     def _point(self, prop):
-        return QtCore.QPoint(*int_list(prop))
+        return self.QtCore.QPoint(*int_list(prop))
 
     def _pointf(self, prop):
-        return QtCore.QPointF(*float_list(prop))
+        return self.QtCore.QPointF(*float_list(prop))
 
     def _rect(self, prop):
-        return QtCore.QRect(*int_list(prop))
+        return self.QtCore.QRect(*int_list(prop))
 
     def _rectf(self, prop):
-        return QtCore.QRectF(*float_list(prop))
+        return self.QtCore.QRectF(*float_list(prop))
 
     def _size(self, prop):
-        return QtCore.QSize(*int_list(prop))
+        return self.QtCore.QSize(*int_list(prop))
 
     def _sizef(self, prop):
-        return QtCore.QSizeF(*float_list(prop))
+        return self.QtCore.QSizeF(*float_list(prop))
 
     def _pixmap(self, prop):
         if prop.text:
@@ -200,7 +194,7 @@ class Properties(object):
             if self._base_dir != '' and fname[0] != ':' and not os.path.isabs(fname):
                 fname = os.path.join(self._base_dir, fname)
 
-            return QtGui.QPixmap(fname)
+            return self.QtGui.QPixmap(fname)
 
         # Don't bother to set the property if the pixmap is empty.
         return None
@@ -209,22 +203,22 @@ class Properties(object):
         return self.icon_cache.get_icon(prop)
 
     def _url(self, prop):
-        return QtCore.QUrl(prop[0].text)
+        return self.QtCore.QUrl(prop[0].text)
 
     def _locale(self, prop):
-        lang = getattr(QtCore.QLocale, prop.attrib['language'])
-        country = getattr(QtCore.QLocale, prop.attrib['country'])
-        return QtCore.QLocale(lang, country)
+        lang = getattr(self.QtCore.QLocale, prop.attrib['language'])
+        country = getattr(self.QtCore.QLocale, prop.attrib['country'])
+        return self.QtCore.QLocale(lang, country)
 
     def _date(self, prop):
-        return QtCore.QDate(*int_list(prop))
+        return self.QtCore.QDate(*int_list(prop))
 
     def _datetime(self, prop):
         args = int_list(prop)
-        return QtCore.QDateTime(QtCore.QDate(*args[-3:]), QtCore.QTime(*args[:-3]))
+        return self.QtCore.QDateTime(self.QtCore.QDate(*args[-3:]), self.QtCore.QTime(*args[:-3]))
 
     def _time(self, prop):
-        return QtCore.QTime(*int_list(prop))
+        return self.QtCore.QTime(*int_list(prop))
 
     def _gradient(self, prop):
         name = 'gradient'
@@ -263,11 +257,11 @@ class Properties(object):
         # Set the common values.
         spread = prop.get('spread')
         if spread:
-            gradient.setSpread(getattr(QtGui.QGradient, spread))
+            gradient.setSpread(getattr(self.QtGui.QGradient, spread))
 
         cmode = prop.get('coordinatemode')
         if cmode:
-            gradient.setCoordinateMode(getattr(QtGui.QGradient, cmode))
+            gradient.setCoordinateMode(getattr(self.QtGui.QGradient, cmode))
 
         # Get the gradient stops.
         for gstop in prop:
@@ -279,22 +273,22 @@ class Properties(object):
 
             gradient.setColorAt(position, color)
 
-        return name
+        return gradient
 
     def _palette(self, prop):
         palette = self.factory.createQObject("QPalette", "palette", (),
                 is_attribute=False)
 
         for palette_elem in prop:
-            sub_palette = getattr(QtGui.QPalette, palette_elem.tag.title())
+            sub_palette = getattr(self.QtGui.QPalette, palette_elem.tag.title())
             for role, color in enumerate(palette_elem):
                 if color.tag == 'color':
                     # Handle simple colour descriptions where the role is
                     # implied by the colour's position.
                     palette.setColor(sub_palette,
-                            QtGui.QPalette.ColorRole(role), self._color(color))
+                            self.QtGui.QPalette.ColorRole(role), self._color(color))
                 elif color.tag == 'colorrole':
-                    role = getattr(QtGui.QPalette, color.get('role'))
+                    role = getattr(self.QtGui.QPalette, color.get('role'))
                     brush = self._brush(color[0])
                     palette.setBrush(sub_palette, role, brush)
                 else:
@@ -314,7 +308,7 @@ class Properties(object):
             brush = self.factory.createQObject("QBrush", "brush", (color, ),
                     is_attribute=False)
 
-            brushstyle = getattr(QtCore.Qt, brushstyle)
+            brushstyle = getattr(self.QtCore.Qt, brushstyle)
             brush.setStyle(brushstyle)
 
         return brush
@@ -326,12 +320,12 @@ class Properties(object):
         if len(values) == 2:
             # Qt v4.3.0 and later.
             horstretch, verstretch = values
-            hsizetype = getattr(QtGui.QSizePolicy, prop.get('hsizetype'))
-            vsizetype = getattr(QtGui.QSizePolicy, prop.get('vsizetype'))
+            hsizetype = getattr(self.QtGui.QSizePolicy, prop.get('hsizetype'))
+            vsizetype = getattr(self.QtGui.QSizePolicy, prop.get('vsizetype'))
         else:
             hsizetype, vsizetype, horstretch, verstretch = values
-            hsizetype = QtGui.QSizePolicy.Policy(hsizetype)
-            vsizetype = QtGui.QSizePolicy.Policy(vsizetype)
+            hsizetype = self.QtGui.QSizePolicy.Policy(hsizetype)
+            vsizetype = self.QtGui.QSizePolicy.Policy(vsizetype)
 
         sizePolicy = self.factory.createQObject("QSizePolicy", "sizePolicy",
                 (hsizetype, vsizetype), is_attribute=False)
@@ -350,7 +344,7 @@ class Properties(object):
                         ("Weight",          int),
                         ("StrikeOut",       bool_),
                         ("Kerning",         bool_),
-                        ("StyleStrategy",   qfont_enum))
+                        ("StyleStrategy",   None))
 
     def _font(self, prop):
         newfont = self.factory.createQObject("QFont", "font", (),
@@ -360,14 +354,20 @@ class Properties(object):
             if v is None:
                 continue
 
-            getattr(newfont, "set%s" % (attr,))(converter(v))
+            if converter is None:
+                # The value is the name of a QFont enum member.
+                v = getattr(self.QtGui.QFont, v)
+            else:
+                v = converter(v)
+
+            getattr(newfont, "set%s" % (attr,))(v)
         return newfont
 
     def _cursor(self, prop):
-        return QtGui.QCursor(QtCore.Qt.CursorShape(int(prop.text)))
+        return self.QtGui.QCursor(self.QtCore.Qt.CursorShape(int(prop.text)))
 
     def _cursorShape(self, prop):
-        return QtGui.QCursor(getattr(QtCore.Qt, prop.text))
+        return self.QtGui.QCursor(getattr(self.QtCore.Qt, prop.text))
 
     def convert(self, prop, widget=None):
         try:
@@ -493,13 +493,13 @@ class Properties(object):
         # If the class is a QFrame, it's a line.
         if widget.metaObject().className() == "QFrame":
             widget.setFrameShape(
-                {"Qt::Horizontal": QtGui.QFrame.HLine,
-                 "Qt::Vertical"  : QtGui.QFrame.VLine}[prop[0].text])
+                {"Qt::Horizontal": self.QtGui.QFrame.HLine,
+                 "Qt::Vertical"  : self.QtGui.QFrame.VLine}[prop[0].text])
 
             # In Qt Designer, lines appear to be sunken, QFormBuilder loads
             # them as such, uic generates plain lines.  We stick to the look in
             # Qt Designer.
-            widget.setFrameShadow(QtGui.QFrame.Sunken)
+            widget.setFrameShadow(self.QtGui.QFrame.Sunken)
         else:
             widget.setOrientation(self._enum(prop[0]))
 
@@ -0,0 +1,106 @@
+#############################################################################
+##
+## Copyright (c) 2014 Riverbank Computing Limited <info@riverbankcomputing.com>
+##
+## This file is part of PyQt.
+##
+## This file may be used under the terms of the GNU General Public
+## License versions 2.0 or 3.0 as published by the Free Software
+## Foundation and appearing in the files LICENSE.GPL2 and LICENSE.GPL3
+## included in the packaging of this file.  Alternatively you may (at
+## your option) use any later version of the GNU General Public
+## License if such license has been publicly approved by Riverbank
+## Computing Limited (or its successors, if any) and the KDE Free Qt
+## Foundation. In addition, as a special exception, Riverbank gives you
+## certain additional rights. These rights are described in the Riverbank
+## GPL Exception version 1.1, which can be found in the file
+## GPL_EXCEPTION.txt in this package.
+##
+## If you are unsure which license is appropriate for your use, please
+## contact the sales department at sales@riverbankcomputing.com.
+##
+## This file is provided AS IS with NO WARRANTY OF ANY KIND, INCLUDING THE
+## WARRANTY OF DESIGN, MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE.
+##
+#############################################################################
+
+
+import os
+import re
+
+
+# The versions of PyQt and Qt that this copy of pyuic4 is shipped with.  They
+# are used when neither PyQt4.QtCore nor PyQt4.pyqtconfig can be used.
+PYQT_VERSION_STR = '4.11.3'
+QT_VERSION_STR = '4.8.6'
+
+
+# The cached versions.
+_versions = None
+
+
+def headless():
+    """ Return True if the compiler has been told not to import any Qt binary
+    by setting PYQT4_UIC_HEADLESS.
+    """
+
+    return os.environ.get('PYQT4_UIC_HEADLESS', '0') not in ('', '0')
+
+
+def _configVersions():
+    """ Return a tuple of the PyQt and Qt version strings read from
+    PyQt4.pyqtconfig, or None if there isn't one.  The module is read rather
+    than imported because it imports sipconfig which may not be installed.
+    """
+
+    import PyQt4
+
+    for package_dir in PyQt4.__path__:
+        try:
+            f = open(os.path.join(package_dir, 'pyqtconfig.py'))
+        except IOError:
+            continue
+
+        try:
+            config = f.read()
+        finally:
+            f.close()
+
+        pyqt_version = re.search(r"'pyqt_version_str':\s*'([^']+)'", config)
+        qt_version = re.search(r"'qt_version':\s*(0x[0-9a-fA-F]+)", config)
+
+        if pyqt_version is not None and qt_version is not None:
+            qt_version = int(qt_version.group(1), 16)
+
+            return (pyqt_version.group(1), '%d.%d.%d' % (qt_version >> 16,
+                    (qt_version >> 8) & 0xff, qt_version & 0xff))
+
+    return None
+
+
+def versions():
+    """ Return a tuple of the PyQt and Qt version strings.  They are taken
+    from PyQt4.QtCore if it can be imported and the compiler isn't headless,
+    otherwise from PyQt4.pyqtconfig, otherwise from the versions that pyuic4
+    is shipped with.  This means that forms can be compiled where the
+    platform's QtCore can't be loaded.
+    """
+
+    global _versions
+
+    if _versions is None:
+        if not headless():
+            try:
+                from PyQt4 import QtCore
+            except ImportError:
+                pass
+            else:
+                _versions = (QtCore.PYQT_VERSION_STR, QtCore.QT_VERSION_STR)
+
+        if _versions is None:
+            _versions = _configVersions()
+
+        if _versions is None:
+            _versions = (PYQT_VERSION_STR, QT_VERSION_STR)
+
+    return _versions
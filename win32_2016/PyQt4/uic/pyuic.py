@@ -28,11 +28,11 @@
 import sys
 import optparse
 
-from PyQt4 import QtCore
 from PyQt4.uic.driver import Driver
+from PyQt4.uic.options import create_parser, version
 
 
-Version = "Python User Interface Compiler %s for Qt version %s" % (QtCore.PYQT_VERSION_STR, QtCore.QT_VERSION_STR)
+Version = version()
 
 
 if sys.hexversion >= 0x03000000:
@@ -41,37 +41,45 @@ else:
     from PyQt4.uic.port_v2.invoke import invoke
 
 
-parser = optparse.OptionParser(usage="pyuic4 [options] <ui-file>",
-        version=Version)
-parser.add_option("-p", "--preview", dest="preview", action="store_true",
+parser = create_parser(version=Version)
+parser.add_option("--server", dest="server", action="store_true",
         default=False,
-        help="show a preview of the UI instead of generating code")
-parser.add_option("-o", "--output", dest="output", default="-", metavar="FILE",
-        help="write generated code to FILE instead of stdout")
-parser.add_option("-x", "--execute", dest="execute", action="store_true",
-        default=False,
-        help="generate extra code to test and display the class")
-parser.add_option("-d", "--debug", dest="debug", action="store_true",
-        default=False, help="show debug output")
-parser.add_option("-i", "--indent", dest="indent", action="store", type="int",
+        help="run a compile server for pyuicc clients instead of compiling a ui-file")
+
+g = optparse.OptionGroup(parser, title="Watch options")
+g.add_option("--watch", dest="watch", action="store", type="string",
+        default=None, metavar="DIR",
+        help="compile the ui-files in DIR that are out of date and then "
+                "recompile them whenever they change")
+g.add_option("--recurse", dest="recurse", action="store_true",
+        default=False, help="also watch the sub-directories of DIR")
+g.add_option("--interval", dest="interval", action="store", type="float",
+        default=0.5, metavar="SECS",
+        help="poll DIR every SECS seconds [default: 0.5]")
+g.add_option("--debounce", dest="debounce", action="store", type="float",
+        default=0.3, metavar="SECS",
+        help="wait until a ui-file has not changed for SECS seconds before "
+                "compiling it [default: 0.3]")
+g.add_option("-j", "--jobs", dest="jobs", action="store", type="int",
         default=4, metavar="N",
-        help="set indent width to N spaces, tab if N is 0 [default: 4]")
-parser.add_option("-w", "--pyqt3-wrapper", dest="pyqt3_wrapper",
-        action="store_true", default=False,
-        help="generate a PyQt v3 style wrapper")
-
-g = optparse.OptionGroup(parser, title="Code generation options")
-g.add_option("--from-imports", dest="from_imports", action="store_true",
-        default=False, help="generate imports relative to '.'")
-g.add_option("--resource-suffix", dest="resource_suffix", action="store",
-        type="string", default="_rc", metavar="SUFFIX",
-        help="append SUFFIX to the basename of resource files [default: _rc]")
+        help="compile up to N ui-files at the same time, each in its own "
+                "process [default: 4]")
 parser.add_option_group(g)
 
-opts, args = parser.parse_args()
+def main():
+    opts, args = parser.parse_args()
+
+    if opts.server or opts.watch:
+        return invoke(Driver(opts, None))
+
+    if len(args) != 1:
+        sys.stderr.write("Error: one input ui-file must be specified\n")
+        return 1
+
+    return invoke(Driver(opts, args[0]))
 
-if len(args) != 1:
-    sys.stderr.write("Error: one input ui-file must be specified\n")
-    sys.exit(1)
 
-sys.exit(invoke(Driver(opts, args[0])))
+# The processes that compile the ui-files being watched import this module on
+# Windows.
+if __name__ == '__main__':
+    sys.exit(main())
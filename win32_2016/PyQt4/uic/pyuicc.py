@@ -0,0 +1,137 @@
+#############################################################################
+##
+## Copyright (c) 2014 Riverbank Computing Limited <info@riverbankcomputing.com>
+##
+## This file is part of PyQt.
+##
+## This file may be used under the terms of the GNU General Public
+## License versions 2.0 or 3.0 as published by the Free Software
+## Foundation and appearing in the files LICENSE.GPL2 and LICENSE.GPL3
+## included in the packaging of this file.  Alternatively you may (at
+## your option) use any later version of the GNU General Public
+## License if such license has been publicly approved by Riverbank
+## Computing Limited (or its successors, if any) and the KDE Free Qt
+## Foundation. In addition, as a special exception, Riverbank gives you
+## certain additional rights. These rights are described in the Riverbank
+## GPL Exception version 1.1, which can be found in the file
+## GPL_EXCEPTION.txt in this package.
+##
+## If you are unsure which license is appropriate for your use, please
+## contact the sales department at sales@riverbankcomputing.com.
+##
+## This file is provided AS IS with NO WARRANTY OF ANY KIND, INCLUDING THE
+## WARRANTY OF DESIGN, MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE.
+##
+#############################################################################
+
+
+# This is a drop-in replacement for pyuic4 that hands the compilation to a
+# compile server started with "pyuic4 --server".  This avoids the cost of
+# importing PyQt4 for every .ui file.  If there is no server then the .ui file
+# is compiled locally.
+
+
+import sys
+
+from PyQt4.uic.exceptions import CompileServerError
+from PyQt4.uic.options import create_parser
+from PyQt4.uic.server import CompileClient
+
+
+def _local(opts, args):
+    """ Handle the command line locally in the same way as pyuic4. """
+
+    from PyQt4.uic.driver import Driver
+
+    if sys.hexversion >= 0x03000000:
+        from PyQt4.uic.port_v3.invoke import invoke
+    else:
+        from PyQt4.uic.port_v2.invoke import invoke
+
+    return invoke(Driver(opts, args[0]))
+
+
+def _write(opts, code):
+    """ Write the generated code as pyuic4 would. """
+
+    if sys.hexversion >= 0x03000000:
+        if opts.output == '-':
+            from io import TextIOWrapper
+
+            pyfile = TextIOWrapper(sys.stdout.buffer, encoding='utf8')
+        else:
+            pyfile = open(opts.output, 'wt', encoding='utf8')
+    else:
+        code = code.encode('utf8')
+
+        if opts.output == '-':
+            pyfile = sys.stdout
+        else:
+            pyfile = open(opts.output, 'wt')
+
+    pyfile.write(code)
+    pyfile.flush()
+
+    if opts.output != '-':
+        pyfile.close()
+
+
+def main():
+    parser = create_parser(usage="pyuicc [options] <ui-file>")
+    parser.add_option("--version", dest="version", action="store_true",
+            default=False,
+            help="show program's version number and exit")
+
+    opts, args = parser.parse_args()
+
+    try:
+        client = CompileClient(opts.address)
+    except (IOError, OSError, EOFError):
+        client = None
+    except CompileServerError as e:
+        sys.stderr.write("Error: %s\n" % e)
+        return 1
+
+    if opts.version:
+        if client is not None:
+            version = client.version()
+            client.close()
+        else:
+            from PyQt4.uic.options import version as local_version
+
+            version = local_version()
+
+        sys.stdout.write(version + "\n")
+        return 0
+
+    if len(args) != 1:
+        sys.stderr.write("Error: one input ui-file must be specified\n")
+        return 1
+
+    # Previews need a local GUI, debug, profiling and optimizer output is only
+    # available locally and the server only accepts the names of passes.
+    if client is None or opts.preview or opts.debug or opts.profile or opts.profile_trace or opts.optimize_report or opts.optimize_flatten:
+        if client is not None:
+            client.close()
+
+        return _local(opts, args)
+
+    try:
+        code = client.compile(args[0], execute=opts.execute,
+                indent=opts.indent, pyqt3_wrapper=opts.pyqt3_wrapper,
+                from_imports=opts.from_imports,
+                resource_suffix=opts.resource_suffix, runtime=opts.runtime,
+                defer_resources=opts.defer_resources, optimize=opts.optimize,
+                batch=opts.batch)
+    except CompileServerError as e:
+        sys.stderr.write("%s\n" % e)
+        return 1
+    finally:
+        client.close()
+
+    _write(opts, code)
+
+    return 0
+
+
+sys.exit(main())
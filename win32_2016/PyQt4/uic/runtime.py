@@ -0,0 +1,175 @@
+#############################################################################
+##
+## Copyright (c) 2014 Riverbank Computing Limited <info@riverbankcomputing.com>
+##
+## This file is part of PyQt.
+##
+## This file may be used under the terms of the GNU General Public
+## License versions 2.0 or 3.0 as published by the Free Software
+## Foundation and appearing in the files LICENSE.GPL2 and LICENSE.GPL3
+## included in the packaging of this file.  Alternatively you may (at
+## your option) use any later version of the GNU General Public
+## License if such license has been publicly approved by Riverbank
+## Computing Limited (or its successors, if any) and the KDE Free Qt
+## Foundation. In addition, as a special exception, Riverbank gives you
+## certain additional rights. These rights are described in the Riverbank
+## GPL Exception version 1.1, which can be found in the file
+## GPL_EXCEPTION.txt in this package.
+##
+## If you are unsure which license is appropriate for your use, please
+## contact the sales department at sales@riverbankcomputing.com.
+##
+## This file is provided AS IS with NO WARRANTY OF ANY KIND, INCLUDING THE
+## WARRANTY OF DESIGN, MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE.
+##
+#############################################################################
+
+# This module is imported by the code generated by pyuic4 --runtime instead of
+# the code defining its own helpers.  All forms therefore share the helpers
+# and their caches.
+
+
+from PyQt4 import QtCore, QtGui
+
+from PyQt4.uic.signatures import signalOverload, splitSignature
+
+
+try:
+    fromUtf8 = QtCore.QString.fromUtf8
+except AttributeError:
+    def fromUtf8(s):
+        return s
+
+
+try:
+    _encoding = QtGui.QApplication.UnicodeUTF8
+except AttributeError:
+    # The signature of QApplication.translate() is the one that the generated
+    # code uses so it is called directly.
+    translate = QtGui.QApplication.translate
+else:
+    def translate(context, text, disambig, _translate=QtGui.QApplication.translate, _encoding=_encoding):
+        return _translate(context, text, disambig, _encoding)
+
+
+# The fonts that have been created keyed by their settings.
+_fonts = {}
+
+
+def font(*settings):
+    """ Return a font with the given settings, each of which is a tuple of the
+    name of a QFont property (eg. 'PointSize') and its value.  The same font is
+    returned for the same settings so it must not be modified.
+    """
+
+    f = _fonts.get(settings)
+
+    if f is None:
+        f = QtGui.QFont()
+
+        for name, value in settings:
+            if isinstance(value, str):
+                value = fromUtf8(value)
+
+            getattr(f, 'set' + name)(value)
+
+        _fonts[settings] = f
+
+    return f
+
+
+def addItems(combobox, count):
+    """ Add a number of empty items to a combo box.  Their text is set by
+    setItemTexts().
+    """
+
+    combobox.addItems([''] * count)
+
+
+def setItemTexts(combobox, texts):
+    """ Set the text of each item of a combo box. """
+
+    for index, text in enumerate(texts):
+        combobox.setItemText(index, text)
+
+
+def connectSlotsByName(form, objects):
+    """ Connect the signals of the objects of a form to the form's slots named
+    on_<object name>_<signal name> in the same way as
+    QMetaObject.connectSlotsByName().  objects has an attribute, named after
+    it, for each of the objects created from the .ui file, eg. the Ui_Form
+    instance.  Those objects are connected directly and only the others are
+    searched for among the descendants of the form.  If any slot is decorated
+    with pyqtSlot() then everything is left to Qt as only it knows which
+    overloads the decorations select.
+    """
+
+    connections = []
+
+    for name in _slotNames(type(form)):
+        slot = getattr(form, name)
+
+        if not callable(slot):
+            continue
+
+        if hasattr(slot, '__pyqtSignature__'):
+            QtCore.QMetaObject.connectSlotsByName(form)
+            return
+
+        object_name, _, signal_name = name[3:].rpartition('_')
+        if not object_name or not signal_name:
+            continue
+
+        obj = getattr(objects, object_name, None)
+
+        if not isinstance(obj, QtCore.QObject) or obj.objectName() != object_name:
+            obj = form.findChild(QtCore.QObject, object_name)
+
+            if obj is None:
+                continue
+
+        connections.append((obj, signal_name, slot))
+
+    # Like Qt, every overload of the signal is connected.
+    for obj, signal_name, slot in connections:
+        for types in _signalOverloads(obj, signal_name):
+            signalOverload(getattr(obj, signal_name), types).connect(slot)
+
+
+def _slotNames(cls):
+    """ Return the sorted names of the attributes of a class that may be
+    slots to be connected by name.
+    """
+
+    names = set()
+
+    for klass in cls.__mro__:
+        # PyQt's own classes don't have any.
+        if klass.__module__.startswith('PyQt4.'):
+            continue
+
+        for name in vars(klass):
+            if name.startswith('on_'):
+                names.add(name)
+
+    return sorted(names)
+
+
+def _signalOverloads(obj, signal_name):
+    """ Return a list of the argument types of each overload of one of an
+    object's signals.
+    """
+
+    overloads = []
+    meta_object = obj.metaObject()
+
+    for index in range(meta_object.methodCount()):
+        method = meta_object.method(index)
+
+        if method.methodType() == QtCore.QMetaMethod.Signal:
+            name, types = splitSignature(str(method.signature()))
+
+            if name == signal_name:
+                overloads.append(types)
+
+    return overloads
@@ -0,0 +1,375 @@
+#############################################################################
+##
+## Copyright (c) 2014 Riverbank Computing Limited <info@riverbankcomputing.com>
+##
+## This file is part of PyQt.
+##
+## This file may be used under the terms of the GNU General Public
+## License versions 2.0 or 3.0 as published by the Free Software
+## Foundation and appearing in the files LICENSE.GPL2 and LICENSE.GPL3
+## included in the packaging of this file.  Alternatively you may (at
+## your option) use any later version of the GNU General Public
+## License if such license has been publicly approved by Riverbank
+## Computing Limited (or its successors, if any) and the KDE Free Qt
+## Foundation. In addition, as a special exception, Riverbank gives you
+## certain additional rights. These rights are described in the Riverbank
+## GPL Exception version 1.1, which can be found in the file
+## GPL_EXCEPTION.txt in this package.
+##
+## If you are unsure which license is appropriate for your use, please
+## contact the sales department at sales@riverbankcomputing.com.
+##
+## This file is provided AS IS with NO WARRANTY OF ANY KIND, INCLUDING THE
+## WARRANTY OF DESIGN, MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE.
+##
+#############################################################################
+
+
+import base64
+import io
+import json
+import logging
+import os
+import sys
+import tempfile
+import threading
+
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Client, Listener
+
+from PyQt4.uic.exceptions import CompileServerError
+
+
+logger = logging.getLogger(__name__)
+DEBUG = logger.debug
+
+
+# The environment variables that override the default address and
+# authentication key.
+ADDRESS_ENV = 'PYUIC4_SERVER'
+AUTHKEY_ENV = 'PYUIC4_SERVER_AUTHKEY'
+
+# The compileUi() arguments that a client may specify.
+_COMPILE_ARGS = ('execute', 'indent', 'pyqt3_wrapper', 'from_imports',
+        'resource_suffix', 'runtime', 'defer_resources', 'optimize',
+        'batch')
+
+
+def default_address():
+    """ Return the address used by the server and its clients if none is
+    explicitly given.  This is either the value of the PYUIC4_SERVER
+    environment variable, or a named pipe (on Windows) or a socket file (on
+    other platforms) private to the current user.
+    """
+
+    address = os.environ.get(ADDRESS_ENV)
+    if address:
+        return parse_address(address)
+
+    try:
+        import getpass
+
+        user = getpass.getuser()
+    except Exception:
+        user = 'default'
+
+    if sys.platform == 'win32':
+        return r'\\.\pipe\pyuic4-%s' % user
+
+    return os.path.join(tempfile.gettempdir(), 'pyuic4-%s' % user, 'server')
+
+
+def parse_address(address):
+    """ Convert an address given as a string to the form used by
+    multiprocessing.connection.  host:port is a TCP address and anything else
+    is a named pipe or a socket file name.
+    """
+
+    host, sep, port = address.rpartition(':')
+    if sep and host and port.isdigit() and not os.path.sep in address:
+        return (host, int(port))
+
+    return address
+
+
+def default_authkey():
+    """ Return the authentication key from the PYUIC4_SERVER_AUTHKEY
+    environment variable or None if it isn't set.
+    """
+
+    authkey = os.environ.get(AUTHKEY_ENV)
+    if authkey:
+        return authkey.encode('utf-8')
+
+    return None
+
+
+def _check_authkey(address, authkey):
+    """ Raise CompileServerError if address is a TCP address and there is no
+    authentication key.  Without one any host that can reach the port could
+    compile arbitrary files and shut the server down.
+    """
+
+    if isinstance(address, tuple) and not authkey:
+        raise CompileServerError(
+                "a TCP address requires an authentication key, set %s" %
+                        AUTHKEY_ENV)
+
+
+def _send(conn, message):
+    """ Send a message as JSON. """
+
+    conn.send_bytes(json.dumps(message).encode('utf-8'))
+
+
+def _receive(conn):
+    """ Receive a JSON message. """
+
+    return json.loads(conn.recv_bytes().decode('utf-8'))
+
+
+class _NamedBytesIO(io.BytesIO):
+    """ An in-memory .ui file with the name that appears in the generated
+    code.
+    """
+
+    def __init__(self, data, name):
+        io.BytesIO.__init__(self, data)
+        self.name = name
+
+
+class CompileServer(object):
+    """ A server that keeps the compiler resident and compiles .ui files on
+    behalf of any number of clients.  Each client connection is served by its
+    own thread so that compilations for different clients run concurrently.
+    """
+
+    def __init__(self, address=None, authkey=None):
+        """ Initialise the server.  address is the optional address to listen
+        on.  authkey is the optional key that clients must authenticate with.
+        It is required if the address is a TCP address.
+        """
+
+        if address is None:
+            address = default_address()
+        elif not isinstance(address, tuple):
+            address = parse_address(address)
+
+        if authkey is None:
+            authkey = default_authkey()
+
+        _check_authkey(address, authkey)
+
+        self.address = address
+        self._authkey = authkey
+        self._shutdown = False
+
+    def serve_forever(self):
+        """ Accept and serve clients until a client asks the server to shut
+        down.
+        """
+
+        if isinstance(self.address, str) and not self.address.startswith('\\\\'):
+            self._prepare_socket_file()
+
+        listener = Listener(self.address, authkey=self._authkey)
+        DEBUG("compile server listening on %s", self.address)
+
+        try:
+            while not self._shutdown:
+                try:
+                    conn = listener.accept()
+                except (IOError, OSError, EOFError, AuthenticationError):
+                    # Ignore clients that fail to connect or authenticate.
+                    continue
+
+                t = threading.Thread(target=self._serve_client, args=(conn, ))
+                t.daemon = True
+                t.start()
+        finally:
+            listener.close()
+
+        DEBUG("compile server shut down")
+
+    def _prepare_socket_file(self):
+        """ Make sure the directory containing a socket file exists and is
+        private, and remove any socket left by a server that died.
+        """
+
+        sock_dir = os.path.dirname(self.address)
+
+        if sock_dir and not os.path.isdir(sock_dir):
+            os.makedirs(sock_dir, 0o700)
+
+        if os.path.exists(self.address):
+            os.remove(self.address)
+
+    def _serve_client(self, conn):
+        """ Serve the requests of a single client until it disconnects. """
+
+        try:
+            while True:
+                try:
+                    request = _receive(conn)
+                except (EOFError, IOError, OSError):
+                    break
+
+                command = request.get('command', 'compile')
+
+                if command == 'compile':
+                    _send(conn, self.compile(request))
+                elif command == 'version':
+                    from PyQt4.uic.options import version
+
+                    _send(conn, {'status': 0, 'version': version()})
+                elif command == 'shutdown':
+                    _send(conn, {'status': 0})
+                    self.shutdown()
+                    break
+                else:
+                    _send(conn, {'status': 1,
+                            'error': "Unknown command: %s" % command})
+        finally:
+            conn.close()
+
+    def shutdown(self):
+        """ Stop accepting clients. """
+
+        self._shutdown = True
+
+        # Wake up the listener which is blocked waiting for a client.
+        try:
+            Client(self.address, authkey=self._authkey).close()
+        except (IOError, OSError, EOFError):
+            pass
+
+    def compile(self, request):
+        """ Handle a compile request and return the response. """
+
+        from PyQt4.uic import compileUi
+
+        ui_name = request.get('ui_name')
+        ui_data = request.get('ui_data')
+
+        if sys.hexversion >= 0x03000000:
+            pyfile = io.StringIO()
+        else:
+            from StringIO import StringIO
+
+            pyfile = StringIO()
+
+        kwargs = {}
+        for name in _COMPILE_ARGS:
+            if name in request:
+                kwargs[name] = request[name]
+
+        try:
+            if ui_data is not None:
+                uifile = _NamedBytesIO(base64.b64decode(ui_data.encode('ascii')),
+                        ui_name or '<string>')
+            else:
+                ui_path = request['ui_file']
+
+                try:
+                    f = open(ui_path, 'rb')
+                except IOError as e:
+                    # Report the name the client knows the file by.
+                    e.filename = ui_name or ui_path
+                    raise
+
+                try:
+                    uifile = _NamedBytesIO(f.read(), ui_name or ui_path)
+                finally:
+                    f.close()
+
+            DEBUG("compiling %s", uifile.name)
+            compileUi(uifile, pyfile, **kwargs)
+        except Exception:
+            from PyQt4.uic.driver import error_message
+
+            return {'status': 1, 'error': error_message(sys.exc_info()[1])}
+
+        return {'status': 0, 'code': pyfile.getvalue()}
+
+
+class CompileClient(object):
+    """ A connection to a compile server. """
+
+    def __init__(self, address=None, authkey=None):
+        """ Connect to the server.  address is the optional address of the
+        server.  authkey is the optional authentication key and is required if
+        the address is a TCP address.  An exception derived from IOError or
+        OSError is raised if there is no server.
+        """
+
+        if address is None:
+            address = default_address()
+        elif not isinstance(address, tuple):
+            address = parse_address(address)
+
+        if authkey is None:
+            authkey = default_authkey()
+
+        _check_authkey(address, authkey)
+
+        self._conn = Client(address, authkey=authkey)
+
+    def close(self):
+        """ Close the connection. """
+
+        self._conn.close()
+
+    def _request(self, message):
+        """ Send a request and return the response.  CompileServerError is
+        raised if the server reported an error.
+        """
+
+        _send(self._conn, message)
+        response = _receive(self._conn)
+
+        if response.get('status') != 0:
+            raise CompileServerError(response.get('error', "Unknown error"))
+
+        return response
+
+    def compile(self, ui_file=None, ui_data=None, ui_name=None, **compileUi_args):
+        """ Compile a .ui file and return the generated code.  ui_file is the
+        name of a .ui file that the server reads.  ui_data is the contents of
+        a .ui file as bytes or text.  One of these must be given.  ui_name is
+        the optional name of the .ui file that appears in the generated code.
+        compileUi_args are any additional keyword arguments that are passed
+        to the compileUi() function.
+        """
+
+        request = {'command': 'compile', 'ui_name': ui_name}
+
+        if ui_data is not None:
+            if not isinstance(ui_data, bytes):
+                ui_data = ui_data.encode('utf-8')
+
+            request['ui_data'] = base64.b64encode(ui_data).decode('ascii')
+        elif ui_file is not None:
+            request['ui_file'] = os.path.abspath(ui_file)
+
+            if ui_name is None:
+                request['ui_name'] = ui_file
+        else:
+            raise ValueError("either ui_file or ui_data must be specified")
+
+        for name, value in compileUi_args.items():
+            if name not in _COMPILE_ARGS:
+                raise TypeError("unexpected keyword argument '%s'" % name)
+
+            request[name] = value
+
+        return self._request(request)['code']
+
+    def version(self):
+        """ Return the version string of the server. """
+
+        return self._request({'command': 'version'})['version']
+
+    def shutdown(self):
+        """ Ask the server to shut down. """
+
+        self._request({'command': 'shutdown'})
@@ -0,0 +1,94 @@
+#############################################################################
+##
+## Copyright (c) 2014 Riverbank Computing Limited <info@riverbankcomputing.com>
+##
+## This file is part of PyQt.
+##
+## This file may be used under the terms of the GNU General Public
+## License versions 2.0 or 3.0 as published by the Free Software
+## Foundation and appearing in the files LICENSE.GPL2 and LICENSE.GPL3
+## included in the packaging of this file.  Alternatively you may (at
+## your option) use any later version of the GNU General Public
+## License if such license has been publicly approved by Riverbank
+## Computing Limited (or its successors, if any) and the KDE Free Qt
+## Foundation. In addition, as a special exception, Riverbank gives you
+## certain additional rights. These rights are described in the Riverbank
+## GPL Exception version 1.1, which can be found in the file
+## GPL_EXCEPTION.txt in this package.
+##
+## If you are unsure which license is appropriate for your use, please
+## contact the sales department at sales@riverbankcomputing.com.
+##
+## This file is provided AS IS with NO WARRANTY OF ANY KIND, INCLUDING THE
+## WARRANTY OF DESIGN, MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE.
+##
+#############################################################################
+
+
+# This module doesn't import Qt so that it can be used by the compiler, the
+# loader and the code generated by pyuic4 --runtime.
+
+
+import re
+
+
+# Whitespace that isn't between two parts of an identifier.
+_INSIGNIFICANT_SPACE = re.compile(r' (?=\W)|(?<=\W) ')
+
+
+def normalizedType(type_name):
+    """ Return a C++ type with its whitespace normalised in the same way as
+    QMetaObject.normalizedType(), eg. "unsigned  int" is "unsigned int" and
+    "QList<QList<int > >" is "QList<QList<int> >".  PyQt normalises the type
+    itself when an overload is selected.
+    """
+
+    type_name = _INSIGNIFICANT_SPACE.sub('', ' '.join(type_name.split()))
+
+    # The space between the closing brackets of nested templates is kept.
+    while '>>' in type_name:
+        type_name = type_name.replace('>>', '> >')
+
+    return type_name
+
+
+def splitSignature(signature):
+    """ Split a signature, eg. "valueChanged(int)", into its name and a tuple
+    of its normalised argument types.
+    """
+
+    name, _, args = signature.partition('(')
+    args = args.strip()
+
+    if args.endswith(')'):
+        args = args[:-1]
+
+    # Split the arguments at commas that are not part of a template.
+    types = []
+    depth = 0
+    start = 0
+
+    for i, ch in enumerate(args):
+        if ch == '<':
+            depth += 1
+        elif ch == '>':
+            depth -= 1
+        elif ch == ',' and depth == 0:
+            types.append(args[start:i])
+            start = i + 1
+
+    types.append(args[start:])
+
+    return name.strip(), tuple([normalizedType(t) for t in types if t.strip()])
+
+
+def signalOverload(signal, types):
+    """ Return the overload of a bound signal with the given argument types.
+    An empty tuple selects the overload without arguments rather than the
+    default one.
+    """
+
+    if len(types) == 1:
+        return signal[types[0]]
+
+    return signal[types]
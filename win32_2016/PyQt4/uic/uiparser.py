@@ -58,6 +58,7 @@ except ImportError:
 from PyQt4.uic.exceptions import NoSuchWidgetError
 from PyQt4.uic.objcreator import QObjectCreator
 from PyQt4.uic.properties import Properties
+from PyQt4.uic.signatures import signalOverload, splitSignature
 
 
 logger = logging.getLogger(__name__)
@@ -68,11 +69,8 @@ if sys.version_info < (2,4,0):
         for i in xrange(len(seq)-1, -1, -1):
             yield seq[i]
 
-QtCore = None
-QtGui = None
 
-
-def _parse_alignment(alignment):
+def _parse_alignment(alignment, QtCore):
     """ Convert a C++ alignment to the corresponding flags. """
 
     align_flags = None
@@ -88,7 +86,7 @@ def _parse_alignment(alignment):
     return align_flags
 
 
-def _layout_position(elem):
+def _layout_position(elem, QtCore):
     """ Return either (), (alignment), (row, column, rowspan, colspan) or
     (row, column, rowspan, colspan, alignment) depending on the type of layout
     and its configuration.  The result will be suitable to use as arguments to
@@ -104,7 +102,7 @@ def _layout_position(elem):
         if alignment is None:
             return ()
 
-        return (_parse_alignment(alignment), )
+        return (_parse_alignment(alignment, QtCore), )
 
     # It must be a grid or a form layout.
     row = int(row)
@@ -116,16 +114,20 @@ def _layout_position(elem):
     if alignment is None:
         return (row, column, rowspan, colspan)
 
-    return (row, column, rowspan, colspan, _parse_alignment(alignment))
+    return (row, column, rowspan, colspan, _parse_alignment(alignment, QtCore))
 
 
 class WidgetStack(list):
     topwidget = None
+    def __init__(self, QtGui):
+        list.__init__(self)
+        self.QtGui = QtGui
+
     def push(self, item):
         DEBUG("push %s %s" % (item.metaObject().className(),
                               item.objectName()))
         self.append(item)
-        if isinstance(item, QtGui.QWidget):
+        if isinstance(item, self.QtGui.QWidget):
             self.topwidget = item
 
     def popLayout(self):
@@ -139,7 +141,7 @@ class WidgetStack(list):
         DEBUG("pop widget %s %s" % (widget.metaObject().className(),
                                     widget.objectName()))
         for item in reversed(self):
-            if isinstance(item, QtGui.QWidget):
+            if isinstance(item, self.QtGui.QWidget):
                 self.topwidget = item
                 break
         else:
@@ -151,7 +153,7 @@ class WidgetStack(list):
         return self[-1]
 
     def topIsLayout(self):
-        return isinstance(self[-1], QtGui.QLayout)
+        return isinstance(self[-1], self.QtGui.QLayout)
 
 
 class ButtonGroup(object):
@@ -167,12 +169,18 @@ class ButtonGroup(object):
 
 class UIParser(object):
     def __init__(self, QtCoreModule, QtGuiModule, creatorPolicy):
+        self.QtCore = QtCoreModule
+        self.QtGui = QtGuiModule
+
         self.factory = QObjectCreator(creatorPolicy)
         self.wprops = Properties(self.factory, QtCoreModule, QtGuiModule)
 
-        global QtCore, QtGui
-        QtCore = QtCoreModule
-        QtGui = QtGuiModule
+        # The optional PyQt4.uic.optimizer.Optimizer applied to the .ui file.
+        self.optimizer = None
+
+        # Set if updates and layout activation are suspended while the form
+        # is being created.
+        self.batch = False
 
         self.reset()
 
@@ -201,7 +209,7 @@ class UIParser(object):
         try: self.wprops.reset()
         except AttributeError: pass
         self.toplevelWidget = None
-        self.stack = WidgetStack()
+        self.stack = WidgetStack(self.QtGui)
         self.name_suffixes = {}
         self.defaults = {"spacing": 6, "margin": 0}
         self.actions = []
@@ -209,6 +217,11 @@ class UIParser(object):
         self.resources = []
         self.button_groups = {}
         self.layout_widget = False
+        self.batched_layouts = []
+
+        # Whether updates of the top-level widget were enabled before a batch
+        # started or None if there is no batch.
+        self.updates_enabled = None
 
     def setupObject(self, clsname, parent, branch, is_attribute = True):
         name = self.uniqueName(branch.attrib.get("name") or clsname[1:].lower())
@@ -218,7 +231,9 @@ class UIParser(object):
             args = (parent, )
         obj =  self.factory.createQObject(clsname, name, args, is_attribute)
         self.wprops.setProperties(obj, branch)
-        obj.setObjectName(name)
+        # The optimizer may have found that nothing refers to the name.
+        if branch.get("pyuicNoObjectName") != "true":
+            obj.setObjectName(name)
         if is_attribute:
             setattr(self.toplevelWidget, name, obj)
         return obj
@@ -241,44 +256,49 @@ class UIParser(object):
         if widget_class == 'Line':
             widget_class = 'QFrame'
 
-        # Ignore the parent if it is a container.
+        # The pages of a container are created with the widget that the
+        # container will make their parent, if it is known, so that they
+        # don't have to be reparented.  Otherwise they are created without a
+        # parent and are reparented once when they are added.
         parent = self.stack.topwidget
-        if isinstance(parent, (QtGui.QDockWidget, QtGui.QMdiArea,
-                               QtGui.QScrollArea, QtGui.QStackedWidget,
-                               QtGui.QToolBox, QtGui.QTabWidget,
-                               QtGui.QWizard)):
-            parent = None
+        is_page = isinstance(parent, (self.QtGui.QDockWidget,
+                self.QtGui.QMdiArea, self.QtGui.QScrollArea,
+                self.QtGui.QStackedWidget, self.QtGui.QToolBox,
+                self.QtGui.QTabWidget, self.QtGui.QWizard))
+
+        if is_page:
+            parent = self._pageParent(parent)
 
         # See if this is a layout widget.
         if widget_class == 'QWidget':
-            if parent is not None:
-                if not isinstance(parent, QtGui.QMainWindow):
+            if parent is not None and not is_page:
+                if not isinstance(parent, self.QtGui.QMainWindow):
                     self.layout_widget = True
 
         self.stack.push(self.setupObject(widget_class, parent, elem))
 
-        if isinstance(self.stack.topwidget, QtGui.QTableWidget):
+        if isinstance(self.stack.topwidget, self.QtGui.QTableWidget):
             if self.getProperty(elem, 'columnCount') is None:
                 self.stack.topwidget.setColumnCount(len(elem.findall("column")))
 
             if self.getProperty(elem, 'rowCount') is None:
                 self.stack.topwidget.setRowCount(len(elem.findall("row")))
 
-        self.traverseWidgetTree(elem)
+        self.populateWidget(elem)
         widget = self.stack.popWidget()
 
         self.layout_widget = False
 
-        if isinstance(widget, QtGui.QTreeView):
+        if isinstance(widget, self.QtGui.QTreeView):
             self.handleHeaderView(elem, "header", widget.header())
 
-        elif isinstance(widget, QtGui.QTableView):
+        elif isinstance(widget, self.QtGui.QTableView):
             self.handleHeaderView(elem, "horizontalHeader",
                     widget.horizontalHeader())
             self.handleHeaderView(elem, "verticalHeader",
                     widget.verticalHeader())
 
-        elif isinstance(widget, QtGui.QAbstractButton):
+        elif isinstance(widget, self.QtGui.QAbstractButton):
             bg_i18n = self.wprops.getAttribute(elem, "buttonGroup")
             if bg_i18n is not None:
                 # This should be handled properly in case the problem arises
@@ -312,14 +332,14 @@ class UIParser(object):
             lay = self.stack.peek()
             lp = elem.attrib['layout-position']
 
-            if isinstance(lay, QtGui.QFormLayout):
+            if isinstance(lay, self.QtGui.QFormLayout):
                 lay.setWidget(lp[0], self._form_layout_role(lp), widget)
             else:
                 lay.addWidget(widget, *lp)
 
         topwidget = self.stack.topwidget
 
-        if isinstance(topwidget, QtGui.QToolBox):
+        if isinstance(topwidget, self.QtGui.QToolBox):
             icon = self.wprops.getAttribute(elem, "icon")
             if icon is not None:
                 topwidget.addItem(widget, icon, self.wprops.getAttribute(elem, "label"))
@@ -330,7 +350,7 @@ class UIParser(object):
             if tooltip is not None:
                 topwidget.setItemToolTip(topwidget.indexOf(widget), tooltip)
 
-        elif isinstance(topwidget, QtGui.QTabWidget):
+        elif isinstance(topwidget, self.QtGui.QTabWidget):
             icon = self.wprops.getAttribute(elem, "icon")
             if icon is not None:
                 topwidget.addTab(widget, icon, self.wprops.getAttribute(elem, "title"))
@@ -341,19 +361,19 @@ class UIParser(object):
             if tooltip is not None:
                 topwidget.setTabToolTip(topwidget.indexOf(widget), tooltip)
 
-        elif isinstance(topwidget, QtGui.QWizard):
+        elif isinstance(topwidget, self.QtGui.QWizard):
             topwidget.addPage(widget)
 
-        elif isinstance(topwidget, QtGui.QStackedWidget):
+        elif isinstance(topwidget, self.QtGui.QStackedWidget):
             topwidget.addWidget(widget)
 
-        elif isinstance(topwidget, (QtGui.QDockWidget, QtGui.QScrollArea)):
+        elif isinstance(topwidget, (self.QtGui.QDockWidget, self.QtGui.QScrollArea)):
             topwidget.setWidget(widget)
 
-        elif isinstance(topwidget, QtGui.QMainWindow):
-            if type(widget) == QtGui.QWidget:
+        elif isinstance(topwidget, self.QtGui.QMainWindow):
+            if type(widget) == self.QtGui.QWidget:
                 topwidget.setCentralWidget(widget)
-            elif isinstance(widget, QtGui.QToolBar):
+            elif isinstance(widget, self.QtGui.QToolBar):
                 tbArea = self.wprops.getAttribute(elem, "toolBarArea")
 
                 if tbArea is None:
@@ -366,15 +386,33 @@ class UIParser(object):
                 if tbBreak:
                     topwidget.insertToolBarBreak(widget)
 
-            elif isinstance(widget, QtGui.QMenuBar):
+            elif isinstance(widget, self.QtGui.QMenuBar):
                 topwidget.setMenuBar(widget)
-            elif isinstance(widget, QtGui.QStatusBar):
+            elif isinstance(widget, self.QtGui.QStatusBar):
                 topwidget.setStatusBar(widget)
-            elif isinstance(widget, QtGui.QDockWidget):
+            elif isinstance(widget, self.QtGui.QDockWidget):
                 dwArea = self.wprops.getAttribute(elem, "dockWidgetArea")
-                topwidget.addDockWidget(QtCore.Qt.DockWidgetArea(dwArea),
+                topwidget.addDockWidget(self.QtCore.Qt.DockWidgetArea(dwArea),
                         widget)
 
+    def _pageParent(self, container):
+        """ Return the widget that a container makes the parent of its pages
+        or None if it is private to the container.
+        """
+
+        if isinstance(container, (self.QtGui.QDockWidget, self.QtGui.QStackedWidget)):
+            return container
+
+        if isinstance(container, self.QtGui.QScrollArea):
+            return container.viewport()
+
+        return None
+
+    def populateWidget(self, elem):
+        """ Create the children of the widget at the top of the stack. """
+
+        self.traverseWidgetTree(elem)
+
     def handleHeaderView(self, elem, name, header):
         value = self.wprops.getAttribute(elem, name + "Visible")
         if value is not None:
@@ -414,11 +452,11 @@ class UIParser(object):
             size_args = (int(width), int(height))
 
         sizeType = self.wprops.getProperty(elem, "sizeType",
-                QtGui.QSizePolicy.Expanding)
+                self.QtGui.QSizePolicy.Expanding)
 
-        policy = (QtGui.QSizePolicy.Minimum, sizeType)
+        policy = (self.QtGui.QSizePolicy.Minimum, sizeType)
 
-        if self.wprops.getProperty(elem, "orientation") == QtCore.Qt.Horizontal:
+        if self.wprops.getProperty(elem, "orientation") == self.QtCore.Qt.Horizontal:
             policy = policy[1], policy[0]
 
         spacer = self.factory.createQObject("QSpacerItem",
@@ -429,7 +467,7 @@ class UIParser(object):
             lay = self.stack.peek()
             lp = elem.attrib['layout-position']
 
-            if isinstance(lay, QtGui.QFormLayout):
+            if isinstance(lay, self.QtGui.QFormLayout):
                 lay.setItem(lp[0], self._form_layout_role(lp), spacer)
             else:
                 lay.addItem(spacer, *lp)
@@ -503,7 +541,14 @@ class UIParser(object):
             parent = self.stack.topwidget
         if "name" not in elem.attrib:
             elem.attrib["name"] = classname[1:].lower()
-        self.stack.push(self.setupObject(classname, parent, elem))
+        layout = self.setupObject(classname, parent, elem)
+
+        if self.batch and parent is not None:
+            # Only the layouts of widgets are activated by Qt.
+            layout.setEnabled(False)
+            self.batched_layouts.append(layout)
+
+        self.stack.push(layout)
         self.traverseWidgetTree(elem)
 
         layout = self.stack.popLayout()
@@ -513,13 +558,13 @@ class UIParser(object):
             top_layout = self.stack.peek()
             lp = elem.attrib['layout-position']
 
-            if isinstance(top_layout, QtGui.QFormLayout):
+            if isinstance(top_layout, self.QtGui.QFormLayout):
                 top_layout.setLayout(lp[0], self._form_layout_role(lp), layout)
             else:
                 top_layout.addLayout(layout, *lp)
 
     def configureLayout(self, elem, layout):
-        if isinstance(layout, QtGui.QGridLayout):
+        if isinstance(layout, self.QtGui.QGridLayout):
             self.setArray(elem, 'columnminimumwidth',
                     layout.setColumnMinimumWidth)
             self.setArray(elem, 'rowminimumheight',
@@ -527,7 +572,7 @@ class UIParser(object):
             self.setArray(elem, 'columnstretch', layout.setColumnStretch)
             self.setArray(elem, 'rowstretch', layout.setRowStretch)
 
-        elif isinstance(layout, QtGui.QBoxLayout):
+        elif isinstance(layout, self.QtGui.QBoxLayout):
             self.setArray(elem, 'stretch', layout.setStretch)
 
     def setArray(self, elem, name, setter):
@@ -546,12 +591,13 @@ class UIParser(object):
 
     def handleItem(self, elem):
         if self.stack.topIsLayout():
-            elem[0].attrib['layout-position'] = _layout_position(elem)
+            elem[0].attrib['layout-position'] = _layout_position(elem,
+                    self.QtCore)
             self.traverseWidgetTree(elem)
         else:
             w = self.stack.topwidget
 
-            if isinstance(w, QtGui.QComboBox):
+            if isinstance(w, self.QtGui.QComboBox):
                 text = self.wprops.getProperty(elem, "text")
                 icon = self.wprops.getProperty(elem, "icon")
 
@@ -562,13 +608,13 @@ class UIParser(object):
 
                 w.setItemText(self.item_nr, text)
 
-            elif isinstance(w, QtGui.QListWidget):
+            elif isinstance(w, self.QtGui.QListWidget):
                 self.disableSorting(w)
                 item = self.createWidgetItem('QListWidgetItem', elem, w.item,
                         self.item_nr)
                 w.addItem(item)
 
-            elif isinstance(w, QtGui.QTreeWidget):
+            elif isinstance(w, self.QtGui.QTreeWidget):
                 if self.itemstack:
                     parent, _ = self.itemstack[-1]
                     _, nr_in_root = self.itemstack[0]
@@ -623,7 +669,7 @@ class UIParser(object):
                 self.traverseWidgetTree(elem)
                 _, self.item_nr = self.itemstack.pop()
 
-            elif isinstance(w, QtGui.QTableWidget):
+            elif isinstance(w, self.QtGui.QTableWidget):
                 row = int(elem.attrib['row'])
                 col = int(elem.attrib['column'])
 
@@ -709,7 +755,7 @@ class UIParser(object):
     def addHeader(self, elem):
         w = self.stack.topwidget
 
-        if isinstance(w, QtGui.QTreeWidget):
+        if isinstance(w, self.QtGui.QTreeWidget):
             props = self.wprops
             col = self.column_counter
 
@@ -751,7 +797,7 @@ class UIParser(object):
 
             self.column_counter += 1
 
-        elif isinstance(w, QtGui.QTableWidget):
+        elif isinstance(w, self.QtGui.QTableWidget):
             if len(elem) != 0:
                 if elem.tag == 'column':
                     item = self.createWidgetItem('QTableWidgetItem', elem,
@@ -811,12 +857,23 @@ class UIParser(object):
 
         self.toplevelWidget = self.createToplevelWidget(cname, wname)
         self.toplevelWidget.setObjectName(wname)
+
+        if self.batch:
+            self.beginBatch()
+
         DEBUG("toplevel widget is %s",
               self.toplevelWidget.metaObject().className())
         self.wprops.setProperties(self.toplevelWidget, elem)
         self.stack.push(self.toplevelWidget)
         self.traverseWidgetTree(elem)
         self.stack.popWidget()
+        self.completeUserInterface()
+
+    def completeUserInterface(self):
+        """ Complete the user interface once all its widgets have been
+        created.
+        """
+
         self.addActions()
         self.setBuddies()
         self.setDelayedProps()
@@ -828,9 +885,9 @@ class UIParser(object):
             else:
                 DEBUG("add action %s to %s", action_name, widget.objectName())
                 action_obj = getattr(self.toplevelWidget, action_name)
-                if isinstance(action_obj, QtGui.QMenu):
+                if isinstance(action_obj, self.QtGui.QMenu):
                     widget.addAction(action_obj.menuAction())
-                elif not isinstance(action_obj, QtGui.QActionGroup):
+                elif not isinstance(action_obj, self.QtGui.QActionGroup):
                     widget.addAction(action_obj)
 
     def setDelayedProps(self):
@@ -903,12 +960,23 @@ class UIParser(object):
                 return self.toplevelWidget
             else:
                 return getattr(self.toplevelWidget, obj)
+
+        # Each connection is made using the overload of the sender's bound
+        # signal with the argument types given by the signature rather than by
+        # parsing a SIGNAL() signature.
         for conn in iter(elem):
-            QtCore.QObject.connect(name2object(conn.findtext("sender")),
-                                   QtCore.SIGNAL(conn.findtext("signal")),
-                                   self.factory.getSlot(name2object(conn.findtext("receiver")),
-                                                    conn.findtext("slot").split("(")[0]))
-        QtCore.QMetaObject.connectSlotsByName(self.toplevelWidget)
+            signal_name, signal_args = splitSignature(conn.findtext("signal"))
+
+            bound_signal = getattr(name2object(conn.findtext("sender")),
+                    signal_name)
+            slot = self.factory.getSlot(name2object(conn.findtext("receiver")),
+                    conn.findtext("slot").split("(")[0])
+
+            signalOverload(bound_signal, signal_args).connect(slot)
+
+        # The on_<name>_<signal> slots whose objects are known are connected
+        # directly rather than by searching every descendant.
+        self.factory.connectSlotsByName(self.toplevelWidget)
 
     def customWidgets(self, elem):
         def header2module(header):
@@ -957,20 +1025,43 @@ class UIParser(object):
                     if prop.findtext('bool') == 'false':
                         bg.exclusive = False
 
+    def beginBatch(self):
+        """ Suspend the updates of the top-level widget while the form is
+        created.  The layouts are disabled as they are created.
+        """
+
+        self.updates_enabled = self.toplevelWidget.updatesEnabled()
+        self.toplevelWidget.setUpdatesEnabled(False)
+
+    def endBatch(self):
+        """ Enable the layouts, which schedules their activation, and restore
+        the updates of the top-level widget to their state before the batch.
+        """
+
+        for layout in self.batched_layouts:
+            layout.setEnabled(True)
+            layout.update()
+
+        self.toplevelWidget.setUpdatesEnabled(self.updates_enabled)
+        self.updates_enabled = None
+
     # finalize will be called after the whole tree has been parsed and can be
     # overridden.
     def finalize(self):
         pass
 
-    def parse(self, filename, resource_suffix, base_dir=''):
-        self.wprops.set_base_dir(base_dir)
+    def optimize(self, elem):
+        self.optimizer.optimize(elem)
 
-        self._resource_suffix = resource_suffix
+    def branchHandlers(self):
+        """ Return the sequence of the tag names of the branches of a .ui file
+        and the methods that handle them.
+        """
 
         # The order in which the different branches are handled is important.
         # The widget tree handler relies on all custom widgets being known, and
         # in order to create the connections, all widgets have to be populated.
-        branchHandlers = (
+        return (
             ("layoutdefault", self.readDefaults),
             ("class",         self.classname),
             ("buttongroups",  self.buttonGroups),
@@ -981,27 +1072,58 @@ class UIParser(object):
             ("resources",     self.readResources),
         )
 
+    def readDocument(self, filename, resource_suffix, base_dir=''):
+        """ Read and optionally optimize a .ui file and return the document.
+        """
+
+        self.wprops.set_base_dir(base_dir)
+
+        self._resource_suffix = resource_suffix
+
+        document = self.readUiFile(filename)
+
+        if self.optimizer is not None:
+            self.optimize(document.getroot())
+
+        return document
+
+    @staticmethod
+    def readUiFile(filename):
+        """ Read a .ui file and return the document.  This doesn't use Qt and
+        so may be called from any thread.
+        """
+
         document = parse(filename)
         version = document.getroot().attrib["version"]
         DEBUG("UI version is %s" % (version,))
         # Right now, only version 4.0 is supported.
         assert version in ("4.0",)
-        for tagname, actor in branchHandlers:
-            elem = document.find(tagname)
-            if elem is not None:
-                actor(elem)
+
+        return document
+
+    def parse(self, filename, resource_suffix, base_dir=''):
+        document = self.readDocument(filename, resource_suffix, base_dir)
+
+        try:
+            for tagname, actor in self.branchHandlers():
+                elem = document.find(tagname)
+                if elem is not None:
+                    actor(elem)
+        finally:
+            # Make sure that an error doesn't leave updates disabled.
+            if self.updates_enabled is not None:
+                self.endBatch()
         self.finalize()
         w = self.toplevelWidget
         self.reset()
         return w
 
-    @staticmethod
-    def _form_layout_role(layout_position):
+    def _form_layout_role(self, layout_position):
         if layout_position[3] > 1:
-            role = QtGui.QFormLayout.SpanningRole
+            role = self.QtGui.QFormLayout.SpanningRole
         elif layout_position[1] == 1:
-            role = QtGui.QFormLayout.FieldRole
+            role = self.QtGui.QFormLayout.FieldRole
         else:
-            role = QtGui.QFormLayout.LabelRole
+            role = self.QtGui.QFormLayout.LabelRole
 
         return role
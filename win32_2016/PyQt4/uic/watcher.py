@@ -0,0 +1,384 @@
+#############################################################################
+##
+## Copyright (c) 2014 Riverbank Computing Limited <info@riverbankcomputing.com>
+##
+## This file is part of PyQt.
+##
+## This file may be used under the terms of the GNU General Public
+## License versions 2.0 or 3.0 as published by the Free Software
+## Foundation and appearing in the files LICENSE.GPL2 and LICENSE.GPL3
+## included in the packaging of this file.  Alternatively you may (at
+## your option) use any later version of the GNU General Public
+## License if such license has been publicly approved by Riverbank
+## Computing Limited (or its successors, if any) and the KDE Free Qt
+## Foundation. In addition, as a special exception, Riverbank gives you
+## certain additional rights. These rights are described in the Riverbank
+## GPL Exception version 1.1, which can be found in the file
+## GPL_EXCEPTION.txt in this package.
+##
+## If you are unsure which license is appropriate for your use, please
+## contact the sales department at sales@riverbankcomputing.com.
+##
+## This file is provided AS IS with NO WARRANTY OF ANY KIND, INCLUDING THE
+## WARRANTY OF DESIGN, MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE.
+##
+#############################################################################
+
+
+import os
+import sys
+import time
+import timeit
+
+from PyQt4.uic import _compileUiFile
+
+
+# The maximum time in seconds to wait for the results of the pool.  Waiting
+# with a timeout lets Python v2 deliver KeyboardInterrupt.
+_POOL_TIMEOUT = 24 * 60 * 60
+
+
+class UiDirWatcher(object):
+    """ Watch a directory (or directory tree) of Qt Designer .ui files and
+    recompile those that change.  The directory is polled and the files that
+    have changed are compiled once they have stopped changing.  When several
+    files are ready they are compiled in parallel by a pool of processes.
+    """
+
+    def __init__(self, dir, recurse=False, map=None, interval=0.5,
+            debounce=0.3, jobs=4, report=None, flatten=(),
+            optimize_report=False, **compileUi_args):
+        """ Initialise the watcher.  dir, recurse, map and compileUi_args are
+        as for compileUiDir() except that the optimize argument must be a
+        sequence of pass names or a comma separated string of them.  flatten
+        is as for the Optimizer.  If optimize_report is set then the changes
+        made by the optimizer are reported with each compilation.  interval
+        is the time in seconds between polls.
+        debounce is the time in seconds that a file must remain unchanged
+        before it is compiled so that a burst of saves only compiles it once.
+        jobs is the maximum number of concurrent compilations, each in its
+        own process.  map and compileUi_args are passed to the processes and
+        so must be able to be pickled.  report is an optional callable that
+        is passed a message for each compilation.  The default writes the
+        message to stdout.
+        """
+
+        self._dir = dir
+        self._recurse = recurse
+        self._map = map
+        self._interval = interval
+        self._debounce = debounce
+        self._jobs = jobs
+        self._report = report or self._write_report
+        self._compileUi_args = compileUi_args
+        self._flatten = flatten
+        self._optimize_report = optimize_report
+
+        # The pool of processes, created when first needed.
+        self._pool = None
+
+        # The last known signature of each .ui file.
+        self._signatures = {}
+
+        # The changed files that are waiting to be compiled, each with the
+        # time the change was first seen and the time of the latest change.
+        self._pending = {}
+
+    @staticmethod
+    def _write_report(message):
+        """ The default report handler. """
+
+        sys.stdout.write(message + "\n")
+        sys.stdout.flush()
+
+    def scan(self):
+        """ Return a dict of the signature (ie. modification time and size) of
+        every .ui file keyed by a (directory, file name) tuple.  When available
+        os.scandir() is used which (on Windows) returns the file details with
+        the directory listing itself so that only .ui files are stat'ed.
+        Without it (ie. Python v2) every .ui file is stat'ed and, if
+        sub-directories are being watched, every other entry is stat'ed to see
+        if it is a directory.  OSError is raised if the watched directory
+        cannot be listed.
+        """
+
+        signatures = {}
+        dirs = [self._dir]
+
+        while dirs:
+            ui_dir = dirs.pop()
+
+            try:
+                entries = list(_list_dir(ui_dir, self._recurse))
+            except OSError:
+                if ui_dir == self._dir:
+                    raise
+
+                # The sub-directory has been removed or renamed since its
+                # parent was listed.
+                continue
+
+            for name, st in entries:
+                if st is None:
+                    dirs.append(os.path.join(ui_dir, name))
+                else:
+                    signatures[(ui_dir, name)] = (st.st_mtime, st.st_size)
+
+        return signatures
+
+    def poll(self):
+        """ Poll the directory once and compile any files that have changed and
+        then settled.  Return the list of (ui_path, py_path, error, compile
+        time, latency, optimizer changes) tuples of the files that were
+        compiled.
+        """
+
+        now = timeit.default_timer()
+        signatures = self.scan()
+
+        for key, signature in signatures.items():
+            if self._signatures.get(key) != signature:
+                first_seen = self._pending.get(key, (now, now))[0]
+                self._pending[key] = (first_seen, now)
+
+        # Forget about any files that have been removed.
+        for key in list(self._pending.keys()):
+            if key not in signatures:
+                del self._pending[key]
+
+        self._signatures = signatures
+
+        ready = [key for key, (_, last_change) in self._pending.items()
+                if now - last_change >= self._debounce]
+
+        if not ready:
+            return []
+
+        results = self.compile(ready)
+
+        for key in ready:
+            del self._pending[key]
+
+        return results
+
+    def compile(self, keys):
+        """ Compile a list of .ui files, given as (directory, file name)
+        tuples, and report the results.  A single file is compiled in this
+        process, otherwise the files are compiled in parallel by the pool.
+        """
+
+        tasks = [(ui_dir, ui_file, self._map, self._compileUi_args,
+                self._flatten, self._optimize_report)
+                        for ui_dir, ui_file in keys]
+
+        if len(tasks) == 1 or self._jobs <= 1:
+            compiled = [_compile(task) for task in tasks]
+        else:
+            compiled = self._get_pool().map_async(_compile, tasks).get(
+                    _POOL_TIMEOUT)
+
+        # The latency is measured by this process as the timers of different
+        # processes cannot be compared.
+        end = timeit.default_timer()
+
+        results = []
+
+        for (ui_dir, ui_file), (py_path, error, elapsed, changes) in zip(keys, compiled):
+            first_seen = self._pending.get((ui_dir, ui_file), (None, None))[0]
+
+            if first_seen is None:
+                latency = elapsed
+            else:
+                latency = end - first_seen
+
+            results.append((os.path.join(ui_dir, ui_file), py_path, error,
+                    elapsed, latency, changes))
+
+        for ui_path, py_path, error, elapsed, latency, changes in results:
+            if error is None:
+                self._report("%s -> %s: compiled in %.1f ms, %.1f ms after the change" % (ui_path, py_path, elapsed * 1000, latency * 1000))
+
+                for message in changes:
+                    self._report("    " + message)
+            else:
+                self._report("%s: %s" % (ui_path, error))
+
+        return results
+
+    def _get_pool(self):
+        """ Return the pool of processes, creating it if necessary. """
+
+        if self._pool is None:
+            import multiprocessing
+
+            self._pool = multiprocessing.Pool(self._jobs,
+                    initializer=_init_worker)
+
+        return self._pool
+
+    def close(self):
+        """ Stop the pool of processes, if there is one. """
+
+        if self._pool is not None:
+            self._pool.terminate()
+            self._pool.join()
+            self._pool = None
+
+    def prime(self, compile_stale=True):
+        """ Take the initial snapshot of the directory.  If compile_stale is
+        set then any .ui file that is newer than its Python module is
+        compiled.
+        """
+
+        self._signatures = self.scan()
+
+        if compile_stale:
+            stale = [key for key in self._signatures
+                    if self._is_stale(key)]
+
+            if stale:
+                self.compile(stale)
+
+    def _is_stale(self, key):
+        """ Return True if a .ui file is newer than its Python module. """
+
+        ui_dir, ui_file = key
+
+        py_dir = ui_dir
+        py_file = ui_file[:-3] + '.py'
+
+        if self._map is not None:
+            py_dir, py_file = self._map(py_dir, py_file)
+
+        try:
+            py_mtime = os.stat(os.path.join(py_dir, py_file)).st_mtime
+        except OSError:
+            return True
+
+        return py_mtime < self._signatures[key][0]
+
+    def watch(self):
+        """ Compile any out of date .ui files and then watch for changes until
+        interrupted.  If the directory cannot be listed (eg. because it has
+        been removed or renamed) then the error is reported and the directory
+        is tried again at the next poll.
+        """
+
+        primed = False
+        last_error = None
+
+        try:
+            while True:
+                try:
+                    if primed:
+                        self.poll()
+                    else:
+                        self.prime()
+                        primed = True
+
+                    last_error = None
+                except OSError:
+                    error = str(sys.exc_info()[1])
+
+                    # Only report an error once rather than at every poll.
+                    if error != last_error:
+                        self._report("%s: %s" % (self._dir, error))
+                        last_error = error
+
+                time.sleep(self._interval)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.close()
+
+
+def _init_worker():
+    """ Initialise a process of the pool.  Only the watcher handles
+    KeyboardInterrupt.
+    """
+
+    import signal
+
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+
+def _compile(task):
+    """ Compile a single .ui file, given as a (directory, file name, map,
+    compileUi_args, flatten, optimize_report) tuple, and return a (py_path,
+    error, compile time, optimizer changes) tuple.  This is called by the
+    processes of the pool.
+    """
+
+    from PyQt4.uic.driver import error_message
+
+    ui_dir, ui_file, map, compileUi_args, flatten, optimize_report = task
+
+    # Each compilation has its own optimizer so that its changes are those
+    # made to the one form.
+    optimizer = None
+
+    if compileUi_args.get('optimize') and (flatten or optimize_report):
+        from PyQt4.uic.optimizer import Optimizer
+
+        optimizer = Optimizer(compileUi_args['optimize'], flatten)
+
+        compileUi_args = dict(compileUi_args)
+        compileUi_args['optimize'] = optimizer
+
+    start = timeit.default_timer()
+
+    try:
+        py_path = _compileUiFile(ui_dir, ui_file, map, compileUi_args)
+        error = None
+    except Exception:
+        py_path = None
+        error = error_message(sys.exc_info()[1])
+
+    elapsed = timeit.default_timer() - start
+
+    if optimizer is not None and optimize_report:
+        changes = optimizer.changes
+    else:
+        changes = []
+
+    return (py_path, error, elapsed, changes)
+
+
+if hasattr(os, 'scandir'):
+    def _list_dir(dir, subdirs):
+        """ Return an iterator over the (name, stat result) tuples of the .ui
+        files in a directory.  If subdirs is set then sub-directories are also
+        included with a stat result of None.
+        """
+
+        for entry in os.scandir(dir):
+            if entry.name.endswith('.ui') and entry.is_file():
+                try:
+                    yield entry.name, entry.stat()
+                except OSError:
+                    # The file has been removed since the listing.
+                    pass
+            elif subdirs and entry.is_dir():
+                yield entry.name, None
+else:
+    def _list_dir(dir, subdirs):
+        """ Return an iterator over the (name, stat result) tuples of the .ui
+        files in a directory.  If subdirs is set then sub-directories are also
+        included with a stat result of None.  Every .ui file is stat'ed and,
+        if subdirs is set, so is every other entry.
+        """
+
+        import stat
+
+        for name in os.listdir(dir):
+            if name.endswith('.ui'):
+                try:
+                    st = os.stat(os.path.join(dir, name))
+                except OSError:
+                    # The file has been removed since the listing.
+                    continue
+
+                if stat.S_ISREG(st.st_mode):
+                    yield name, st
+            elif subdirs and os.path.isdir(os.path.join(dir, name)):
+                yield name, None